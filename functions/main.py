@@ -1,10 +1,11 @@
-from firebase_admin import initialize_app
+import threading
+
 from firebase_functions import https_fn, options
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-from src.services import game_manager, level_handler
+from src.services import level_handler, serialization, solution_store, startup
 
-initialize_app()
+startup.mark("imports")
 
 app = Flask(__name__)
 CORS(app)
@@ -15,6 +16,111 @@ approved = [
     r"https://pac-man-solutions\.web\.app",
 ]
 
+_lock = threading.RLock()
+"""
+Lock held while the services created on first use are set up, so that requests
+arriving together on different threads set each up only once.
+"""
+
+_firebase_initialised = False
+"""Whether the Firebase Admin app has been initialised by this instance."""
+
+
+def initialise_firebase() -> None:
+    """
+    Initialise the Firebase Admin app on first use.
+
+    Importing and initialising `firebase_admin` is slow and none of the
+    endpoints rely on it before a game is run, so it is deferred until then.
+    """
+    global _firebase_initialised
+    if _firebase_initialised:
+        return
+    with _lock:
+        # Another thread may have initialised the app while this one waited.
+        if not _firebase_initialised:
+            with startup.timed("firebase admin"):
+                from firebase_admin import initialize_app
+
+                initialize_app()
+            _firebase_initialised = True
+
+
+_game_manager = None
+"""The game engine module, imported on first use."""
+
+
+def get_game_manager():
+    """
+    Returns the game engine module, importing it on first use.
+
+    The agents and the game engine are only needed once a game is simulated, so
+    they are not imported while the instance starts.
+
+    Returns
+    -------
+    The `src.services.game_manager` module.
+    """
+    global _game_manager
+    if _game_manager is None:
+        with _lock:
+            if _game_manager is None:
+                with startup.timed("game imports"):
+                    from src.services import game_manager
+
+                _game_manager = game_manager
+    return _game_manager
+
+
+_jobs = None
+"""The service running games in the background, created on first use."""
+
+
+def get_jobs():
+    """
+    Returns the service running games in the background, creating it on first use.
+
+    Returns
+    -------
+    The `JobManager` of this instance.
+    """
+    global _jobs
+    if _jobs is None:
+        with _lock:
+            if _jobs is None:
+                get_game_manager()
+                with startup.timed("job imports"):
+                    from src.services import job_manager
+
+                _jobs = job_manager.JobManager()
+    return _jobs
+
+
+def encoded(data: dict, req: https_fn.Request = None) -> Response:  # type: ignore
+    """
+    Build a response holding a game history in the encoding the client asked for.
+
+    Parameters
+    ----------
+    `data` : `dict`
+        The history as returned by `GameStateStore.to_json`.
+    `req` : `https_fn.Request` DEFAULT = `None`
+        The request being answered, the Flask request if not provided.
+
+    Returns
+    -------
+    The response, with the time spent encoding it in its `Server-Timing` header.
+    """
+    headers = (req or request).headers
+    body, response_headers = serialization.encode(
+        data, headers.get("Accept"), headers.get("Accept-Encoding")
+    )
+    return Response(body, headers=response_headers)
+
+
+startup.mark("ready")
+startup.prewarm_in_background()
+
 
 @https_fn.on_request(
     cors=options.CorsOptions(
@@ -35,15 +141,86 @@ def get_levels(req: https_fn.Request = None) -> https_fn.Response:  # type: igno
 )
 @app.get("/get_game")
 def get_game(req: https_fn.Request = None) -> https_fn.Response:  # type: ignore
-    if req:
-        level_num = int(req.args.get("level_num"))  # type: ignore
-    else:
-        level_num = int(request.args.get("level_num"))  # type: ignore
+    args = req.args if req else request.args
+    level_num = int(args.get("level_num"))  # type: ignore
+    seed = args.get("seed")
+    agent = args.get("agent")
+    if seed is None and agent is None:
+        # Serve the stored solution unless a fresh game is asked for.
+        solution = solution_store.get_solution(level_num)
+        if solution is not None:
+            return encoded(solution, req)
+
+    game_manager = get_game_manager()
+    agent = agent or "InformedPacMan"
+    if agent not in game_manager.API_AGENTS:
+        return jsonify({"error": f"Unknown agent {agent}."}), 400
+    initialise_firebase()
     try:
         game = game_manager.GameManager(
-            level_num, configuration=game_manager.RunConfiguration.SERVER
+            level_num,
+            configuration=game_manager.RunConfiguration.SERVER,
+            custom_pacman=game_manager.PACMAN_AGENTS[agent],
+            seed=int(seed) if seed is not None else None,
+            max_ticks=game_manager.API_MAX_TICKS,
         )
         message = game.game_loop()
     except Exception as e:
-        message = str(e)
-    return jsonify(message)
+        return jsonify({"error": str(e)}), 500
+    message["capped"] = game.capped
+    return encoded(message, req)
+
+
+@https_fn.on_request(
+    cors=options.CorsOptions(
+        cors_origins=approved,
+        cors_methods=["get"],
+    )
+)
+@app.get("/get_startup_report")
+def get_startup_report(
+    req: https_fn.Request = None,  # type: ignore
+) -> https_fn.Response:
+    return jsonify(startup.report())
+
+
+@https_fn.on_request(
+    cors=options.CorsOptions(
+        cors_origins=approved,
+        cors_methods=["post"],
+    )
+)
+@app.post("/games")
+def create_game(req: https_fn.Request = None) -> https_fn.Response:  # type: ignore
+    initialise_firebase()
+    req = req or request
+    body = req.get_json(silent=True) or req.args
+    try:
+        level_num = int(body.get("level_num"))  # type: ignore
+        seed = body.get("seed")
+        job = get_jobs().submit(
+            level_num,
+            body.get("agent") or "InformedPacMan",
+            None if seed is None else int(seed),
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(job.to_json()), 202
+
+
+@https_fn.on_request(
+    cors=options.CorsOptions(
+        cors_origins=approved,
+        cors_methods=["get"],
+    )
+)
+@app.get("/games/<job_id>")
+def get_job(
+    req: https_fn.Request = None, job_id: str = ""  # type: ignore
+) -> https_fn.Response:
+    if req:
+        job_id = req.path.rstrip("/").split("/")[-1]
+    job = get_jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": f"No game with id {job_id}."}), 404
+    return jsonify(job.to_json())
@@ -9,9 +9,20 @@ https://realpython.com/command-line-interfaces-python-argparse/
 import argparse
 import sys
 
-from main import app
 from src.scripts.analytics import PacmanAnalytics
-from src.services.game_manager import GameManager, RunConfiguration
+from src.scripts.benchmark import BENCH_AGENTS, profile_game, run_benchmark
+from src.scripts.compile_levels import compile_levels
+from src.scripts.generate_levels import write_levels
+from src.scripts.replay import record_game, verify_file
+from src.scripts.solutions import CRITERIA, build_solutions
+from src.scripts.tournament import Tournament
+from src.scripts.training import run_training
+from src.services.game_manager import (
+    GHOST_CONFIGURATIONS,
+    PACMAN_AGENTS,
+    GameManager,
+    RunConfiguration,
+)
 
 try:
     print("")
@@ -39,11 +50,33 @@ def main():
 
     parser.add_argument(
         "run_config",
-        choices=["single", "flask", "analytics"],
+        choices=[
+            "single",
+            "flask",
+            "analytics",
+            "train",
+            "compile",
+            "solve",
+            "generate",
+            "bench",
+            "profile",
+            "tournament",
+            "record",
+            "replay",
+        ],
         help="""
         single = Run single game,
         flask = Run the Flask dev server,
-        analytics = Run analytics tool""",
+        analytics = Run analytics tool,
+        train = Train the Q-learning agent,
+        compile = Compile every level to precomputed tables,
+        solve = Store the best run of every level to be served by default,
+        generate = Generate synthetic levels of any size,
+        bench = Measure the speed of the agents over a fixed workload,
+        profile = Profile a single game,
+        tournament = Rank the agents over many levels, ghosts and seeds,
+        record = Record the action log of a single game,
+        replay = Replay an action log, checking the game plays out the same""",
     )
 
     parser.add_argument(
@@ -75,7 +108,8 @@ def main():
         "--output_file",
         action="store",
         type=str,
-        help="write the output data to a file",
+        help="""write the output to this file, analytics appends each run as CSV
+        and resumes the runs already in the file""",
     )
 
     analytics_options.add_argument(
@@ -86,18 +120,217 @@ def main():
         help="the number of runs completed to assess performance",
     )
 
+    training_options = parser.add_argument_group("Training Options")
+
+    training_options.add_argument(
+        "-e",
+        "--episodes",
+        default=500,
+        type=int,
+        help="the number of headless games played to train the agent",
+    )
+
+    training_options.add_argument(
+        "-w",
+        "--weights_file",
+        action="store",
+        type=str,
+        help="write the trained weights to this .npz file instead of the default",
+    )
+
+    solve_options = parser.add_argument_group("Solve Options")
+
+    solve_options.add_argument(
+        "-s",
+        "--seeds",
+        default=10,
+        type=int,
+        help="the number of seeds simulated for each level",
+    )
+
+    solve_options.add_argument(
+        "-a",
+        "--agent",
+        default="InformedPacMan",
+        choices=list(PACMAN_AGENTS.keys()),
+        help="the agent used to solve the levels",
+    )
+
+    solve_options.add_argument(
+        "-c",
+        "--criterion",
+        default="win",
+        choices=list(CRITERIA.keys()),
+        help="how the best run is chosen",
+    )
+
+    generate_options = parser.add_argument_group("Generate Options")
+
+    generate_options.add_argument(
+        "--sizes",
+        nargs="+",
+        default=["28x31", "56x62", "112x124", "224x248"],
+        help="the size of each level generated as WIDTHxHEIGHT",
+    )
+
+    generate_options.add_argument(
+        "--loop_density",
+        default=0.1,
+        type=float,
+        help="the chance of each wall between two corridors being removed",
+    )
+
+    generate_options.add_argument(
+        "--seed", type=int, help="the seed used to generate repeatable levels"
+    )
+
+    bench_options = parser.add_argument_group("Bench and Profile Options")
+
+    bench_options.add_argument(
+        "--agents",
+        nargs="+",
+        default=[agent.__name__ for agent in BENCH_AGENTS],
+        choices=list(PACMAN_AGENTS.keys()),
+        help="the agents benchmarked or entered into the tournament",
+    )
+
+    bench_options.add_argument(
+        "--max_ticks",
+        default=5000,
+        type=int,
+        help="the number of ticks a game may last before it is stopped",
+    )
+
+    bench_options.add_argument(
+        "--history_window",
+        type=int,
+        help="record the history of each game, keeping this many states in memory",
+    )
+
+    bench_options.add_argument(
+        "--keyframe_interval",
+        default=100,
+        type=int,
+        help="the number of states between each full board of the recorded history",
+    )
+
+    bench_options.add_argument(
+        "--decision_cache",
+        type=int,
+        help="share a cache of this many agent decisions between the games",
+    )
+
+    tournament_options = parser.add_argument_group("Tournament Options")
+
+    tournament_options.add_argument(
+        "--levels",
+        nargs="+",
+        type=int,
+        help="the levels played, every level if not given",
+    )
+
+    tournament_options.add_argument(
+        "--ghosts",
+        nargs="+",
+        default=["classic"],
+        choices=list(GHOST_CONFIGURATIONS.keys()),
+        help="the configurations of ghosts played against",
+    )
+
+    tournament_options.add_argument(
+        "--workers",
+        type=int,
+        help="the number of processes playing games, one per CPU if not given",
+    )
+
+    replay_options = parser.add_argument_group("Record and Replay Options")
+
+    replay_options.add_argument(
+        "--action_log",
+        default="action_log.json",
+        help="the file the action log of a game is written to and replayed from",
+    )
+
     args = parser.parse_args()
 
     match args.run_config:
-        case "local":
+        case "single":
             game = GameManager(
                 args.level, configuration=RunConfiguration.LOCAL, verbose=args.verbose
             )
             game.game_loop()
         case "flask":
+            # Only the server needs the Firebase dependencies of the app.
+            from main import app
+
             app.run(debug=True, port=5001)
         case "analytics":
-            PacmanAnalytics(runs=args.runs)
+            PacmanAnalytics(
+                runs=args.runs,
+                output_file=args.output_file,
+                level_num=args.level or 1,
+                max_ticks=args.max_ticks,
+            )
+        case "train":
+            run_training(args.episodes, args.weights_file)
+        case "compile":
+            compile_levels()
+        case "solve":
+            build_solutions(
+                args.seeds, PACMAN_AGENTS[args.agent], args.criterion, args.max_ticks
+            )
+        case "generate":
+            sizes = [tuple(int(n) for n in size.split("x")) for size in args.sizes]
+            write_levels(
+                args.output_file or "generated_levels.json",
+                sizes,  # type: ignore
+                args.loop_density,
+                args.seed,
+            )
+        case "bench":
+            run_benchmark(
+                [PACMAN_AGENTS[agent] for agent in args.agents],
+                [args.level] if args.level is not None else None,
+                args.seeds,
+                args.max_ticks,
+                args.history_window,
+                args.keyframe_interval,
+                args.decision_cache,
+            )
+        case "profile":
+            profile_game(
+                args.level or 1,
+                PACMAN_AGENTS[args.agent],
+                args.seed or 0,
+                args.output_file or "profile",
+                args.max_ticks,
+            )
+        case "tournament":
+            tournament = Tournament(
+                args.agents,
+                args.levels,
+                args.ghosts,
+                args.seeds,
+                args.workers,
+                args.max_ticks,
+            )
+            tournament.run()
+            tournament.render_leaderboard()
+        case "record":
+            log = record_game(
+                args.level or 1,
+                args.agent,
+                args.seed,
+                args.ghosts[0],
+                args.action_log,
+            )
+            print(
+                f"recorded {len(log)} ticks with seed {log.seed} "
+                f"to {args.action_log}"
+            )
+        case "replay":
+            if not verify_file(args.action_log)["match"]:
+                sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -30,6 +30,13 @@ class GhostDiedException(Exception):
         self.ghost = ghost
 
 
+class InvalidMoveException(Exception):
+    """Raised when an agent attempts to move to a non-adjacent position."""
+
+    def __init__(self, old_pos: tuple[int, int], new_pos: tuple[int, int]) -> None:
+        super().__init__(f"Cannot move from {old_pos} to {new_pos}.")
+
+
 ##########################################
 #            Level Exceptions
 ##########################################
@@ -109,3 +116,15 @@ class CollisionException(Exception):
             f"{self.agent.name()} collided with {self.colliding_entity.name()}"
             f" at {self.node.position}"
         )
+
+
+##########################################
+#            Job Exceptions
+##########################################
+class JobQueueFullException(Exception):
+    """Raised when a game is requested while the job store is full."""
+
+    def __init__(self, max_jobs: int) -> None:
+        super().__init__(
+            f"Cannot accept a new game, {max_jobs} games are already in progress."
+        )
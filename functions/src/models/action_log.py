@@ -0,0 +1,152 @@
+"""Model storing a game as its seed and the move of each agent on each tick."""
+
+import base64
+from typing import Optional
+
+from src.models.graph import Graph
+
+STAY = 0
+"""The code of a move which leaves the agent where it is."""
+JUMP = 255
+"""The code of a move to a node which is not a neighbour, such as a respawn."""
+
+
+class ActionLog:
+    """
+    Model storing a game as its seed and the move of each agent on each tick.
+
+    As the game is deterministic for a given seed, this is enough to simulate
+    it again exactly. Each move is stored as a single byte, `STAY` or one more
+    than the index of the node moved to among the neighbours of the node moved
+    from, so a tick takes a byte per agent rather than a full board. The rare
+    move to a node which is not a neighbour is stored as `JUMP`, with the
+    position moved to kept in `jumps`.
+
+    The end state of the game is stored alongside, so a replay can check that
+    the game it simulates ends the same way.
+    """
+
+    def __init__(
+        self,
+        level_num: int,
+        agent: str,
+        ghosts: str,
+        seed: int,
+        agents: int,
+        moves: Optional[bytearray] = None,
+        jumps: Optional[list[list[int]]] = None,
+        end: Optional[dict] = None,
+    ) -> None:
+        """
+        Initialise the log.
+
+        Parameters
+        ----------
+        `level_num` : `int`
+            The number of the level played.
+        `agent` : `str`
+            The name of the Pac-Man agent, a key of `PACMAN_AGENTS`.
+        `ghosts` : `str`
+            The name of the ghost configuration, a key of `GHOST_CONFIGURATIONS`.
+        `seed` : `int`
+            The seed the game was played with.
+        `agents` : `int`
+            The number of agents moving on each tick.
+        `moves` : `bytearray` DEFAULT = `None`
+            The moves already recorded.
+        `jumps` : `list[list[int]]` DEFAULT = `None`
+            The positions of the `JUMP` moves already recorded.
+        `end` : `dict` DEFAULT = `None`
+            The end state of the game, once it has ended.
+        """
+        self.level_num = level_num
+        """The number of the level played."""
+        self.agent = agent
+        """The name of the Pac-Man agent."""
+        self.ghosts = ghosts
+        """The name of the ghost configuration."""
+        self.seed = seed
+        """The seed the game was played with."""
+        self.agents = agents
+        """The number of agents moving on each tick."""
+        self.moves = moves if moves is not None else bytearray()
+        """The code of each move, the agents of each tick in turn."""
+        self.jumps: list[list[int]] = jumps if jumps is not None else []
+        """The position moved to by each `JUMP` move, in order."""
+        self.end: dict = end if end is not None else {}
+        """The end state of the game, as given by `GameManager.end_state`."""
+
+    def __len__(self) -> int:
+        """Returns the number of ticks recorded."""
+        return len(self.moves) // self.agents
+
+    def record(
+        self, level: Graph, old_pos: tuple[int, int], new_pos: tuple[int, int]
+    ) -> None:
+        """
+        Append the move of an agent.
+
+        Parameters
+        ----------
+        `level` : `Graph`
+            The graph of the game, before the move is made.
+        `old_pos` : `tuple[int, int]`
+            The position the agent is moving from.
+        `new_pos` : `tuple[int, int]`
+            The position the agent is moving to.
+        """
+        if new_pos == old_pos:
+            self.moves.append(STAY)
+            return
+        neighbours = level.get_adjacent(level.find_node_by_pos(old_pos))
+        for index, node in enumerate(neighbours):
+            if node.position == new_pos:
+                self.moves.append(index + 1)
+                return
+        self.moves.append(JUMP)
+        self.jumps.append(list(new_pos))
+
+    def to_json(self) -> dict:
+        """
+        Format the log into a JSON object, with the moves encoded as base64.
+
+        Returns
+        -------
+        `dict`
+            The game, the moves, the jumps and the end state.
+        """
+        return {
+            "level_num": self.level_num,
+            "agent": self.agent,
+            "ghosts": self.ghosts,
+            "seed": self.seed,
+            "agents": self.agents,
+            "moves": base64.b64encode(bytes(self.moves)).decode("ascii"),
+            "jumps": self.jumps,
+            "end": self.end,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ActionLog":
+        """
+        Rebuild a log from the output of `to_json`.
+
+        Parameters
+        ----------
+        `data` : `dict`
+            The JSON object.
+
+        Returns
+        -------
+        The `ActionLog`.
+        """
+        return cls(
+            data["level_num"],
+            data["agent"],
+            data["ghosts"],
+            data["seed"],
+            data["agents"],
+            bytearray(base64.b64decode(data["moves"])),
+            data["jumps"],
+            data["end"],
+        )
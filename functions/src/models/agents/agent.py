@@ -13,8 +13,11 @@ follow the agent cycle:
 https://github.com/dicelab-rhul/vacuumworld
 """
 
+import random
 from abc import ABC, abstractmethod
+from typing import Callable, Hashable, Optional
 
+from src.models.decision_cache import DecisionCache
 from src.models.entity import Entity
 from src.models.graph import Graph
 from src.models.movement_types import MovementTypes
@@ -54,9 +57,14 @@ class Agent(ABC, Entity):
             score attribute as they have a score for `Pac-Man` to collect.
         """
         super().__init__(name, score, value)
+        self.on_mode_change: Optional[Callable[["Agent"], None]] = None
+        """
+        Called with the agent just before and just after its mode changes, so
+        that the hash of the game it is in can be kept up to date.
+        """
         self.behaviour = behaviour
         """The agent's behaviour."""
-        self.movement_type = movement_type
+        self._movement_type = movement_type
         """The agents Movement type"""
         self.home_path = home_path
         """The agents's home path."""
@@ -70,6 +78,17 @@ class Agent(ABC, Entity):
         """The point the agent should respawn to."""
         self.path: Path = Path([])
         """The path the agent is following."""
+        self.rng = random.Random()
+        """
+        The random generator of the agent's decisions. `GameManager` gives every
+        agent of a game the generator of that game, so that games running at
+        the same time do not share random state.
+        """
+        self.decision_cache: Optional[DecisionCache] = None
+        """
+        The cache of decisions shared with other agents and games, if caching
+        is enabled. See `_cached_paths`.
+        """
 
     def __repr__(self) -> str:
         return (
@@ -79,6 +98,61 @@ class Agent(ABC, Entity):
             f"Target: {self.target}), "
         )
 
+    @property
+    def movement_type(self) -> MovementTypes:
+        """The agents Movement type"""
+        return self._movement_type
+
+    @movement_type.setter
+    def movement_type(self, movement_type: MovementTypes) -> None:
+        if movement_type == self._movement_type:
+            return
+        if self.on_mode_change is not None:
+            self.on_mode_change(self)
+        self._movement_type = movement_type
+        if self.on_mode_change is not None:
+            self.on_mode_change(self)
+
+    def _cached_paths(
+        self,
+        level: Graph,
+        signature: tuple[Hashable, ...],
+        search: Callable[[], list[Path]],
+    ) -> list[Path]:
+        """
+        Returns the paths found by a search, read from `decision_cache` if the
+        same search has been made before.
+
+        The search must depend only on the layout of the level and on the
+        `signature`, such as the routes from a position to a target. The routes
+        are cached as cells of the level's topology and a new `Path` is built
+        from them on each use.
+
+        Parameters
+        ----------
+        `level` : `Graph`
+            The current state of the game.
+        `signature` : `tuple[Hashable, ...]`
+            The kind of search and every value it depends on.
+        `search` : `Callable[[], list[Path]]`
+            Finds the paths when they are not cached.
+
+        Returns
+        -------
+        The paths found by the search.
+        """
+        if self.decision_cache is None:
+            return search()
+        topology = level.topology()
+        routes = self.decision_cache.get(
+            (topology, *signature),
+            lambda: tuple(
+                tuple(topology.index[node.position] for node in path.route)
+                for path in search()
+            ),
+        )
+        return [level.path_from_cells(route) for route in routes]
+
     @abstractmethod
     def _perceive(self, time: int, level: Graph) -> None:
         """
@@ -31,6 +31,6 @@ class AuthenticPinky(GhostAgent):
                 (pacman.position[0] + (diff[0] * 4), pacman.position[1] + (diff[1] * 4))
             ]
             self.path = level.shortest_path_to(self.position, self.target[0])
-            if self.path.route[0].position == self.position:
+            if self.path.peek().position == self.position:
                 # The path contains the current pos which must be popped from the list
                 self.path.get_next_pos()
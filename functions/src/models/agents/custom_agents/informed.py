@@ -1,7 +1,6 @@
 """Model representing the informed randomised Pac-Man behaviour"""
 
-from random import choice
-
+from src.models.agents.ghost_agent import GhostAgent
 from src.models.agents.pacman_agent import PacmanAgent
 from src.models.graph import Graph
 from src.models.path import Path
@@ -13,7 +12,8 @@ class InformedPacMan(PacmanAgent):
 
     In this model, Pac-Man will randomly choose a path, however,
     should he reach an unsafe path, Pac-Man will randomly
-    choose a new position as target.
+    choose a new position as target. A path is unsafe if a
+    ghost could reach any part of it before Pac-Man.
     """
 
     def __init__(
@@ -23,21 +23,28 @@ class InformedPacMan(PacmanAgent):
 
     def _perceive(self, time: int, level: Graph) -> None:
         current_node = level.find_node_by_pos(self.position)
+        danger = level.danger_field(GhostAgent)
         if (
             (
                 len(self.move_history) > 0
                 and not level.is_junction(current_node, self.move_history[-1])
             )
-            and self.path.is_safe()
+            and self.path.is_safe(danger=danger)
             and len(self.path) > 0
         ):
             # If the current path is valid then stay on this path
             return
 
         # Get all paths to next jct
-        paths = level.find_path_to_next_jct(self.position)
+        paths = self._cached_paths(
+            level,
+            ("junctions", self.position),
+            lambda: level.find_path_to_next_jct(self.position),
+        )
         # Find all safe paths
-        valid_paths: list[Path] = [path for path in paths if path.is_safe()]
+        valid_paths: list[Path] = [
+            path for path in paths if path.is_safe(danger=danger)
+        ]
         # prune paths where the path only contains the target.
         valid_paths = [path for path in valid_paths if len(paths) > 2]
         # prune paths where the end point == starting point
@@ -46,7 +53,7 @@ class InformedPacMan(PacmanAgent):
         if len(self.move_history) > 1:
             # Remove any paths which would take the agent backwards
             valid_paths = [
-                path for path in valid_paths if path.route[0] != self.move_history[-1]
+                path for path in valid_paths if path.peek() != self.move_history[-1]
             ]
 
         # choose a safe path to follow
@@ -58,11 +65,15 @@ class InformedPacMan(PacmanAgent):
         # If no safe paths exist, allow backwards paths.
         elif len(backwards_paths) > 0:
             print("using this")
-            self.path = choice(backwards_paths)
+            self.path = self.rng.choice(backwards_paths)
         else:
             # If no safe path is found, choose the best scoring path
             # so that highest score can be obtained before death.
-            sorted_paths = sorted(paths, key=lambda path: path.cost(), reverse=True)
+            # The path ending where Pac-Man stands would leave him with no move.
+            moving_paths = [path for path in paths if len(path) > 1] or paths
+            sorted_paths = sorted(
+                moving_paths, key=lambda path: path.cost(), reverse=True
+            )
             self.path: Path = sorted_paths[0]
         # remove current pos from path to prevent static glitch
         self.path.get_next_pos()
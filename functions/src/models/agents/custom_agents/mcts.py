@@ -0,0 +1,379 @@
+"""Model representing the Monte Carlo Tree Search Pac-Man behaviour"""
+
+import math
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+from src.models.agents.ghost_agent import GhostAgent
+from src.models.agents.pacman_agent import PacmanAgent
+from src.models.graph import Graph
+from src.models.movement_types import MovementTypes
+from src.models.simulation_state import SimulationState
+from src.models.topology import LevelTopology
+
+
+class _TreeNode:
+    """A junction within the search tree, reached by following corridors."""
+
+    def __init__(self, cell: int, previous: int, actions: list[int]) -> None:
+        """
+        Initialise the node.
+
+        Parameters
+        ----------
+        `cell` : `int`
+            The cell Pac-Man is in at this node.
+        `previous` : `int`
+            The cell Pac-Man arrived from.
+        `actions` : `list[int]`
+            The first cell of each corridor which can be taken from this node.
+        """
+        self.cell = cell
+        """The cell Pac-Man is in at this node."""
+        self.previous = previous
+        """The cell Pac-Man arrived from."""
+        self.untried = actions
+        """The actions which have not yet been expanded."""
+        self.children: dict[int, _TreeNode] = {}
+        """The expanded actions, keyed by the first cell of the corridor."""
+        self.visits = 0
+        """The number of rollouts which passed through this node."""
+        self.value = 0.0
+        """The total value of the rollouts which passed through this node."""
+
+
+class MCTSPacMan(PacmanAgent):
+    """
+    Model representing the Monte Carlo Tree Search Pac-Man behaviour.
+
+    At each junction, Pac-Man plays out many possible futures on a copy of the
+    game and chooses the corridor which led to the best outcomes. Actions are
+    whole corridors between junctions, which keeps the tree shallow, and the
+    tree is searched using UCT with random rollouts. Once a corridor has been
+    chosen it is followed until the next junction, unless a ghost comes close
+    enough that the decision must be made again. The subtree below the chosen
+    corridor is kept and reused for the next decision.
+
+    The budget of each decision is set with `time_budget` and `rollout_budget`,
+    use `with_budget` to create a variant with a different budget.
+    """
+
+    time_budget: Optional[float] = None
+    """The number of seconds each decision may take, unlimited if `None`."""
+    rollout_budget: Optional[int] = 200
+    """The number of rollouts each decision may take, unlimited if `None`."""
+    horizon: int = 40
+    """The number of ticks simulated ahead by each rollout."""
+    exploration: float = math.sqrt(2)
+    """The exploration constant of the UCT formula."""
+    danger_distance: int = 2
+    """How close a ghost must be before the current corridor is reconsidered."""
+
+    def __init__(
+        self, home_path: list[tuple[int, int]], respawn_point: tuple[int, int]
+    ):
+        super().__init__(home_path, respawn_point)
+        self._topology: LevelTopology
+        """The layout of the level being played."""
+        self._plan: tuple[int, ...] = ()
+        """The cells of the corridor currently being followed."""
+        self._step = 0
+        """The index of the next cell of the plan."""
+        self._root: Optional[_TreeNode] = None
+        """The subtree kept for the junction at the end of the plan."""
+        self._zones: dict[int, tuple[int, ...]] = {}
+        """The cells within `danger_distance` of each cell Pac-Man has been in."""
+        self.decisions = 0
+        """The number of searches which have been run."""
+        self.rollouts = 0
+        """The total number of rollouts across all searches."""
+        self.search_time = 0.0
+        """The total number of seconds spent searching."""
+
+    @classmethod
+    def with_budget(
+        cls, time_budget: Optional[float] = None, rollout_budget: Optional[int] = None
+    ) -> type["MCTSPacMan"]:
+        """
+        Create a variant of the agent with a different budget per decision.
+
+        Parameters
+        ----------
+        `time_budget` : `float` DEFAULT = `None`
+            The number of seconds each decision may take.
+        `rollout_budget` : `int` DEFAULT = `None`
+            The number of rollouts each decision may take.
+
+        Returns
+        -------
+        A subclass of `MCTSPacMan` which can be passed to `GameManager`.
+        """
+        if time_budget is None and rollout_budget is None:
+            raise ValueError("At least one budget must be provided.")
+        label = []
+        if time_budget is not None:
+            label.append(f"{time_budget}s")
+        if rollout_budget is not None:
+            label.append(f"{rollout_budget}r")
+        return type(
+            f"{cls.__name__}[{','.join(label)}]",
+            (cls,),
+            {"time_budget": time_budget, "rollout_budget": rollout_budget},
+        )
+
+    def statistics(self) -> dict[str, float]:
+        return {
+            "decisions": self.decisions,
+            "rollouts": self.rollouts,
+            "rollouts_per_second": (
+                self.rollouts / self.search_time if self.search_time > 0 else 0.0
+            ),
+            "decision_time": (
+                self.search_time / self.decisions if self.decisions > 0 else 0.0
+            ),
+        }
+
+    def _perceive(self, time: int, level: Graph) -> None:
+        self._topology = level.topology()
+        if self._step < len(self._plan) and not self._in_danger(level):
+            # Keep following the corridor until the next junction.
+            return
+
+        state = SimulationState.from_graph(level, time)
+        cell = state.pacman
+        root = self._root
+        if root is None or root.cell != cell or self._step < len(self._plan):
+            previous = cell
+            if len(self.move_history) > 1:
+                previous = self._topology.index.get(self.move_history[-2], cell)
+            root = _TreeNode(cell, previous, list(self._topology.neighbours[cell]))
+        self._search(root, state)
+
+        if len(root.children) == 0:
+            self._plan, self._step, self._root = (), 0, None
+            return
+        first = max(root.children, key=lambda action: root.children[action].visits)
+        self._plan = self._topology.corridor(cell, first)
+        self._step = 0
+        self._root = root.children[first]
+
+    def _execute(self) -> tuple[int, int]:
+        if self._step < len(self._plan):
+            move = self._topology.positions[self._plan[self._step]]
+            self._step += 1
+        else:
+            move = self.position
+        self.move_history.append(move)
+        return move
+
+    def _in_danger(self, level: Graph) -> bool:
+        """
+        Checks whether a ghost is close enough to reconsider the current plan.
+
+        Only the spaces within `danger_distance` of Pac-Man are looked at, so
+        following a corridor does not need a copy of the whole game.
+
+        Parameters
+        ----------
+        `level` : `Graph`
+            The current state of the game.
+
+        Returns
+        -------
+        `True` if an active ghost is within `danger_distance` of Pac-Man.
+        """
+        pacman = self._topology.index[self.position]
+        if pacman not in self._zones:
+            row = self._topology.distance_row(pacman)
+            zone = np.flatnonzero(row <= self.danger_distance).tolist()
+            # Moves are the same both ways except onto a gate, which a ghost
+            # may still leave towards Pac-Man.
+            zone += [
+                gate
+                for gate in self._topology.gates
+                if self._topology.distances_from(gate)[pacman] <= self.danger_distance
+            ]
+            self._zones[pacman] = tuple(zone)
+        for cell in self._zones[pacman]:
+            node = level.find_node_by_pos(self._topology.positions[cell])
+            for entity in node.entities:
+                if (
+                    isinstance(entity, GhostAgent)
+                    and entity.movement_type != MovementTypes.HOMEBOUND
+                ):
+                    return True
+        return False
+
+    def _search(self, root: _TreeNode, state: SimulationState) -> None:
+        """
+        Run rollouts from the root until the budget is spent.
+
+        Parameters
+        ----------
+        `root` : `_TreeNode`
+            The node for Pac-Man's current position.
+        `state` : `SimulationState`
+            The current state of the game.
+        """
+        start = perf_counter()
+        deadline = None if self.time_budget is None else start + self.time_budget
+        count = 0
+        while (self.rollout_budget is None or count < self.rollout_budget) and (
+            deadline is None or perf_counter() < deadline
+        ):
+            self._iterate(root, state)
+            count += 1
+        self.decisions += 1
+        self.rollouts += count
+        self.search_time += perf_counter() - start
+
+    def _iterate(self, root: _TreeNode, state: SimulationState) -> None:
+        """
+        Run a single selection, expansion, rollout and backpropagation pass.
+
+        Parameters
+        ----------
+        `root` : `_TreeNode`
+            The node for Pac-Man's current position.
+        `state` : `SimulationState`
+            The current state of the game.
+        """
+        sim = state.clone()
+        node = root
+        visited = [root]
+        while not sim.is_terminal() and sim.time - state.time < self.horizon:
+            if len(node.untried) > 0:
+                first = node.untried.pop(self.rng.randrange(len(node.untried)))
+                corridor = self._follow(sim, node.cell, first)
+                previous = corridor[-2] if len(corridor) > 1 else node.cell
+                child = _TreeNode(
+                    corridor[-1],
+                    previous,
+                    list(self._topology.neighbours[corridor[-1]]),
+                )
+                node.children[first] = child
+                visited.append(child)
+                node = child
+                break
+            first = self._select(node)
+            self._follow(sim, node.cell, first)
+            node = node.children[first]
+            visited.append(node)
+
+        value = self._rollout(sim, node, state)
+        for step in visited:
+            step.visits += 1
+            step.value += value
+
+    def _select(self, node: _TreeNode) -> int:
+        """
+        Choose the child with the highest upper confidence bound.
+
+        Parameters
+        ----------
+        `node` : `_TreeNode`
+            A fully expanded node.
+
+        Returns
+        -------
+        The action of the chosen child.
+        """
+        log_visits = math.log(node.visits)
+
+        def bound(action: int) -> float:
+            child = node.children[action]
+            return child.value / child.visits + self.exploration * math.sqrt(
+                log_visits / child.visits
+            )
+
+        return max(node.children, key=bound)
+
+    def _follow(self, sim: SimulationState, cell: int, first: int) -> tuple[int, ...]:
+        """
+        Apply the moves of a corridor to the simulation.
+
+        Parameters
+        ----------
+        `sim` : `SimulationState`
+            The simulation to advance.
+        `cell` : `int`
+            The cell Pac-Man is leaving.
+        `first` : `int`
+            The first cell of the corridor.
+
+        Returns
+        -------
+        The cells of the corridor.
+        """
+        corridor = self._topology.corridor(cell, first)
+        for step in corridor:
+            sim.apply(step, self.rng)
+            if sim.is_terminal():
+                break
+        return corridor
+
+    def _rollout(
+        self, sim: SimulationState, node: _TreeNode, root: SimulationState
+    ) -> float:
+        """
+        Play random corridors, never turning back, until the horizon is reached.
+
+        Parameters
+        ----------
+        `sim` : `SimulationState`
+            The simulation at the end of the tree.
+        `node` : `_TreeNode`
+            The node the simulation is at.
+        `root` : `SimulationState`
+            The state the search started from.
+
+        Returns
+        -------
+        The value of the rollout between `0` and `1`.
+        """
+        neighbours = self._topology.neighbours
+        cell, previous = node.cell, node.previous
+        while not sim.is_terminal() and sim.time - root.time < self.horizon:
+            options = [option for option in neighbours[cell] if option != previous]
+            corridor = self._topology.corridor(
+                cell, self.rng.choice(options or neighbours[cell])
+            )
+            for step in corridor:
+                sim.apply(step, self.rng)
+                if sim.is_terminal() or sim.time - root.time >= self.horizon:
+                    break
+            previous = corridor[-2] if len(corridor) > 1 else cell
+            cell = corridor[-1]
+        return self._evaluate(sim, root)
+
+    def _evaluate(self, sim: SimulationState, root: SimulationState) -> float:
+        """
+        Score the outcome of a simulation.
+
+        Dying is worth nothing and clearing the level is worth the most, while
+        surviving is worth more the more score was collected on the way. Ending
+        closer to the remaining pickups breaks ties when no score is in reach.
+
+        Parameters
+        ----------
+        `sim` : `SimulationState`
+            The simulation at the end of the rollout.
+        `root` : `SimulationState`
+            The state the search started from.
+
+        Returns
+        -------
+        The value of the outcome between `0` and `1`.
+        """
+        if sim.lost():
+            return 0.0
+        if sim.won():
+            return 1.0
+        # Ghost streaks can score more than a float can hold, so cap it first.
+        gained = min(sim.score - root.score, 10 * self.horizon)
+        distances = self._topology.distances_from(sim.pacman)
+        nearest = min(
+            distances[cell] for cell, value in enumerate(sim.pickups) if value != 0
+        )
+        return 0.5 + 0.4 * gained / (10 * self.horizon) + 0.1 / (1 + nearest)
@@ -0,0 +1,421 @@
+"""Model representing the minimax and expectimax Pac-Man behaviours"""
+
+import itertools
+import math
+from time import perf_counter
+from typing import Optional
+
+from src.models.agents.pacman_agent import PacmanAgent
+from src.models.graph import Graph
+from src.models.movement_types import MovementTypes
+from src.models.simulation_state import SimulationState
+from src.models.topology import LevelTopology
+
+_EXACT = 0
+"""The stored value is the exact value of the position."""
+_LOWER = 1
+"""The stored value is a lower bound, the search was cut off above it."""
+_UPPER = 2
+"""The stored value is an upper bound, no move reached above it."""
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget has been spent."""
+
+
+class MinimaxPacMan(PacmanAgent):
+    """
+    Model representing the minimax Pac-Man behaviour.
+
+    Every tick Pac-Man searches the moves ahead of him on a copy of the game,
+    assuming the ghosts near him will make whichever moves are worst for him.
+    Ghosts further away than `adversarial_radius` follow their own rules, which
+    keeps the number of ghost moves to consider small. The search is run with
+    iterative deepening until `time_budget` is spent, and branches which cannot
+    change the decision are pruned with alpha-beta pruning.
+
+    Positions are stored in a transposition table keyed by the Zobrist hash of
+    the state, so positions reached by more than one route are only searched
+    once. The score collected on the way to a position does not change what
+    can happen from it, so values are stored relative to the score gained so
+    far and the table is kept between decisions.
+    """
+
+    time_budget: float = 0.05
+    """The number of seconds each decision may take."""
+    max_depth: int = 12
+    """The deepest search, in ticks, that a decision may run."""
+    adversarial_radius: int = 6
+    """How close a ghost must be for its moves to be chosen by the search."""
+    table_size: int = 200_000
+    """The number of positions stored before the table is cleared."""
+    max_gain: int = 100_000
+    """
+    The most score a search counts as gained, so that ghost streaks stay well
+    inside the range of a float and never outweigh dying.
+    """
+
+    def __init__(
+        self, home_path: list[tuple[int, int]], respawn_point: tuple[int, int]
+    ):
+        super().__init__(home_path, respawn_point)
+        self._topology: LevelTopology
+        """The layout of the level being played."""
+        self._table: dict[int, tuple[int, float, int, int]] = {}
+        """
+        The transposition table, mapping the hash of a position to the depth
+        searched, the value found, whether the value is exact or a bound and the
+        best move.
+        """
+        self._deadline = 0.0
+        """The time at which the current search must stop."""
+        self._root_score = 0
+        """Pac-Man's score at the start of the current search."""
+        self._next_move: Optional[int] = None
+        """The cell chosen by the last search."""
+        self.decisions = 0
+        """The number of searches which have been run."""
+        self.expansions = 0
+        """The total number of positions expanded across all searches."""
+        self.lookups = 0
+        """The total number of transposition table lookups."""
+        self.hits = 0
+        """The number of lookups which found a usable value."""
+        self.depth_reached = 0
+        """The total depth completed across all searches."""
+        self.search_time = 0.0
+        """The total number of seconds spent searching."""
+
+    def statistics(self) -> dict[str, float]:
+        return {
+            "decisions": self.decisions,
+            "expansions": self.expansions,
+            "expansions_per_second": (
+                self.expansions / self.search_time if self.search_time > 0 else 0.0
+            ),
+            "table_hit_rate": self.hits / self.lookups if self.lookups > 0 else 0.0,
+            "average_depth": (
+                self.depth_reached / self.decisions if self.decisions > 0 else 0.0
+            ),
+        }
+
+    def _perceive(self, time: int, level: Graph) -> None:
+        state = SimulationState.from_graph(level, time)
+        self._topology = state.topology
+        start = perf_counter()
+        self._deadline = start + self.time_budget
+        self._root_score = state.score
+        if len(self._table) > self.table_size:
+            self._table.clear()
+
+        self._next_move = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                move = self._search_root(state, depth)
+            except _SearchTimeout:
+                break
+            if move is None:
+                break
+            self._next_move = move
+            self.depth_reached += 1
+
+        self.decisions += 1
+        self.search_time += perf_counter() - start
+
+    def _execute(self) -> tuple[int, int]:
+        if self._next_move is None:
+            move = self.position
+        else:
+            move = self._topology.positions[self._next_move]
+        self.move_history.append(move)
+        return move
+
+    def _search_root(self, state: SimulationState, depth: int) -> Optional[int]:
+        """
+        Search every move from the current position to a fixed depth.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The current state of the game.
+        `depth` : `int`
+            The number of ticks to search ahead.
+
+        Returns
+        -------
+        The best move, or `None` if Pac-Man cannot move.
+        """
+        best_move, best_value = None, -math.inf
+        alpha = -math.inf
+        for move in self._ordered_moves(state):
+            value = self._ghost_value(state, move, depth, alpha, math.inf)
+            if value > best_value:
+                best_move, best_value = move, value
+            alpha = max(alpha, value)
+        if best_move is not None:
+            stored = best_value - self._gained(state)
+            self._table[self._key(state)] = (depth, stored, _EXACT, best_move)
+        return best_move
+
+    def _key(self, state: SimulationState) -> tuple:
+        """
+        Returns the key of a position in the transposition table.
+
+        `SimulationState.state_hash` leaves out the values which only change how
+        the ghosts move or how much a ghost is worth, which are added here.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The position.
+
+        Returns
+        -------
+        A key which is equal for positions with the same future.
+        """
+        return (
+            state.state_hash(),
+            state.ghost_streak,
+            tuple(state.ghost_countdowns),
+            tuple(state.ghost_homes),
+        )
+
+    def _gained(self, state: SimulationState) -> int:
+        """
+        Returns the score gained since the start of the search, up to `max_gain`.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The position reached.
+
+        Returns
+        -------
+        The score gained.
+        """
+        return min(state.score - self._root_score, self.max_gain)
+
+    def _ordered_moves(self, state: SimulationState) -> list[int]:
+        """
+        Returns Pac-Man's moves with the best move of an earlier search first.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The state to move from.
+
+        Returns
+        -------
+        The cells Pac-Man can move to.
+        """
+        moves = list(state.pacman_moves())
+        entry = self._table.get(self._key(state))
+        if entry is not None and entry[3] in moves:
+            moves.remove(entry[3])
+            moves.insert(0, entry[3])
+        return moves
+
+    def _ghost_options(self, state: SimulationState) -> list[tuple[int, ...]]:
+        """
+        Returns the moves the search considers for each ghost.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The state the ghosts move from.
+
+        Returns
+        -------
+        The cells each ghost may move to, `-1` if it follows its own rules.
+        """
+        distances = self._topology.distances_from(state.pacman)
+        return [
+            (
+                state.ghost_moves(ghost)
+                if distances[cell] <= self.adversarial_radius
+                else (-1,)
+            )
+            for ghost, cell in enumerate(state.ghost_cells)
+        ]
+
+    def _ghost_value(
+        self,
+        state: SimulationState,
+        move: int,
+        depth: int,
+        alpha: float,
+        beta: float,
+    ) -> float:
+        """
+        Returns the value of a move once the ghosts have replied to it.
+
+        The ghosts choose the reply which is worst for Pac-Man.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The state Pac-Man moves from.
+        `move` : `int`
+            The cell Pac-Man moves to.
+        `depth` : `int`
+            The number of ticks left to search, including this one.
+        `alpha` : `float`
+            The value Pac-Man is already guaranteed.
+        `beta` : `float`
+            The value the ghosts are already guaranteed.
+
+        Returns
+        -------
+        The value of the move.
+        """
+        value = math.inf
+        for ghost_moves in itertools.product(*self._ghost_options(state)):
+            record = state.apply(move, self.rng, ghost_moves=ghost_moves)
+            try:
+                value = min(value, self._search(state, depth - 1, alpha, beta))
+            finally:
+                state.undo(record)
+            beta = min(beta, value)
+            if beta <= alpha:
+                break
+        return value
+
+    def _search(
+        self, state: SimulationState, depth: int, alpha: float, beta: float
+    ) -> float:
+        """
+        Returns the value of a position with Pac-Man to move.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The position to search.
+        `depth` : `int`
+            The number of ticks left to search.
+        `alpha` : `float`
+            The value Pac-Man is already guaranteed.
+        `beta` : `float`
+            The value the ghosts are already guaranteed.
+
+        Returns
+        -------
+        The value of the position.
+        """
+        if state.is_terminal() or depth == 0:
+            return self._evaluate(state)
+        self.expansions += 1
+        if self.expansions & 0xFF == 0 and perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+        key = self._key(state)
+        gained = self._gained(state)
+        self.lookups += 1
+        entry = self._table.get(key)
+        if entry is not None and entry[0] >= depth:
+            stored, bound = entry[1] + gained, entry[2]
+            if (
+                bound == _EXACT
+                or (bound == _LOWER and stored >= beta)
+                or (bound == _UPPER and stored <= alpha)
+            ):
+                self.hits += 1
+                return stored
+
+        original_alpha = alpha
+        best_move, best_value = -1, -math.inf
+        for move in self._ordered_moves(state):
+            value = self._ghost_value(state, move, depth, alpha, beta)
+            if value > best_value:
+                best_move, best_value = move, value
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            bound = _UPPER
+        elif best_value >= beta:
+            bound = _LOWER
+        else:
+            bound = _EXACT
+        self._table[key] = (depth, best_value - gained, bound, best_move)
+        return best_value
+
+    def _evaluate(self, state: SimulationState) -> float:
+        """
+        Score a position at the end of the search.
+
+        Dying is worse than any other outcome and clearing the level is better
+        than any other outcome. Otherwise the score gained counts the most,
+        followed by being close to the remaining pickups and far from the
+        active ghosts.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The position to score.
+
+        Returns
+        -------
+        The value of the position.
+        """
+        gained = self._gained(state)
+        if state.lost():
+            return -1_000_000.0 + gained
+        if state.won():
+            return 1_000_000.0 + gained
+        distances = self._topology.distances_from(state.pacman)
+        nearest = min(
+            distances[cell] for cell, value in enumerate(state.pickups) if value != 0
+        )
+        danger = min(
+            (
+                distances[cell]
+                for cell, mode in zip(state.ghost_cells, state.ghost_modes)
+                if mode != MovementTypes.HOMEBOUND.value
+                and mode != MovementTypes.FRIGHTENED.value
+            ),
+            default=self.adversarial_radius,
+        )
+        return gained - 2 * nearest + 5 * min(danger, self.adversarial_radius)
+
+
+class ExpectimaxPacMan(MinimaxPacMan):
+    """
+    Model representing the expectimax Pac-Man behaviour.
+
+    The search is the same as `MinimaxPacMan`, but rather than assuming the
+    worst the ghosts are modelled the way they actually behave. Ghosts chasing
+    Pac-Man follow their own rules, while frightened ghosts move at random and
+    so every move they could make is averaged. Pruning is only possible while
+    no ghost is frightened, as an average can be changed by any of its moves.
+    """
+
+    def _ghost_options(self, state: SimulationState) -> list[tuple[int, ...]]:
+        return [
+            (
+                state.ghost_moves(ghost)
+                if mode == MovementTypes.FRIGHTENED.value
+                else (-1,)
+            )
+            for ghost, mode in enumerate(state.ghost_modes)
+        ]
+
+    def _ghost_value(
+        self,
+        state: SimulationState,
+        move: int,
+        depth: int,
+        alpha: float,
+        beta: float,
+    ) -> float:
+        outcomes = list(itertools.product(*self._ghost_options(state)))
+        if len(outcomes) > 1:
+            alpha, beta = -math.inf, math.inf
+        total = 0.0
+        for ghost_moves in outcomes:
+            record = state.apply(move, self.rng, ghost_moves=ghost_moves)
+            try:
+                total += self._search(state, depth - 1, alpha, beta)
+            finally:
+                state.undo(record)
+        return total / len(outcomes)
@@ -0,0 +1,234 @@
+"""Model representing the approximate Q-learning Pac-Man behaviour"""
+
+import os
+from time import perf_counter
+from typing import Optional, Sequence
+
+import numpy as np
+from src.models.agents.ghost_agent import GhostAgent
+from src.models.agents.pacman_agent import PacmanAgent
+from src.models.graph import Graph
+from src.models.movement_types import MovementTypes
+from src.models.pickups import Pickup
+from src.models.simulation_state import SimulationState
+from src.models.topology import LevelTopology
+
+FEATURES: tuple[str, ...] = (
+    "bias",
+    "nearest_pickup",
+    "eats_pickup",
+    "nearest_ghost",
+    "ghosts_adjacent",
+    "energized",
+    "energized_nearest_ghost",
+    "corridor_pickups",
+)
+"""The name of each feature, in the order they appear in a feature vector."""
+
+WEIGHTS_FILE = os.path.join(os.path.dirname(__file__), "q_learning_weights.npz")
+"""The file the trained weights are saved to and loaded from."""
+
+DEFAULT_WEIGHTS = np.array([0.0, -1.0, 1.0, 0.5, -10.0, 0.0, 1.0, 0.2])
+"""Hand-picked weights used when no trained weights have been saved."""
+
+
+def action_features(state: SimulationState, moves: Sequence[int]) -> np.ndarray:
+    """
+    Build the feature vector of every move Pac-Man can make from a state.
+
+    Parameters
+    ----------
+    `state` : `SimulationState`
+        The state Pac-Man moves from.
+    `moves` : `Sequence[int]`
+        The cells Pac-Man can move to.
+
+    Returns
+    -------
+    A `(len(moves), len(FEATURES))` array of features.
+    """
+    return move_features(
+        state.topology,
+        np.frombuffer(state.pickups, dtype=np.uint8),
+        state.pacman,
+        [
+            cell
+            for cell, mode in zip(state.ghost_cells, state.ghost_modes)
+            if mode != MovementTypes.HOMEBOUND.value
+        ],
+        state.energized,
+        moves,
+    )
+
+
+def move_features(
+    topology: LevelTopology,
+    pickups: np.ndarray,
+    pacman: int,
+    ghosts: Sequence[int],
+    energized: bool,
+    moves: Sequence[int],
+) -> np.ndarray:
+    """
+    Build the feature vector of every move Pac-Man can make.
+
+    Distances are read from the topology's distance table for every move at
+    once and divided by the size of the board, so that every feature is close
+    to the range `0` to `1` regardless of the level.
+
+    Parameters
+    ----------
+    `topology` : `LevelTopology`
+        The layout of the level.
+    `pickups` : `np.ndarray`
+        The value of the pickup in each cell, `0` where there is none.
+    `pacman` : `int`
+        The cell Pac-Man moves from.
+    `ghosts` : `Sequence[int]`
+        The cells of the ghosts which are not returning home.
+    `energized` : `bool`
+        Whether Pac-Man is energized.
+    `moves` : `Sequence[int]`
+        The cells Pac-Man can move to.
+
+    Returns
+    -------
+    A `(len(moves), len(FEATURES))` array of features.
+    """
+    scale = topology.width + topology.height
+    cells = np.asarray(moves, dtype=np.intp)
+    rows = np.array(
+        [topology.distance_row(cell) for cell in moves], dtype=topology.dtype
+    ).reshape(len(cells), len(topology))
+    features = np.zeros((len(cells), len(FEATURES)))
+    features[:, 0] = 1.0
+
+    mask = pickups != 0
+    if mask.any():
+        features[:, 1] = rows[:, mask].min(axis=1) / scale
+    features[:, 2] = pickups[cells] != 0
+
+    if len(ghosts) > 0:
+        ghost_rows = rows[:, np.asarray(ghosts, dtype=np.intp)]
+        nearest = np.minimum(ghost_rows.min(axis=1), scale) / scale
+    else:
+        ghost_rows = np.empty((len(cells), 0))
+        nearest = np.ones(len(cells))
+    if energized:
+        features[:, 5] = 1.0
+        features[:, 6] = 1.0 - nearest
+    else:
+        features[:, 3] = nearest
+        features[:, 4] = (ghost_rows <= 1).sum(axis=1)
+
+    features[:, 7] = [
+        np.count_nonzero(pickups[list(topology.corridor(pacman, move))]) / scale
+        for move in moves
+    ]
+    return features
+
+
+class QLearningPacMan(PacmanAgent):
+    """
+    Model representing the approximate Q-learning Pac-Man behaviour.
+
+    The value of each move is estimated as the dot product of its features and
+    a set of learned weights, and Pac-Man takes the move with the highest value.
+    The weights are trained by `src.scripts.training.QLearningTrainer` and read
+    from `weights_file` the first time a decision is made. If the file does not
+    exist, `DEFAULT_WEIGHTS` are used.
+    """
+
+    weights_file: str = WEIGHTS_FILE
+    """The file the weights are loaded from."""
+    _loaded: dict[str, np.ndarray] = {}
+    """The weights loaded from each file, shared between every game."""
+
+    def __init__(
+        self, home_path: list[tuple[int, int]], respawn_point: tuple[int, int]
+    ):
+        super().__init__(home_path, respawn_point)
+        self._topology: LevelTopology
+        """The layout of the level being played."""
+        self._pickups: Optional[np.ndarray] = None
+        """
+        The value of the pickup in each cell, found once and then cleared as
+        Pac-Man eats them.
+        """
+        self._next_move: Optional[int] = None
+        """The cell chosen by the last decision."""
+        self.decisions = 0
+        """The number of decisions which have been made."""
+        self.decision_time = 0.0
+        """The total number of seconds spent making decisions."""
+
+    @classmethod
+    def weights(cls) -> np.ndarray:
+        """
+        Returns the weights of the agent, loading them on first use.
+
+        Returns
+        -------
+        An array with a weight for each of the `FEATURES`.
+        """
+        if cls.weights_file not in QLearningPacMan._loaded:
+            if os.path.exists(cls.weights_file):
+                with np.load(cls.weights_file) as data:
+                    weights = data["weights"]
+            else:
+                weights = DEFAULT_WEIGHTS
+            QLearningPacMan._loaded[cls.weights_file] = weights
+        return QLearningPacMan._loaded[cls.weights_file]
+
+    def statistics(self) -> dict[str, float]:
+        return {
+            "decisions": self.decisions,
+            "decision_time": (
+                self.decision_time / self.decisions if self.decisions > 0 else 0.0
+            ),
+        }
+
+    def _perceive(self, time: int, level: Graph) -> None:
+        start = perf_counter()
+        self._topology = topology = level.topology()
+        pacman = topology.index[self.position]
+        if self._pickups is None:
+            self._pickups = np.zeros(len(topology), dtype=np.uint8)
+            for node in level.nodes():
+                for entity in node.entities:
+                    if isinstance(entity, Pickup):
+                        self._pickups[topology.index[node.position]] = entity.value()
+        elif not any(
+            isinstance(entity, Pickup)
+            for entity in level.find_node_by_pos(self.position).entities
+        ):
+            # Only Pac-Man eats pickups, so only his cell can have changed.
+            self._pickups[pacman] = 0
+        ghosts = [
+            topology.index[node.position]
+            for node in level.locate(GhostAgent)
+            for entity in node.entities
+            if isinstance(entity, GhostAgent)
+            and entity.movement_type != MovementTypes.HOMEBOUND
+        ]
+        moves = topology.neighbours[pacman]
+        if len(moves) == 0:
+            self._next_move = None
+        else:
+            values = (
+                move_features(
+                    topology, self._pickups, pacman, ghosts, self.energized, moves
+                )
+                @ self.weights()
+            )
+            self._next_move = moves[int(np.argmax(values))]
+        self.decisions += 1
+        self.decision_time += perf_counter() - start
+
+    def _execute(self) -> tuple[int, int]:
+        if self._next_move is None:
+            move = self.position
+        else:
+            move = self._topology.positions[self._next_move]
+        self.move_history.append(move)
+        return move
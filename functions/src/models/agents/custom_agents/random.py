@@ -1,7 +1,5 @@
 """Model representing the randomised Pac-Man behaviour"""
 
-from random import choice
-
 from src.models.agents.pacman_agent import PacmanAgent
 from src.models.graph import Graph
 
@@ -24,8 +22,8 @@ class RandomPacMan(PacmanAgent):
         all_paths = level.find_path_to_next_jct(self.position)
         # prune paths where the path only contains the target.
         valid_paths = [path for path in all_paths if len(path) > 2]
-        self.path = choice(valid_paths)
-        if self.path.route[0].position == self.position:
+        self.path = self.rng.choice(valid_paths)
+        if self.path.peek().position == self.position:
             # if the path contains the current pos it must be removed from the list
             self.path.get_next_pos()
 
@@ -1,9 +1,9 @@
 """Collection of models representing the Ghosts."""
 
-from random import choice
-
+from src import exceptions
 from src.models.agents.agent import Agent
 from src.models.agents.pacman_agent import PacmanAgent
+from src.models.ghost_routes import GhostRoutes
 from src.models.graph import Graph
 from src.models.movement_types import MovementTypes
 from src.models.path import Path
@@ -45,6 +45,19 @@ class GhostAgent(Agent):
         self.path: Path = Path([])
         """The path the agent is taking."""
         self._frightened_countdown: int = 6
+        self.release_after: int | None = None
+        """
+        The number of pickups which must be consumed before a `HOMEBOUND` ghost
+        leaves the ghost house, `None` for ghosts which start outside of it.
+
+        The ghost is placed on its respawn point on every tick where exactly this
+        many pickups have been consumed.
+        """
+        self.routes: GhostRoutes | None = None
+        """
+        The precomputed routes of the level, shared between games. If not set,
+        routes are found on the graph instead.
+        """
 
     def _perceive(self, time: int, level: Graph) -> None:
         match self.movement_type:
@@ -55,17 +68,27 @@ class GhostAgent(Agent):
                     self._frightened_countdown = 6
                     self.movement_type = MovementTypes.CHASE
 
-                self.path = choice(level.find_path_to_next_jct(self.position))
+                self.path = self.rng.choice(level.find_path_to_next_jct(self.position))
 
             case MovementTypes.SCATTER:
                 if len(self.target) > 0 and self.position == self.target[0]:
                     self.target.pop(0)
-                self.path = level.shortest_path_to(self.position, self.target[0])
+                target = self.target[0]
+                self.path = self._cached_paths(
+                    level,
+                    ("scatter", self.position, target),
+                    lambda: [self._route_to(level, target)],
+                )[0]
 
             case MovementTypes.CHASE:
                 pacman_node = level.find_node_by_entity(PacmanAgent)[0]
                 self.target = [pacman_node.position]
-                self.path = level.shortest_path_to(self.position, self.target[0])
+                target = self.target[0]
+                self.path = self._cached_paths(
+                    level,
+                    ("chase", self.position, target),
+                    lambda: [level.shortest_path_to(self.position, target)],
+                )[0]
 
             case MovementTypes.CHASE | MovementTypes.SCATTER:
                 # Only update time when not frightened
@@ -74,24 +97,64 @@ class GhostAgent(Agent):
                 if self._internal_time >= 20 and self._internal_time < 27:
                     self.movement_type = MovementTypes.SCATTER
                     # When scattering to home, this should become their target.
-                    self.target = self.home_path
+                    self.target = list(self.home_path)
                 else:
                     self.movement_type = MovementTypes.CHASE
                     # Reset timer
                     self._internal_time = 0
 
         if self.movement_type != MovementTypes.HOMEBOUND:
-            if self.path.route[0].position == self.position:
+            if self.path.peek().position == self.position:
                 # The path contains the current pos which must be popped from the list
                 self.path.get_next_pos()
 
     def _execute(self) -> tuple[int, int]:
         match self.movement_type:
             case MovementTypes.CHASE | MovementTypes.SCATTER | MovementTypes.FRIGHTENED:
+                if len(self.path) == 0:
+                    # Already at the target, so there is nowhere to move to.
+                    return self.position
                 return self.path.get_next_pos().position
             case _:
                 return self.position
 
+    def _route_to(self, level: Graph, target: tuple[int, int]) -> Path:
+        """
+        Returns the shortest path from the ghost's position to a fixed target.
+
+        Parameters
+        ----------
+        `level` : `Graph`
+            The current state of the game.
+        `target` : `tuple[int, int]`
+            The position to move to.
+
+        Returns
+        -------
+        The `Path` to the target, read from `routes` where possible.
+        """
+        if self.routes is None:
+            return level.shortest_path_to(self.position, target)
+        route = self.routes.route(self.position, target)
+        if len(route) == 0:
+            raise exceptions.PathNotFoundException(self.position)
+        return level.path_from_cells(route)
+
+    def _release(self, level: Graph) -> None:
+        """
+        Release the ghost from the ghost house towards its respawn point.
+
+        Parameters
+        ----------
+        `level` : `Graph`
+            The current state of the game.
+        """
+        self.movement_type = MovementTypes.CHASE
+        if self.routes is None:
+            self.path = Path([level.find_node_by_pos(self.respawn_point)])
+        else:
+            self.path = level.path_from_cells(self.routes.exit(self.name()))
+
     def handle_capture(self) -> None:
         """Handles the event of the ghost being consumed by Pac-Man"""
         self.movement_type = MovementTypes.CHASE
@@ -120,13 +183,13 @@ class PinkyAgent(GhostAgent):
         super().__init__(
             "Pinky", "Speedy", MovementTypes.HOMEBOUND, homes, 22, respawn_point, 200
         )
+        self.release_after = 1
 
     def _perceive(self, time: int, level: Graph) -> None:
         super()._perceive(time, level)
         # Activate Ghost
-        if level.total_pickups - level.remaining_pickups() == 1:
-            self.movement_type = MovementTypes.CHASE
-            self.path = Path([level.find_node_by_pos(self.respawn_point)])
+        if level.total_pickups - level.remaining_pickups() == self.release_after:
+            self._release(level)
 
 
 class InkyAgent(GhostAgent):
@@ -134,12 +197,12 @@ class InkyAgent(GhostAgent):
         super().__init__(
             "Inky", "Bashful", MovementTypes.HOMEBOUND, homes, 23, respawn_point, 200
         )
+        self.release_after = 30
 
     def _perceive(self, time: int, level: Graph) -> None:
         super()._perceive(time, level)
-        if level.total_pickups - level.remaining_pickups() == 30:
-            self.movement_type = MovementTypes.CHASE
-            self.path = Path([level.find_node_by_pos(self.respawn_point)])
+        if level.total_pickups - level.remaining_pickups() == self.release_after:
+            self._release(level)
 
 
 class ClydeAgent(GhostAgent):
@@ -147,9 +210,9 @@ class ClydeAgent(GhostAgent):
         super().__init__(
             "Clyde", "Pokey", MovementTypes.HOMEBOUND, homes, 24, respawn_point, 200
         )
+        self.release_after = 60
 
     def _perceive(self, time: int, level: Graph) -> None:
         super()._perceive(time, level)
-        if level.total_pickups - level.remaining_pickups() == 60:
-            self.movement_type = MovementTypes.CHASE
-            self.path = Path([level.find_node_by_pos(self.respawn_point)])
+        if level.total_pickups - level.remaining_pickups() == self.release_after:
+            self._release(level)
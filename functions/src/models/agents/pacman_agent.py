@@ -1,11 +1,47 @@
 """Model representing the agent for Pac-man."""
 
+import math
+
 from src import exceptions
 from src.models.agents.agent import Agent
 from src.models.graph import Graph
 from src.models.movement_types import MovementTypes
 from src.models.pickups import Pickup, PowerPellet
 
+MAX_SCORE = 2**62
+"""The score consuming ghosts can raise a score to, well inside `np.int64`."""
+
+
+def add_ghost_score(score: int, ghost_score: int, streak: int) -> int:
+    """
+    Returns a score after consuming a ghost as part of a streak.
+
+    The bonus is `(ghost_score / 100) ** streak * 100`, computed with integers so
+    that it is exact however long the streak. As it doubles with every ghost of
+    a streak, it only raises the score as far as `MAX_SCORE`. The engine,
+    `SimulationState` and `BatchSimulation` all score ghosts with this function.
+
+    Parameters
+    ----------
+    `score` : `int`
+        The score before the ghost is consumed.
+    `ghost_score` : `int`
+        The score of the ghost.
+    `streak` : `int`
+        The number of ghosts consumed in the streak, including this one.
+
+    Returns
+    -------
+    The new score.
+    """
+    room = MAX_SCORE - score
+    if room <= 0:
+        return score
+    if ghost_score > 100 and streak * math.log2(ghost_score / 100) > 62:
+        # The bonus is far larger than any room left, so skip computing it.
+        return MAX_SCORE
+    return score + min(ghost_score**streak // 100 ** (streak - 1), room)
+
 
 class PacmanAgent(Agent):
     """
@@ -38,7 +74,7 @@ class PacmanAgent(Agent):
         )
         self.current_lives = 1
         """Store the number of lives the user agent has remaining."""
-        self.energized = False
+        self._energized = False
         """
         Store whether Pac-man is currently energized. This is true when the
         agent has consumed a Power Pellet and is then able to consume ghosts.
@@ -56,6 +92,24 @@ class PacmanAgent(Agent):
             f"Ghosts Consumed: {self.temp_ghost_counter})"
         )
 
+    @property
+    def energized(self) -> bool:
+        """
+        Whether Pac-man is currently energized. This is true when the agent has
+        consumed a Power Pellet and is then able to consume ghosts.
+        """
+        return self._energized
+
+    @energized.setter
+    def energized(self, energized: bool) -> None:
+        if energized == self._energized:
+            return
+        if self.on_mode_change is not None:
+            self.on_mode_change(self)
+        self._energized = energized
+        if self.on_mode_change is not None:
+            self.on_mode_change(self)
+
     def increase_score(self, score: int) -> None:
         """
         Increase the agents score.
@@ -79,8 +133,10 @@ class PacmanAgent(Agent):
             if self.energized:
                 # If Pac-man has successfully consumed a ghost
                 self.temp_ghost_counter += 1
-                score = int(((pickup.score() / 100) ** self.temp_ghost_counter) * 100)
-                self.increase_score(score)
+                score = add_ghost_score(
+                    self.score(), pickup.score(), self.temp_ghost_counter
+                )
+                self.increase_score(score - self.score())
                 raise exceptions.GhostDiedException(pickup)
             else:
                 # If Pac-man has consumed a ghost without energizer
@@ -94,6 +150,19 @@ class PacmanAgent(Agent):
         self.energized = False
         self.temp_ghost_counter = 0
 
+    def statistics(self) -> dict[str, float]:
+        """
+        Returns statistics about the agent's decision making.
+
+        Agents which search ahead should override this to report on their
+        search, such as how many futures were explored per second.
+
+        Returns
+        -------
+        A `dict` mapping the name of each statistic to its value.
+        """
+        return {}
+
     def _perceive(self, time: int, level: Graph) -> None:
         raise NotImplementedError
 
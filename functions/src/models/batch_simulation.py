@@ -0,0 +1,342 @@
+"""Model advancing many games of the same level in lockstep with NumPy."""
+
+from typing import Callable, Optional
+
+import numpy as np
+from src import exceptions
+from src.models.agents.pacman_agent import add_ghost_score
+from src.models.movement_types import MovementTypes
+from src.models.simulation_state import PICKUP_SCORES, POWER_PELLET, SimulationState
+
+_SCATTER = MovementTypes.SCATTER.value
+_CHASE = MovementTypes.CHASE.value
+_FRIGHTENED = MovementTypes.FRIGHTENED.value
+
+
+class BatchSimulation:
+    """
+    Model advancing many games of the same level in lockstep with NumPy.
+
+    Every game starts from the same `SimulationState` and is stored as one row
+    of a set of arrays: the pickups as `(games, cells)`, the ghosts as
+    `(games, ghosts)` and Pac-Man's cell, score and timers as `(games,)`. A tick
+    of every game is a fixed number of array operations, so the cost per game
+    falls as the batch grows.
+
+    The rules match `SimulationState.apply` exactly, ghosts and collisions
+    included. Games which have ended are left unchanged by later ticks. The
+    bonus for consuming a ghost doubles with every ghost in a streak, so both
+    score it with `add_ghost_score`, which saturates rather than overflows.
+    """
+
+    def __init__(
+        self, state: SimulationState, games: int, seed: Optional[int] = None
+    ) -> None:
+        """
+        Copy a state into every game of the batch.
+
+        Parameters
+        ----------
+        `state` : `SimulationState`
+            The state every game starts from.
+        `games` : `int`
+            The number of games to run.
+        `seed` : `int` DEFAULT = `None`
+            The seed of the random generator used by frightened ghosts and the
+            random policy.
+        """
+        topology = state.topology
+        self.topology = topology
+        """The layout of the level, shared between all games."""
+        self.games = games
+        """The number of games in the batch."""
+        self.rng = np.random.default_rng(seed)
+        """The random generator used by frightened ghosts and random policies."""
+
+        degree = max(len(options) for options in topology.neighbours)
+        self.neighbours = np.full((len(topology), degree), -1, dtype=np.intp)
+        """`(cells, degree)` table of the neighbours of each cell, padded by `-1`."""
+        self.degree = np.zeros(len(topology), dtype=np.intp)
+        """The number of neighbours of each cell."""
+        for cell, options in enumerate(topology.neighbours):
+            self.neighbours[cell, : len(options)] = options
+            self.degree[cell] = len(options)
+        self.next_hop = topology.next_hop.astype(np.intp)
+        """`LevelTopology.next_hop` as indices."""
+        self.fixtures = np.zeros(len(topology), dtype=np.int64)
+        """`1` for each cell holding a `Gate` or `Teleporter`, otherwise `0`."""
+        self.fixtures[list(topology.fixtures)] = 1
+
+        self.pickup_scores = np.array(PICKUP_SCORES, dtype=np.int64)
+        """The score of each pickup, indexed by the pickup's value."""
+        ghosts = state.ghosts
+        self.ghost_scores = np.array([ghost.score for ghost in ghosts], dtype=np.int64)
+        """The score of consuming each ghost."""
+        self.ghost_respawns = np.array([ghost.respawn for ghost in ghosts], np.intp)
+        """The cell each ghost returns to when released or consumed."""
+        self.ghost_releases = np.array([ghost.release_after for ghost in ghosts])
+        """
+        The number of pickups consumed when each ghost is placed on its respawn
+        point, `-1` if it never is.
+        """
+        longest = max([len(ghost.homes) for ghost in ghosts] + [1])
+        self.ghost_home_counts = np.array([len(ghost.homes) for ghost in ghosts])
+        """The number of home corners of each ghost."""
+        self.ghost_home_cells = np.zeros((len(ghosts), longest), dtype=np.intp)
+        """`(ghosts, homes)` table of the home corners of each ghost."""
+        for i, ghost in enumerate(ghosts):
+            self.ghost_home_cells[i, : len(ghost.homes)] = ghost.homes
+
+        self.total_pickups = state.total_pickups
+        """The number of pickups the level started with."""
+        self.pickups = np.tile(np.frombuffer(state.pickups, dtype=np.uint8), (games, 1))
+        """`(games, cells)` value of the pickup in each cell, `0` if there is none."""
+        self.remaining = np.full(games, state.remaining, dtype=np.int64)
+        """The number of pickups remaining in each game."""
+        self.pacman = np.full(games, state.pacman, dtype=np.intp)
+        """The cell Pac-Man is in, in each game."""
+        self.ghost_cells = np.tile(np.array(state.ghost_cells, np.intp), (games, 1))
+        """`(games, ghosts)` cell of each ghost."""
+        self.ghost_modes = np.tile(np.array(state.ghost_modes), (games, 1))
+        """`(games, ghosts)` `MovementTypes` value of each ghost."""
+        self.ghost_countdowns = np.tile(np.array(state.ghost_countdowns), (games, 1))
+        """`(games, ghosts)` ticks each ghost has left of being frightened."""
+        self.ghost_homes = np.tile(np.array(state.ghost_homes), (games, 1))
+        """`(games, ghosts)` index of the home corner each ghost is heading to."""
+        self.score = np.full(games, state.score, dtype=np.int64)
+        """Pac-Man's score in each game."""
+        self.energized = np.full(games, state.energized, dtype=bool)
+        """Whether Pac-Man is energized in each game."""
+        self.ghost_streak = np.full(games, state.ghost_streak, dtype=np.int64)
+        """The number of ghosts consumed while energized in each game."""
+        self.lives = np.full(games, state.lives, dtype=np.int64)
+        """The number of lives Pac-Man has remaining in each game."""
+        self.time = np.full(games, state.time, dtype=np.int64)
+        """The game time of each game."""
+
+    def won(self) -> np.ndarray:
+        """Returns whether each game has been won."""
+        return self.remaining == 0
+
+    def lost(self) -> np.ndarray:
+        """Returns whether each game has been lost."""
+        return self.lives <= 0
+
+    def is_terminal(self) -> np.ndarray:
+        """Returns whether each game has ended."""
+        return self.won() | self.lost()
+
+    def apply(self, moves: np.ndarray, mask: Optional[np.ndarray] = None) -> None:
+        """
+        Advance every game which has not ended by a single tick.
+
+        Parameters
+        ----------
+        `moves` : `np.ndarray`
+            The cell Pac-Man moves to in each game, either his current cell or a
+            neighbour. The moves of games which have ended are ignored.
+        `mask` : `np.ndarray` DEFAULT = `None`
+            Whether each game should be advanced. If not provided every game
+            which has not ended is advanced.
+        """
+        active = ~self.is_terminal()
+        if mask is not None:
+            active &= mask
+        games = np.flatnonzero(active)
+        moves = np.asarray(moves, dtype=np.intp)[games]
+        current = self.pacman[games]
+        invalid = (moves != current) & ~(
+            self.neighbours[current] == moves[:, np.newaxis]
+        ).any(axis=1)
+        if invalid.any():
+            first = int(np.argmax(invalid))
+            raise exceptions.InvalidMoveException(
+                self.topology.positions[self.pacman[games[first]]],
+                self.topology.positions[moves[first]],
+            )
+
+        self.time[games] += 1
+        moved = moves != current
+        self.pacman[games] = moves
+        values = self.pickups[games, moves]
+        ghosts_here = self.ghost_cells[games] == moves[:, np.newaxis]
+        # Collisions are only resolved when a space holds exactly two entities.
+        single = moved & (
+            (values != 0) + ghosts_here.sum(axis=1) + self.fixtures[moves] == 1
+        )
+        eat = single & (values != 0)
+        eating = games[eat]
+        self.score[eating] += self.pickup_scores[values[eat]]
+        self.energized[eating] |= values[eat] == POWER_PELLET
+        self.pickups[eating, moves[eat]] = 0
+        self.remaining[eating] -= 1
+        caught = single & (values == 0) & ghosts_here.any(axis=1)
+        first = ghosts_here.argmax(axis=1)
+        for ghost in range(self.ghost_cells.shape[1]):
+            hit = np.zeros_like(active)
+            hit[games[caught & (first == ghost)]] = True
+            self._collide(active, hit, ghost)
+
+        # Games stop moving ghosts for the rest of the tick once Pac-Man dies.
+        eaten = self.total_pickups - self.remaining
+        rows = np.arange(self.games)
+        for ghost in range(self.ghost_cells.shape[1]):
+            previous = self.ghost_cells[:, ghost].copy()
+            self._move_ghost(active, ghost)
+            released = active & (eaten == self.ghost_releases[ghost])
+            self.ghost_modes[released, ghost] = _CHASE
+            self.ghost_cells[released, ghost] = self.ghost_respawns[ghost]
+            cells = self.ghost_cells[:, ghost]
+            occupants = (
+                (self.pickups[rows, cells] != 0)
+                + (self.ghost_cells == cells[:, np.newaxis]).sum(axis=1)
+                + self.fixtures[cells]
+            )
+            hit = active & (cells != previous) & (cells == self.pacman)
+            self._collide(active, hit & (occupants == 1), ghost)
+
+    def run(
+        self,
+        policy: Callable[["BatchSimulation"], np.ndarray],
+        max_ticks: int,
+    ) -> dict[str, np.ndarray]:
+        """
+        Play every game with a policy until it ends or `max_ticks` is reached.
+
+        Parameters
+        ----------
+        `policy` : `Callable[[BatchSimulation], np.ndarray]`
+            Function returning the move of Pac-Man in every game.
+        `max_ticks` : `int`
+            The game time at which games are stopped.
+
+        Returns
+        -------
+        The score, time and outcome of every game.
+        """
+        while True:
+            running = ~self.is_terminal() & (self.time < max_ticks)
+            if not running.any():
+                break
+            self.apply(policy(self), running)
+        return {
+            "score": self.score.copy(),
+            "time": self.time.copy(),
+            "won": self.won(),
+            "lost": self.lost(),
+        }
+
+    def _collide(self, active: np.ndarray, hit: np.ndarray, ghost: int) -> None:
+        """
+        Resolve Pac-Man and a ghost colliding in some of the games.
+
+        Parameters
+        ----------
+        `active` : `np.ndarray`
+            Whether each game was running at the start of the tick. Games where
+            Pac-Man has died are removed from it.
+        `hit` : `np.ndarray`
+            Whether Pac-Man and the ghost collided in each game.
+        `ghost` : `int`
+            The index of the ghost.
+        """
+        if not hit.any():
+            return
+        eaten = hit & self.energized
+        if eaten.any():
+            self.ghost_streak[eaten] += 1
+            # Ghosts are rarely eaten, so each bonus is scored exactly in Python.
+            ghost_score = int(self.ghost_scores[ghost])
+            self.score[eaten] = [
+                add_ghost_score(int(score), ghost_score, int(streak))
+                for score, streak in zip(self.score[eaten], self.ghost_streak[eaten])
+            ]
+            self.ghost_cells[eaten, ghost] = self.ghost_respawns[ghost]
+            self.ghost_modes[eaten, ghost] = _CHASE
+        died = hit & ~self.energized
+        self.lives[died] -= 1
+        active &= ~died
+
+    def _move_ghost(self, active: np.ndarray, ghost: int) -> None:
+        """
+        Move a single ghost according to its mode in every game.
+
+        Parameters
+        ----------
+        `active` : `np.ndarray`
+            Whether each game is still running this tick.
+        `ghost` : `int`
+            The index of the ghost.
+        """
+        cells = self.ghost_cells[:, ghost]
+        modes = self.ghost_modes[:, ghost]
+
+        chase = active & (modes == _CHASE)
+        if chase.any():
+            hops = self.next_hop[cells[chase], self.pacman[chase]]
+            cells[chase] = np.where(hops == -1, cells[chase], hops)
+
+        frightened = active & (modes == _FRIGHTENED)
+        if frightened.any():
+            countdowns = self.ghost_countdowns[:, ghost]
+            countdowns[frightened] -= 1
+            calmed = frightened & (countdowns == 0)
+            countdowns[calmed] = 6
+            modes[calmed] = _CHASE
+            degree = self.degree[cells[frightened]]
+            choice = (self.rng.random(len(degree)) * np.maximum(degree, 1)).astype(
+                np.intp
+            )
+            options = self.neighbours[cells[frightened], choice]
+            cells[frightened] = np.where(degree > 0, options, cells[frightened])
+
+        scatter = active & (modes == _SCATTER) & (self.ghost_home_counts[ghost] > 0)
+        if scatter.any():
+            count = self.ghost_home_counts[ghost]
+            homes = self.ghost_homes[:, ghost]
+            target = self.ghost_home_cells[ghost, homes[scatter] % count]
+            arrived = np.zeros_like(scatter)
+            arrived[scatter] = cells[scatter] == target
+            homes[arrived] += 1
+            target = self.ghost_home_cells[ghost, homes[scatter] % count]
+            hops = self.next_hop[cells[scatter], target]
+            cells[scatter] = np.where(hops == -1, cells[scatter], hops)
+
+
+def random_policy(batch: BatchSimulation) -> np.ndarray:
+    """
+    Move Pac-Man to a random neighbouring cell in every game.
+
+    Parameters
+    ----------
+    `batch` : `BatchSimulation`
+        The games being played.
+
+    Returns
+    -------
+    The cell Pac-Man moves to in each game.
+    """
+    degree = batch.degree[batch.pacman]
+    choice = (batch.rng.random(batch.games) * np.maximum(degree, 1)).astype(np.intp)
+    moves = batch.neighbours[batch.pacman, choice]
+    return np.where(degree > 0, moves, batch.pacman)
+
+
+def greedy_policy(batch: BatchSimulation) -> np.ndarray:
+    """
+    Move Pac-Man along a shortest route to the nearest pickup in every game.
+
+    Parameters
+    ----------
+    `batch` : `BatchSimulation`
+        The games being played.
+
+    Returns
+    -------
+    The cell Pac-Man moves to in each game.
+    """
+    distances = batch.topology.distance[batch.pacman].astype(np.int32)
+    distances[batch.pickups == 0] = np.iinfo(np.int32).max
+    targets = distances.argmin(axis=1)
+    hops = batch.next_hop[batch.pacman, targets]
+    return np.where(hops == -1, batch.pacman, hops)
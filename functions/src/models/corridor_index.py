@@ -0,0 +1,182 @@
+"""Model indexing the pickups remaining in each corridor of a level."""
+
+from typing import Sequence
+
+import numpy as np
+from src.models.topology import LevelTopology
+
+
+class CorridorIndex:
+    """
+    Model indexing the pickups remaining in each corridor of a level.
+
+    The cells of a level are split into segments: every junction is a segment
+    of its own and every corridor between junctions is another. The score and
+    number of pickups remaining in each segment is kept as a running total and
+    updated as pickups are removed, so the reward of a route is a sum over the
+    few segments it passes through rather than a search of every space on it.
+    """
+
+    def __init__(self, topology: LevelTopology, scores: Sequence[int]) -> None:
+        """
+        Build the index.
+
+        Parameters
+        ----------
+        `topology` : `LevelTopology`
+            The layout of the level.
+        `scores` : `Sequence[int]`
+            The score of the pickup in each cell, `0` where there is none.
+        """
+        self.topology = topology
+        """The layout of the level."""
+        self.scores: list[int] = list(scores)
+        """The score of the pickup remaining in each cell, `0` where there is none."""
+        self.segment_of: list[int] = [-1] * len(topology)
+        """The segment each cell belongs to."""
+        self.segments: list[tuple[int, ...]] = []
+        """The cells of each segment, in the order they are passed through."""
+        self._build_segments()
+        self.segment_scores: list[int] = [
+            sum(self.scores[cell] for cell in cells) for cells in self.segments
+        ]
+        """The total score of the pickups remaining in each segment."""
+        self.counts = np.array(
+            [sum(self.scores[cell] > 0 for cell in cells) for cells in self.segments],
+            dtype=np.int32,
+        )
+        """The number of pickups remaining in each segment."""
+        self.remaining = int(self.counts.sum())
+        """The number of pickups remaining in the level."""
+        self._ends = np.array(
+            [(cells[0], cells[-1]) for cells in self.segments], dtype=np.intp
+        )
+        """`(segments, 2)` array of the first and last cell of each segment."""
+
+    def _build_segments(self) -> None:
+        """Split the cells into junctions and the corridors between them."""
+        topology = self.topology
+        adjacent: list[set[int]] = [set(cells) for cells in topology.neighbours]
+        for cell, cells in enumerate(topology.neighbours):
+            for neighbour in cells:
+                adjacent[neighbour].add(cell)
+        for cell in range(len(topology)):
+            # Cells next to a gate may only be joined one way, so they are
+            # treated as junctions to keep every corridor a simple chain.
+            if cell in topology.junctions or len(adjacent[cell]) != 2:
+                self._add_segment((cell,))
+        for cell in range(len(topology)):
+            if self.segment_of[cell] != -1:
+                continue
+            # Follow the corridor to one of its ends, then back along it.
+            previous, current = -1, cell
+            while True:
+                options = [
+                    other
+                    for other in adjacent[current]
+                    if other != previous and self.segment_of[other] == -1
+                ]
+                if len(options) == 0 or options[0] == cell:
+                    break
+                previous, current = current, options[0]
+            route = [current]
+            while True:
+                options = [
+                    other
+                    for other in adjacent[route[-1]]
+                    if self.segment_of[other] == -1 and other not in route[-2:]
+                ]
+                if len(options) == 0 or options[0] == route[0]:
+                    break
+                route.append(options[0])
+            self._add_segment(tuple(route))
+
+    def _add_segment(self, cells: tuple[int, ...]) -> None:
+        """
+        Add a segment to the index.
+
+        Parameters
+        ----------
+        `cells` : `tuple[int, ...]`
+            The cells of the segment, in order.
+        """
+        for cell in cells:
+            self.segment_of[cell] = len(self.segments)
+        self.segments.append(cells)
+
+    def remove(self, cell: int) -> None:
+        """
+        Remove the pickup in a cell from the index.
+
+        Parameters
+        ----------
+        `cell` : `int`
+            The cell the pickup was removed from.
+        """
+        score = self.scores[cell]
+        if score == 0:
+            return
+        segment = self.segment_of[cell]
+        self.scores[cell] = 0
+        self.segment_scores[segment] -= score
+        self.counts[segment] -= 1
+        self.remaining -= 1
+
+    def route_score(self, cells: Sequence[int]) -> int:
+        """
+        Calculate the score of the pickups remaining along a route.
+
+        Segments which are passed through from end to end are read from their
+        running totals, only the cells of segments which are partly passed
+        through are read individually.
+
+        Parameters
+        ----------
+        `cells` : `Sequence[int]`
+            The cells of the route in order.
+
+        Returns
+        -------
+        The total score of the pickups on the route.
+        """
+        total = 0
+        i = 0
+        while i < len(cells):
+            cell = cells[i]
+            segment = self.segment_of[cell]
+            members = self.segments[segment]
+            last = i + len(members) - 1
+            if last < len(cells) and (
+                (cell == members[0] and cells[last] == members[-1])
+                or (cell == members[-1] and cells[last] == members[0])
+            ):
+                total += self.segment_scores[segment]
+                i = last + 1
+            else:
+                total += self.scores[cell]
+                i += 1
+        return total
+
+    def nearest_food(self, cell: int) -> int:
+        """
+        Find the closest end of a segment which still holds a pickup.
+
+        Parameters
+        ----------
+        `cell` : `int`
+            The cell to search from.
+
+        Returns
+        -------
+        The closest cell at the end of a segment with pickups remaining, or `-1`
+        if none can be reached.
+        """
+        fed = np.flatnonzero(self.counts)
+        if len(fed) == 0:
+            return -1
+        ends = self._ends[fed]
+        distances = self.topology.distance_row(cell)[ends]
+        nearest = np.unravel_index(int(np.argmin(distances)), distances.shape)
+        if distances[nearest] >= self.topology.unreachable:
+            return -1
+        return int(ends[nearest])
@@ -0,0 +1,136 @@
+"""Model of how soon a ghost could reach each cell of a level."""
+
+from typing import Sequence
+
+import numpy as np
+from src.models.entity import Entity
+from src.models.movement_types import MovementTypes
+from src.models.topology import LevelTopology
+
+_HARMLESS = (MovementTypes.HOMEBOUND, MovementTypes.FRIGHTENED)
+"""The modes in which a ghost cannot catch Pac-Man."""
+
+
+class DangerField:
+    """
+    Model of how soon a ghost could reach each cell of a level.
+
+    The field holds, for every cell, the fewest moves any dangerous ghost needs
+    to reach it. Each ghost's row of the topology's distance table is copied
+    when it moves to a new cell, and the field is only rebuilt from those rows
+    when a ghost has moved or changed mode since it was last read, so the
+    safety of any number of cells or paths can be checked with a single array
+    lookup.
+
+    Ghosts returning home or frightened are not dangerous and are left out.
+    """
+
+    def __init__(
+        self, topology: LevelTopology, ghosts: Sequence[tuple[Entity, int]]
+    ) -> None:
+        """
+        Build the field.
+
+        Parameters
+        ----------
+        `topology` : `LevelTopology`
+            The layout of the level.
+        `ghosts` : `Sequence[tuple[Entity, int]]`
+            Each ghost and the cell it is in.
+        """
+        self.topology = topology
+        """The layout of the level."""
+        self.ghosts: list[Entity] = [ghost for ghost, _ in ghosts]
+        """The ghosts being tracked."""
+        self.cells: list[int] = [cell for _, cell in ghosts]
+        """The cell each ghost is in."""
+        self._slots: dict[int, int] = {
+            id(ghost): slot for slot, ghost in enumerate(self.ghosts)
+        }
+        """The position of each ghost in `ghosts`, keyed by its `id`."""
+        self._rows = np.full((len(self.ghosts), len(topology)), topology.unreachable)
+        """`(ghosts, cells)` array of the moves each ghost needs to reach each cell."""
+        for slot, cell in enumerate(self.cells):
+            self._rows[slot] = topology.distance_row(cell)
+        self._arrival = np.full(len(topology), topology.unreachable)
+        """The fewest moves any dangerous ghost needs to reach each cell."""
+        self._dangerous: tuple[bool, ...] | None = None
+        """Which ghosts were dangerous when the field was last built."""
+
+    def move(self, ghost: Entity, cell: int) -> None:
+        """
+        Record a ghost moving to a new cell.
+
+        Entities which are not being tracked are ignored.
+
+        Parameters
+        ----------
+        `ghost` : `Entity`
+            The ghost which moved.
+        `cell` : `int`
+            The cell it moved to.
+        """
+        slot = self._slots.get(id(ghost))
+        if slot is None or self.cells[slot] == cell:
+            return
+        self.cells[slot] = cell
+        self._rows[slot] = self.topology.distance_row(cell)
+        self._dangerous = None
+
+    def arrival(self) -> np.ndarray:
+        """
+        Returns the fewest moves any dangerous ghost needs to reach each cell.
+
+        Returns
+        -------
+        An array with a value for each cell, `LevelTopology.unreachable` where no
+        dangerous ghost can reach it.
+        """
+        dangerous = tuple(
+            getattr(ghost, "movement_type", None) not in _HARMLESS
+            for ghost in self.ghosts
+        )
+        if dangerous != self._dangerous:
+            self._dangerous = dangerous
+            if any(dangerous):
+                np.min(self._rows[list(dangerous)], axis=0, out=self._arrival)
+            else:
+                self._arrival.fill(self.topology.unreachable)
+        return self._arrival
+
+    def margins(self, cells: Sequence[int], start: int = 1) -> np.ndarray:
+        """
+        Calculate how many moves ahead of the ghosts Pac-Man is along a route.
+
+        Parameters
+        ----------
+        `cells` : `Sequence[int]`
+            The cells of the route in the order they are reached.
+        `start` : `int` DEFAULT = `1`
+            The number of moves Pac-Man needs to reach the first cell.
+
+        Returns
+        -------
+        An array of the moves a ghost needs to reach each cell less the moves
+        Pac-Man needs, where a value of `0` or less means a ghost could be
+        waiting.
+        """
+        steps = np.arange(start, start + len(cells))
+        return self.arrival()[np.asarray(cells, dtype=np.intp)] - steps
+
+    def is_safe(self, cells: Sequence[int], start: int = 1) -> bool:
+        """
+        Checks whether Pac-Man reaches every cell of a route before any ghost.
+
+        Parameters
+        ----------
+        `cells` : `Sequence[int]`
+            The cells of the route in the order they are reached.
+        `start` : `int` DEFAULT = `1`
+            The number of moves Pac-Man needs to reach the first cell.
+
+        Returns
+        -------
+        `True` if no ghost can reach a cell of the route as soon as Pac-Man.
+        """
+        return bool((self.margins(cells, start) > 0).all())
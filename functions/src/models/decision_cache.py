@@ -0,0 +1,106 @@
+"""Model caching the decisions of deterministic agents between ticks and games."""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class DecisionCache:
+    """
+    Bounded least recently used cache of the decisions of agents.
+
+    Agents wrap the parts of their decision making which are pure functions of
+    a small signature of the state, such as the routes from a position, so
+    that a situation which repeats is not searched again. Signatures start
+    with the `LevelTopology` of the level, so one cache can be shared between
+    games and levels. Values must not be mutated by the agents, routes are
+    stored as cells and built into a new `Path` on each use.
+
+    Caching is opt-in: agents decide without a cache unless one is given to
+    them, see `GameManager`. A cache may be shared by games running on
+    different threads, its entries and metrics are guarded by a lock which is
+    not held while a decision is made.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        """
+        Initialise the cache.
+
+        Parameters
+        ----------
+        `maxsize` : `int` DEFAULT = `65536`
+            The number of decisions held, the least recently used decision is
+            dropped once this is exceeded.
+        """
+        if maxsize < 1:
+            raise ValueError("The cache must hold at least one decision.")
+        self.maxsize = maxsize
+        """The number of decisions held."""
+        self.hits = 0
+        """The number of decisions read from the cache."""
+        self.misses = 0
+        """The number of decisions which had to be made."""
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+        """The decisions held, least recently used first."""
+        self._lock = threading.Lock()
+        """Guards the entries and metrics."""
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, signature: Hashable, decide: Callable[[], T]) -> T:
+        """
+        Returns the decision for a signature, making it if it is not held.
+
+        Parameters
+        ----------
+        `signature` : `Hashable`
+            The parts of the state the decision depends on.
+        `decide` : `Callable[[], T]`
+            Makes the decision when it is not held.
+
+        Returns
+        -------
+        The decision.
+        """
+        with self._lock:
+            try:
+                value = self._entries[signature]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(signature)
+                return value  # type: ignore
+        value = decide()
+        with self._lock:
+            self._entries[signature] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every decision and reset the metrics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def statistics(self) -> dict[str, float]:
+        """
+        Returns the metrics of the cache.
+
+        Returns
+        -------
+        A `dict` of the number of hits, misses and decisions held, and the
+        share of lookups which hit.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+            "size": len(self._entries),
+        }
@@ -27,19 +27,22 @@ class GameStateStore:
         Append a snapshot to `GameStateStore`.
 
         While the list is assumed already sorted as snapshots should be inserted
-        chronologically, it is sorted after appending to ensure this. It is also
-        sorted here rather than in the `get` function as if a snapshot is appended
-        out of order, it will then need to be re-sorted on every call of `get`
-        whereas sorting at time of insertion means any out of position snapshot
-        will always be moved to the correct position.
+        chronologically, it is sorted after appending an out of order snapshot to
+        ensure this. It is also sorted here rather than in the `get` function as
+        if a snapshot is appended out of order, it will then need to be re-sorted
+        on every call of `get` whereas sorting at time of insertion means any out
+        of position snapshot will always be moved to the correct position.
+        Snapshots appended in order do not need sorting.
 
         Parameters
         ----------
         `state` : `GameState`
             The state to be appended.
         """
+        in_order = len(self.store) == 0 or self.store[-1].time <= state.time
         self.store.append(state)
-        self.store.sort(key=lambda state: state.time, reverse=False)
+        if not in_order:
+            self.store.sort(key=lambda state: state.time, reverse=False)
 
     def get(self) -> list[GameState]:
         """
@@ -73,3 +76,53 @@ class GameStateStore:
             )
         json = {"states": states}
         return json
+
+    def to_deltas(self) -> dict:
+        """
+        Format the `GameStateStore` into a compact JSON object.
+
+        Only the first board is stored in full. Every later state stores only
+        the spaces which changed since the state before it, as `[x, y, value]`,
+        which is far smaller as only the agents and eaten pickups change.
+
+        Returns
+        -------
+        `dict`
+            The first board and a list containing the changes of every state.
+        """
+        states = self.get()
+        if len(states) == 0:
+            return {"initial": [], "deltas": []}
+        first = states[0]
+        deltas = [[first.time, first.energised, first.score, []]]
+        for before, state in zip(states, states[1:]):
+            changes = [
+                [x, y, value]
+                for y, row in enumerate(state.board_state)
+                for x, value in enumerate(row)
+                if before.board_state[y][x] != value
+            ]
+            deltas.append([state.time, state.energised, state.score, changes])
+        return {"initial": first.board_state, "deltas": deltas}
+
+    @classmethod
+    def from_deltas(cls, data: dict) -> "GameStateStore":
+        """
+        Rebuild a `GameStateStore` from the output of `to_deltas`.
+
+        Parameters
+        ----------
+        `data` : `dict`
+            The compact JSON object.
+
+        Returns
+        -------
+        A `GameStateStore` containing every state in full.
+        """
+        store = cls()
+        board = [row[:] for row in data["initial"]]
+        for time, energised, score, changes in data["deltas"]:
+            for x, y, value in changes:
+                board[y][x] = value
+            store.add(GameState(time, [row[:] for row in board], energised, score))
+        return store
@@ -0,0 +1,104 @@
+"""Model holding the routes the ghosts take to the fixed targets of a level."""
+
+from typing import Mapping, Sequence
+
+from src.models.topology import LevelTopology
+
+
+class GhostRoutes:
+    """
+    Model holding the routes the ghosts take to the fixed targets of a level.
+
+    The corners each ghost scatters to, and the cell each ghost leaves the
+    ghost house or respawns at, never change during a game. The route from
+    every cell to each of these targets is traced when the table is built and
+    stored as cell numbers on the level's `LevelTopology`, so a single table is
+    shared by every ghost of every game of the level and a change of mode only
+    costs a lookup.
+
+    Targets which are not walkable cells of the level cannot be routed to and
+    are left out of the table.
+    """
+
+    def __init__(
+        self,
+        topology: LevelTopology,
+        homes: Mapping[str, Sequence[tuple[int, int]]],
+        respawns: Mapping[str, tuple[int, int]],
+    ) -> None:
+        """
+        Build the routes of a level.
+
+        Parameters
+        ----------
+        `topology` : `LevelTopology`
+            The layout of the level.
+        `homes` : `Mapping[str, Sequence[tuple[int, int]]]`
+            The corners each agent scatters to, keyed by the agent's name.
+        `respawns` : `Mapping[str, tuple[int, int]]`
+            The point each agent respawns at, keyed by the agent's name.
+        """
+        self.topology = topology
+        """The layout of the level, which caches the routes."""
+        self.homes: dict[str, tuple[tuple[int, int], ...]] = {
+            name: tuple((pos[0], pos[1]) for pos in home)
+            for name, home in homes.items()
+        }
+        """The corners each agent scatters to, keyed by the agent's name."""
+        self.respawns: dict[str, tuple[int, int]] = {
+            name: (pos[0], pos[1]) for name, pos in respawns.items()
+        }
+        """The point each agent respawns at, keyed by the agent's name."""
+        self.exits: dict[str, tuple[int, ...]] = {
+            name: (topology.index[pos],)
+            for name, pos in self.respawns.items()
+            if pos in topology.index
+        }
+        """
+        The route each agent takes out of the ghost house when it is released,
+        which places it straight onto its respawn point.
+        """
+        targets = {
+            topology.index[pos]
+            for home in self.homes.values()
+            for pos in home
+            if pos in topology.index
+        }
+        targets.update(exit[-1] for exit in self.exits.values())
+        topology.precompute_routes(sorted(targets))
+
+    def route(
+        self, source: tuple[int, int], target: tuple[int, int]
+    ) -> tuple[int, ...]:
+        """
+        Returns the cells of the shortest route between two positions.
+
+        Parameters
+        ----------
+        `source` : `tuple[int, int]`
+            The position the route starts from.
+        `target` : `tuple[int, int]`
+            The position the route ends at.
+
+        Returns
+        -------
+        The cells of the route including both ends, or an empty `tuple` if
+        `target` cannot be reached.
+        """
+        index = self.topology.index
+        return self.topology.route(index[source], index[target])
+
+    def exit(self, name: str) -> tuple[int, ...]:
+        """
+        Returns the route an agent takes out of the ghost house.
+
+        Parameters
+        ----------
+        `name` : `str`
+            The name of the agent.
+
+        Returns
+        -------
+        The cells of the route.
+        """
+        return self.exits[name.lower()]
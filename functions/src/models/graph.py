@@ -1,23 +1,89 @@
 """Model representing the level as a graph data structure."""
 
+import functools
 import random
-from typing import Type
+from collections import deque
+from typing import TYPE_CHECKING, Optional, Sequence, Type
 
-from src import exceptions
+from src import constants, exceptions
+from src.models.corridor_index import CorridorIndex
+from src.models.danger_field import DangerField
 from src.models.entity import Entity
 from src.models.environment import Gate, Teleporter
 from src.models.node import Node
 from src.models.path import Path
 from src.models.pickups import Pickup
+from src.models.topology import LevelTopology
+
+if TYPE_CHECKING:
+    from src.models.agents.ghost_agent import GhostAgent
+    from src.models.agents.pacman_agent import PacmanAgent
+
+_SearchStep = tuple[Node, Optional["_SearchStep"], int]
+"""
+A step of a path search, stored as `(node, previous step, path length)`.
+
+Partial routes share their common prefix through the previous step rather than
+each holding a copy of the route so far.
+"""
+
+
+def _on_route(step: Optional[_SearchStep], node: Node) -> bool:
+    """Returns `True` if `node` is already part of the route ending at `step`."""
+    while step is not None:
+        if step[0] == node:
+            return True
+        step = step[1]
+    return False
+
+
+@functools.cache
+def _agent_types() -> tuple[type["PacmanAgent"], type["GhostAgent"]]:
+    """
+    Returns the `PacmanAgent` and `GhostAgent` classes, imported on first use as
+    the agents import this module.
+    """
+    from src.models.agents.ghost_agent import GhostAgent
+    from src.models.agents.pacman_agent import PacmanAgent
+
+    return PacmanAgent, GhostAgent
+
+
+def _trace(step: _SearchStep, index: Optional[CorridorIndex] = None) -> Path:
+    """
+    Builds the `Path` ending at `step` by walking back to the start, costed with
+    `index` if it is given.
+    """
+    route: list[Node] = [step[0]] * step[2]
+    current: Optional[_SearchStep] = step
+    for i in range(step[2] - 1, -1, -1):
+        route[i] = current[0]  # type: ignore
+        current = current[1]  # type: ignore
+    return Path(tuple(route), index=index)
 
 
 class Graph:
     """Model representing the level as a graph data structure."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        width: int = constants.PACMAN_BOARD_WIDTH,
+        height: int = constants.PACMAN_BOARD_HEIGHT,
+    ) -> None:
         """
         Initialises the Graph.
-        """
+
+        Parameters
+        ----------
+        `width` : `int` DEFAULT = `PACMAN_BOARD_WIDTH`
+            The width of the board the level is drawn on.
+        `height` : `int` DEFAULT = `PACMAN_BOARD_HEIGHT`
+            The height of the board the level is drawn on.
+        """
+        self.width = width
+        """The width of the board the level is drawn on, including walls."""
+        self.height = height
+        """The height of the board the level is drawn on, including walls."""
         self.level: dict[Node, list[Node]] = {}
         """
         The level represented as a graph.
@@ -29,6 +95,25 @@ class Graph:
         """The counter used to identify nodes."""
         self.total_pickups: int
         """The total number of pickups contained in this level."""
+        self._topology: LevelTopology | None = None
+        """The fixed layout of the level, built on first use."""
+        self._positions: dict[tuple[int, int], Node] = {}
+        """Mapping of positions to the node at that position."""
+        self._cell_nodes: list[Node] | None = None
+        """The node of each cell of the topology, built on first use."""
+        self._pickup_index: CorridorIndex | None = None
+        """The pickups remaining in each corridor, built on first use."""
+        self._danger_field: DangerField | None = None
+        """How soon a ghost could reach each cell, built on first use."""
+        self._located: dict[Type[Entity], list[Node]] = {}
+        """
+        The nodes holding each type of entity passed to `locate`, kept up to
+        date by `move_agent`.
+        """
+        self._hash: int | None = None
+        """The Zobrist hash of the state of the game, built on first use."""
+        self._hash_ghosts: dict[int, int] = {}
+        """The index of the Zobrist keys of each ghost, keyed by its value."""
 
     def __repr__(self) -> str:
         string = ""
@@ -69,6 +154,38 @@ class Graph:
         """
         return list(self.level.keys())
 
+    def topology(self) -> LevelTopology:
+        """
+        Returns the fixed layout of the level as indexed tables.
+
+        The layout does not change during a game, so it is built the first time
+        it is requested and then reused.
+
+        Returns
+        -------
+        The `LevelTopology` of the level.
+        """
+        if self._topology is None:
+            self._topology = LevelTopology(self)
+        return self._topology
+
+    def set_topology(self, topology: LevelTopology) -> None:
+        """
+        Use an existing topology for this graph rather than building a new one.
+
+        Parameters
+        ----------
+        `topology` : `LevelTopology`
+            The topology of the same level, such as one loaded from a compiled
+            level.
+        """
+        self._topology = topology
+        self._danger_field = None
+        self._cell_nodes = None
+        self._pickup_index = None
+        self._hash = None
+        self._register_agents()
+
     def add_node(self, node: Node) -> None:
         """
         Adds a single, unconnected `Node` into the graph.
@@ -80,19 +197,26 @@ class Graph:
         """
         if node not in self.level.keys():
             self.level[node] = []
+            self._positions[node.position] = node
             self.node_count += 1
         else:
             raise exceptions.DuplicateNodeException(str(node))
 
-    def random_node(self) -> Node:
+    def random_node(self, rng: random.Random | None = None) -> Node:
         """
         Returns a random `Node`.
 
+        Parameters
+        ----------
+        `rng` : `random.Random` DEFAULT = `None`
+            The random generator used. If not provided the `random` module is
+            used.
+
         Returns
         -------
         A random `Node`.
         """
-        return random.choice(self.nodes())
+        return (rng or random).choice(self.nodes())
 
     def is_junction(self, node: Node, prev_pos: tuple[int, int]) -> bool:
         """
@@ -165,6 +289,15 @@ class Graph:
         entity = old_node.get_entity(agent)
         old_node.remove_entity(entity)
         new_node.add_entity(entity)
+        for entity_type, nodes in self._located.items():
+            if isinstance(entity, entity_type):
+                nodes[nodes.index(old_node)] = new_node
+        if self._danger_field is not None:
+            self._danger_field.move(entity, self._danger_field.topology.index[new_pos])
+        if self._hash is not None:
+            index = self.topology().index
+            self._hash ^= self._position_key(entity, index[old_pos])
+            self._hash ^= self._position_key(entity, index[new_pos])
         if new_node.is_collision():
             # If there is a collision between an agent and a non-empty space,
             # raise exception so that game logic can handle the collision.
@@ -184,10 +317,10 @@ class Graph:
         The `Node` with the corresponding position. If none is found then an
         `Exception` is raised.
         """
-        for node in self.level.keys():
-            if node.position == pos:
-                return node
-        raise exceptions.NodeNotFoundException(pos)
+        node = self._positions.get(pos)
+        if node is None:
+            raise exceptions.NodeNotFoundException(pos)
+        return node
 
     def find_node_by_entity(self, entity: Type[Entity]) -> list[Node]:
         """
@@ -213,6 +346,52 @@ class Graph:
             )
         return nodes
 
+    def locate(self, entity: Type[Entity]) -> list[Node]:
+        """
+        Find all `Node` objects holding agents of the type provided.
+
+        The nodes are found by searching the graph the first time a type is
+        located, and are then kept up to date as agents are moved with
+        `move_agent`, so finding agents every tick does not search the graph.
+        Agents placed or removed without `move_agent` must call `relocate`.
+
+        Parameters
+        ----------
+        `entity` : Type[Entity]
+            The type of agent to search for.
+
+        Returns
+        -------
+        A `list` of the nodes holding the agents, with a node repeated for each
+        agent it holds.
+        """
+        if entity not in self._located:
+            self._located[entity] = [
+                node
+                for node in self.level.keys()
+                for held in node.entities
+                if isinstance(held, entity)
+            ]
+        return self._located[entity]
+
+    def relocate(self) -> None:
+        """
+        Forget the agents found by `locate`, so they are searched for again, and
+        have the agents now on the level report their mode changes to the hash.
+        """
+        self._located.clear()
+        self._danger_field = None
+        self._hash = None
+        self._register_agents()
+
+    def _register_agents(self) -> None:
+        """Have every agent on the level call `_toggle_mode` as its mode changes."""
+        agent_types = _agent_types()
+        for node in self.level.keys():
+            for entity in node.entities:
+                if isinstance(entity, agent_types):
+                    entity.on_mode_change = self._toggle_mode
+
     def map_edges(self, mapping: dict[tuple[int, int], list[tuple[int, int]]]) -> None:
         """
         Maps nodes to their adjacent nodes.
@@ -262,14 +441,16 @@ class Graph:
             else start_pos
         )
         visited: list[Node] = []
-        stack: list[Node] = [start]
+        queued: set[Node] = {start}
+        queue: deque[Node] = deque([start])
 
-        while len(stack) > 0:
-            current = stack.pop(0)
+        while len(queue) > 0:
+            current = queue.popleft()
             visited.append(current)
             for child in self.level[current]:
-                if child not in visited and child not in stack:
-                    stack.append(child)
+                if child not in queued:
+                    queued.add(child)
+                    queue.append(child)
         return visited
 
     def is_connected(self) -> bool:
@@ -277,14 +458,16 @@ class Graph:
         Checks that the graph is connected.
 
         In theory, a graph is fully connected if any `Node` is connected to any
-        other node and therefore by selecting a random `Node`, the `bfs` function
+        other node and therefore by starting from any `Node`, the `bfs` function
         should return a path which contains all `Node` objects within the `Graph`.
+        The first `Node` is used, so the check does not draw from the random
+        generator of a game.
 
         Returns
         -------
         `True` if the `Graph` is connected.
         """
-        start: Node = random.choice(list(self.level.keys()))
+        start: Node = next(iter(self.level))
         path = self.bfs(start)
         return len(path) == len(list(self.level.keys()))
 
@@ -348,20 +531,21 @@ class Graph:
         # if the goal node is already found, return
         if start_node == end_node:
             return [Path([start_node])]
-        queue = [(start_node, [start_node])]
+        queue: deque[_SearchStep] = deque([(start_node, None, 1)])
         paths: list[Path] = []
 
         while len(queue) > 0:
-            current, path = queue.pop(0)
+            step = queue.popleft()
+            current = step[0]
             if current == end_node:
-                paths.append(Path(path))
+                paths.append(_trace(step))
                 if len(paths) == 5:
                     # Add breakpoint here once enough paths have been collected
                     break
 
             for node in self.level[current]:
-                if node not in path and not node.contains(Gate):
-                    queue.append((node, path + [node]))
+                if not _on_route(step, node) and not node.contains(Gate):
+                    queue.append((node, step, step[2] + 1))
 
         return paths
 
@@ -370,6 +554,10 @@ class Graph:
         Finds the shortest path between two nodes,
         irrespective of reward or the presence of ghosts.
 
+        The route is the first of the paths found by `find_paths_between` which
+        is shortest, but is read from the routes cached by the level's topology
+        rather than searched for.
+
         Parameters
         ----------
         `current` : `tuple[int, int]`
@@ -381,17 +569,190 @@ class Graph:
         -------
         The shortest `Path`.
         """
-        all_paths = self.find_paths_between(current, goal)
-        return min(all_paths, key=lambda path: len(path))
+        # Collect the nodes first so that an error is raised if they don't exist.
+        self.find_node_by_pos(current)
+        self.find_node_by_pos(goal)
+        topology = self.topology()
+        route = topology.route(topology.cell(current), topology.cell(goal))
+        if len(route) == 0:
+            raise exceptions.PathNotFoundException(current)
+        return self.path_from_cells(route)
+
+    def path_from_cells(self, cells: Sequence[int]) -> Path:
+        """
+        Build the `Path` through a route of cells of the level's topology.
+
+        Parameters
+        ----------
+        `cells` : `Sequence[int]`
+            The cell numbers of the route, such as a route cached by the
+            `LevelTopology` or `GhostRoutes` of the level.
+
+        Returns
+        -------
+        The `Path` through the nodes of those cells.
+        """
+        if self._cell_nodes is None:
+            positions = self.topology().positions
+            self._cell_nodes = [self._positions[pos] for pos in positions]
+        return Path(
+            tuple(self._cell_nodes[cell] for cell in cells), index=self.pickup_index()
+        )
+
+    def pickup_index(self) -> CorridorIndex:
+        """
+        Returns the index of the pickups remaining in each corridor.
+
+        The index is built from the pickups on the graph the first time it is
+        requested, and is then kept up to date by `remove_pickup`.
+
+        Returns
+        -------
+        The `CorridorIndex` of the level.
+        """
+        if self._pickup_index is None:
+            topology = self.topology()
+            scores = [0] * len(topology)
+            for node in self.level.keys():
+                for entity in node.entities:
+                    if isinstance(entity, Pickup):
+                        scores[topology.index[node.position]] = entity.score()
+            self._pickup_index = CorridorIndex(topology, scores)
+        return self._pickup_index
+
+    def danger_field(self, ghost: Type[Entity]) -> DangerField:
+        """
+        Returns how soon a ghost could reach each cell of the level.
+
+        The field is built from the agents of the type given the first time it
+        is requested, and is then kept up to date as they are moved with
+        `move_agent`. Agents placed or removed without `move_agent` must call
+        `relocate`.
+
+        Parameters
+        ----------
+        `ghost` : `Type[Entity]`
+            The type of the ghosts.
+
+        Returns
+        -------
+        The `DangerField` of the level.
+        """
+        if self._danger_field is None:
+            topology = self.topology()
+            self._danger_field = DangerField(
+                topology,
+                [
+                    (held, topology.index[node.position])
+                    for node in self.level.keys()
+                    for held in node.entities
+                    if isinstance(held, ghost)
+                ],
+            )
+        return self._danger_field
+
+    def remove_pickup(self, node: Node) -> Pickup:
+        """
+        Remove the pickup from a node, such as when it is eaten.
+
+        Parameters
+        ----------
+        `node` : `Node`
+            The node holding the pickup.
+
+        Returns
+        -------
+        The `Pickup` which was removed.
+        """
+        pickup = node.get_entity(Pickup)
+        node.remove_entity(pickup)
+        if self._pickup_index is not None:
+            self._pickup_index.remove(self._pickup_index.topology.index[node.position])
+        if self._hash is not None:
+            topology = self.topology()
+            self._hash ^= topology.zobrist().pickups[topology.index[node.position]]
+        return pickup
+
+    def _position_key(self, entity: Entity, cell: int) -> int:
+        """Returns the Zobrist key of an entity being in a cell, `0` if unhashed."""
+        keys = self.topology().zobrist()
+        if isinstance(entity, Pickup):
+            return keys.pickups[cell]
+        if isinstance(entity, _agent_types()[0]):
+            return keys.pacman[cell]
+        ghost = self._hash_ghosts.get(entity.value())
+        return 0 if ghost is None else keys.ghost_cells[ghost][cell]
+
+    def _mode_key(self, entity: Entity) -> int:
+        """Returns the Zobrist key of the mode of an agent, `0` if unhashed."""
+        keys = self.topology().zobrist()
+        pacman_type, ghost_type = _agent_types()
+        if isinstance(entity, pacman_type):
+            return keys.energized if entity.energized else 0
+        ghost = self._hash_ghosts.get(entity.value())
+        if ghost is None or not isinstance(entity, ghost_type):
+            return 0
+        return keys.ghost_modes[ghost][entity.movement_type.value]
+
+    def _toggle_mode(self, entity: Entity) -> None:
+        """XOR the mode of an agent into the hash, called around each change."""
+        if self._hash is not None:
+            self._hash ^= self._mode_key(entity)
+
+    def state_hash(self) -> int:
+        """
+        Returns the Zobrist hash of the state of the game.
+
+        The hash is built from the graph the first time it is requested, and
+        is then kept up to date by `move_agent`, `remove_pickup` and the agents
+        as their modes change, so each later call takes constant time. It
+        covers the same parts of the state as `SimulationState.state_hash`, so
+        the two give the same hash for the same game. Agents placed or removed
+        without `move_agent` must call `relocate`, which also has them report
+        their mode changes.
+
+        Returns
+        -------
+        A 64-bit hash of the state.
+        """
+        if self._hash is None:
+            topology = self.topology()
+            pacman_type, ghost_type = _agent_types()
+            ghosts = sorted(
+                (
+                    entity
+                    for node in self.level.keys()
+                    for entity in node.entities
+                    if isinstance(entity, ghost_type)
+                ),
+                key=lambda ghost: ghost.value(),
+            )
+            self._hash_ghosts = {
+                ghost.value(): index for index, ghost in enumerate(ghosts)
+            }
+            value = 0
+            for node in self.level.keys():
+                cell = topology.index[node.position]
+                for entity in node.entities:
+                    value ^= self._position_key(entity, cell)
+                    if isinstance(entity, (pacman_type, ghost_type)):
+                        value ^= self._mode_key(entity)
+            self._hash = value
+        return self._hash
 
     def remaining_pickups(self) -> int:
         """
         Counts the number of pickups remaining on the level.
 
+        Once the `pickup_index` has been built the count is read from it rather
+        than from every node.
+
         Returns
         -------
         The number of non-empty nodes on the graph.
         """
+        if self._pickup_index is not None:
+            return self._pickup_index.remaining
         return sum(node.contains(Pickup) for node in self.nodes())
 
     def find_path_to_next_jct(self, start_pos: tuple[int, int]) -> list[Path]:
@@ -413,16 +774,18 @@ class Graph:
             A path from the current position to the next junction.
         """
         start_node = self.find_node_by_pos(start_pos)
-        queue = [(start_node, [start_node])]
+        index = self.pickup_index()
+        queue: deque[_SearchStep] = deque([(start_node, None, 1)])
         paths: list[Path] = []
         while len(queue) > 0:
-            current, path = queue.pop(0)
-            if self.is_junction(current, path[-1].position):
-                paths.append(Path(path))
+            step = queue.popleft()
+            current = step[0]
+            if self.is_junction(current, current.position):
+                paths.append(_trace(step, index))
                 if len(paths) == 5:
                     # break when enough paths found
                     break
-                if len(path) > 12:
+                if step[2] > 12:
                     if len(paths) == 0:
                         # raise error if path is too long
                         raise exceptions.PathNotFoundException(start_node.position)
@@ -430,7 +793,7 @@ class Graph:
                         break
 
             for node in self.level[current]:
-                if node not in path and not node.contains(Gate):
-                    queue.append((node, path + [node]))
+                if not _on_route(step, node) and not node.contains(Gate):
+                    queue.append((node, step, step[2] + 1))
 
         return paths
@@ -1,7 +1,14 @@
+from typing import TYPE_CHECKING, Optional, Sequence
+
 from src.models import pickups
 from src.models.environment import EnvironmentEntity
 from src.models.node import Node
 
+if TYPE_CHECKING:
+    from src.models.corridor_index import CorridorIndex
+    from src.models.danger_field import DangerField
+    from src.models.topology import LevelTopology
+
 
 class Path:
     """
@@ -9,39 +16,132 @@ class Path:
 
     This object should be read-only, and acts as a wrapper to allow
     functions to take place on `Path`'s.
+
+    The nodes making up the path are stored once in an immutable tuple and
+    progress along the path is tracked with a cursor. Consuming a position
+    only moves the cursor forward, so following a path is `O(1)` per step
+    and several `Path` objects can share the same underlying route.
     """
 
-    def __init__(self, path: list[Node]) -> None:
-        self.route = path
+    def __init__(
+        self,
+        path: Sequence[Node],
+        start: int = 0,
+        index: Optional["CorridorIndex"] = None,
+    ) -> None:
+        """
+        Initialise the `Path`.
+
+        Parameters
+        ----------
+        `path` : `Sequence[Node]`
+            The nodes making up the path. A `tuple` is shared without copying.
+        `start` : `int` DEFAULT = `0`
+            The index of the first node which has not yet been consumed.
+        `index` : `CorridorIndex` DEFAULT = `None`
+            The pickups remaining in the level, used to find the cost of the
+            path without reading each node.
+        """
+        self._nodes: tuple[Node, ...] = tuple(path)
+        """The full, immutable route including any consumed nodes."""
+        self._cursor = start
+        """The index of the next node to be consumed."""
+        self._prefix_cost: list[int] | None = None
+        """Running total of pickup score along the route, built on first use."""
+        self._index = index
+        """The pickups remaining in the level, if known."""
+        self._cells: tuple[int, ...] | None = None
+        """The cell of each node of the route, found on first use."""
 
     def __repr__(self) -> str:
-        if len(self.route) > 0:
-            return f"Path from {self.route[0].position} to {self.route[-1].position}"
+        if len(self) > 0:
+            return f"Path from {self.peek().position} to {self.last().position}"
         else:
             return "Empty Path"
 
     def __len__(self) -> int:
-        return len(self.route)
+        return len(self._nodes) - self._cursor
 
     def __eq__(self, __value: object) -> bool:
-        if not isinstance(__value, Path) or len(self.route) != len(__value):
+        if not isinstance(__value, Path) or len(self) != len(__value):
             return False
-        for a, b in zip(self.route, __value.route):
-            if a != b:
+        for i in range(len(self)):
+            if self._nodes[self._cursor + i] != __value._nodes[__value._cursor + i]:
                 return False
         return True
 
-    def is_safe(self, forward: int = 0) -> bool:
+    @property
+    def route(self) -> tuple[Node, ...]:
+        """
+        The nodes which have not yet been consumed.
+
+        This creates a new `tuple` on every access, `peek` and `last` should be
+        preferred where only the ends of the path are needed.
+        """
+        cursor = self._cursor
+        return self._nodes[cursor:]
+
+    def peek(self) -> Node:
+        """
+        Returns the next position without consuming it.
+
+        Returns
+        -------
+        The `Node` at the front of the remaining path.
+        """
+        if self._cursor >= len(self._nodes):
+            raise IndexError("peek from empty path")
+        return self._nodes[self._cursor]
+
+    def last(self) -> Node:
+        """
+        Returns the final position of the path.
+
+        Returns
+        -------
+        The `Node` at the end of the path.
+        """
+        if self._cursor >= len(self._nodes):
+            raise IndexError("last of empty path")
+        return self._nodes[-1]
+
+    def _route_cells(self, topology: "LevelTopology") -> tuple[int, ...]:
+        """Returns the cell of each node of the full route, found on first use."""
+        if self._cells is None:
+            cells = topology.index
+            self._cells = tuple(cells[node.position] for node in self._nodes)
+        return self._cells
+
+    def is_safe(self, forward: int = 0, danger: Optional["DangerField"] = None) -> bool:
         """
         Checks whether a path is safe.
 
+        Only the remaining segment of the path is checked.
+
+        Without a `DangerField` a path is unsafe only if a ghost is on it. With
+        one, a path is also unsafe if a ghost could reach any of its nodes as
+        soon as the agent following it.
+
+        Parameters
+        ----------
+        `forward` : `int` DEFAULT = `0`
+            If non-zero, only check this many nodes ahead of the agent.
+        `danger` : `DangerField` DEFAULT = `None`
+            How soon a ghost could reach each cell of the level.
+
         Returns
         -------
         `True` if there are no Ghosts on a path.
         """
-        iterator = self.route[1:forward] if forward != 0 else self.route[1:]
-        for node in iterator:
-            # Starts from second index to ignore agent in first position.
+        # A fresh path starts at the agent, which is ignored. Once the path is
+        # in progress the agent stands on the last consumed node instead.
+        start = max(self._cursor, 1)
+        end = start + forward if forward != 0 else len(self._nodes)
+        if danger is not None:
+            cells = self._route_cells(danger.topology)[start:end]
+            return danger.is_safe(cells)
+        for i in range(start, min(end, len(self._nodes))):
+            node = self._nodes[i]
             if node.empty():
                 continue
             if not node.contains(pickups.Pickup) and not node.contains(
@@ -58,7 +158,7 @@ class Path:
         -------
         `True` if the `Path` starts at the same point that it ends.
         """
-        return self.route[0] == self.route[-1]
+        return self.peek() == self.last()
 
     def cost(self) -> int:
         """
@@ -67,13 +167,28 @@ class Path:
         This value is seen as the reward for travelling down this path
         and is based on the sum of all score obtained should the agent
         successfully make it to the end of this path.
+
+        If the path was given a `CorridorIndex` the cost is summed from its
+        running totals of each corridor, which stay up to date as pickups are
+        eaten. Otherwise the score of each node is read the first time the cost
+        is requested and kept as a running total, so later calls only subtract
+        the consumed part of the route. Such paths are expected to be re-planned
+        when the pickups along them change.
         """
-        score = 0
-        for node in self.route:
-            if not node.empty():
-                if isinstance(node.get_lower_entity(), pickups.Pickup):
-                    score += node.get_lower_entity().score()
-        return score
+        if self._index is not None:
+            cells = self._route_cells(self._index.topology)
+            cursor = self._cursor
+            return self._index.route_score(cells[cursor:])
+        if self._prefix_cost is None:
+            running = 0
+            self._prefix_cost = [0]
+            for node in self._nodes:
+                if not node.empty():
+                    lower = node.get_lower_entity()
+                    if isinstance(lower, pickups.Pickup):
+                        running += lower.score()
+                self._prefix_cost.append(running)
+        return self._prefix_cost[-1] - self._prefix_cost[self._cursor]
 
     def get_next_pos(self) -> Node:
         """
@@ -83,7 +198,9 @@ class Path:
         -------
         The `Node` corresponding to the next target position.
         """
-        return self.route.pop(0)
+        node = self.peek()
+        self._cursor += 1
+        return node
 
     def backwards(self, history: list[tuple[int, int]]) -> bool:
         """
@@ -100,6 +217,6 @@ class Path:
         `true` if the agent would be moving backwards down this path.
         """
         if len(history) > 1:
-            return self.route[1].position in history[-2:]
+            return self._nodes[self._cursor + 1].position in history[-2:]
         else:
             return False
@@ -0,0 +1,185 @@
+"""
+Model storing the history of a game in bounded memory, keeping only the most
+recent states in full and spilling the rest to a file.
+"""
+
+import bisect
+import json
+import tempfile
+from collections import deque
+from typing import IO, Iterator, Optional
+
+from src.models.game_state import GameState
+from src.models.game_state_store import GameStateStore
+
+
+class RollingGameStateStore(GameStateStore):
+    """
+    Model storing the history of a game in bounded memory.
+
+    The last `window` states are kept in a ring buffer. Every state is also
+    written to a spill file as a line of JSON: every `keyframe_interval`-th
+    state as a keyframe holding the full board, and every other state as the
+    spaces which changed since the state before it. Only the position of each
+    keyframe in the file is kept in memory, so any past tick can be rebuilt by
+    reading forward from the keyframe before it, while memory stays constant
+    however long the game runs.
+    """
+
+    def __init__(
+        self,
+        window: int = 100,
+        keyframe_interval: int = 100,
+        path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialise the store.
+
+        Parameters
+        ----------
+        `window` : `int` DEFAULT = `100`
+            The number of the most recent states kept in memory.
+        `keyframe_interval` : `int` DEFAULT = `100`
+            The number of states between each full board written to the file.
+        `path` : `str` DEFAULT = `None`
+            The path of the spill file, which is kept after the game. If not
+            given, a temporary file is used which is deleted when closed.
+        """
+        if window < 1 or keyframe_interval < 1:
+            raise ValueError("The window and keyframe interval must be positive.")
+        super().__init__()
+        self.store: deque[GameState] = deque(maxlen=window)  # type: ignore
+        """Ring buffer of the most recent states."""
+        self.keyframe_interval = keyframe_interval
+        """The number of states between each full board written to the file."""
+        self.count = 0
+        """The number of states added."""
+        self._keyframes: list[tuple[int, int]] = []
+        """The time and position in the file of each keyframe."""
+        self._file: IO[bytes] = (
+            open(path, "w+b") if path is not None else tempfile.TemporaryFile()
+        )
+        """The spill file."""
+
+    def add(self, state: GameState) -> None:
+        """
+        Append a snapshot to the store, writing it to the spill file.
+
+        Parameters
+        ----------
+        `state` : `GameState`
+            The state to be appended.
+
+        Raises
+        ------
+        `ValueError`
+            If the state is earlier than the latest state, as the spill file
+            can only be appended to.
+        """
+        before = self.store[-1] if len(self.store) > 0 else None
+        if before is not None and state.time < before.time:
+            raise ValueError(
+                f"State at time {state.time} added after time {before.time}."
+            )
+        self._file.seek(0, 2)
+        if before is None or self.count % self.keyframe_interval == 0:
+            self._keyframes.append((state.time, self._file.tell()))
+            line = {
+                "time": state.time,
+                "state": state.board_state,
+                "energised": state.energised,
+                "score": state.score,
+            }
+        else:
+            changes = [
+                [x, y, value]
+                for y, row in enumerate(state.board_state)
+                for x, value in enumerate(row)
+                if before.board_state[y][x] != value
+            ]
+            line = [state.time, state.energised, state.score, changes]  # type: ignore
+        self._file.write(json.dumps(line, separators=(",", ":")).encode() + b"\n")
+        self.store.append(state)
+        self.count += 1
+
+    def get(self) -> list[GameState]:
+        """
+        Returns the states held in memory.
+
+        Returns
+        -------
+        A list of the most recent `GameState` snapshots.
+        """
+        return list(self.store)
+
+    def _read(self, position: int) -> Iterator[GameState]:
+        """Rebuild every state in the file from the keyframe at `position`."""
+        self._file.flush()
+        self._file.seek(position)
+        board: list[list[int]] = []
+        for line in self._file:
+            data = json.loads(line)
+            if isinstance(data, dict):
+                board = data["state"]
+                time, energised, score = data["time"], data["energised"], data["score"]
+            else:
+                time, energised, score, changes = data
+                board = [row[:] for row in board]
+                for x, y, value in changes:
+                    board[y][x] = value
+            yield GameState(time, board, energised, score)
+
+    def reconstruct(self, time: int) -> GameState:
+        """
+        Rebuild the state of the game at a past tick.
+
+        States held in memory are returned directly, any other is rebuilt from
+        the keyframe before it in the spill file.
+
+        Parameters
+        ----------
+        `time` : `int`
+            The tick of the state.
+
+        Returns
+        -------
+        The last `GameState` recorded at or before `time`.
+
+        Raises
+        ------
+        `KeyError`
+            If no state was recorded at or before `time`.
+        """
+        if len(self.store) > 0 and self.store[0].time <= time:
+            # The last state at or before the tick in the ring buffer.
+            return next(state for state in reversed(self.store) if state.time <= time)
+        index = bisect.bisect_right(self._keyframes, (time, float("inf"))) - 1
+        if index < 0:
+            raise KeyError(f"No state recorded at or before time {time}.")
+        found = None
+        for state in self._read(self._keyframes[index][1]):
+            if state.time > time:
+                break
+            found = state
+        return found  # type: ignore
+
+    def history(self) -> Iterator[GameState]:
+        """
+        Rebuild every state of the game in order, one at a time.
+
+        Returns
+        -------
+        An iterator of every `GameState` added to the store.
+        """
+        if len(self._keyframes) > 0:
+            yield from self._read(self._keyframes[0][1])
+
+    def close(self) -> None:
+        """Close the spill file."""
+        self._file.close()
+
+    def __enter__(self) -> "RollingGameStateStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
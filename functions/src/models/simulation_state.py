@@ -0,0 +1,531 @@
+"""Model storing a compact, copyable copy of a game for simulating ahead."""
+
+import random
+from typing import NamedTuple, Sequence
+
+from src import exceptions
+from src.models.agents.ghost_agent import GhostAgent
+from src.models.agents.pacman_agent import PacmanAgent, add_ghost_score
+from src.models.graph import Graph
+from src.models.movement_types import MovementTypes
+from src.models.pickups import (
+    Apple,
+    Bell,
+    Cherry,
+    Galaxian,
+    Key,
+    Melon,
+    Orange,
+    PacDot,
+    Pickup,
+    PowerPellet,
+    Strawberry,
+)
+from src.models.topology import LevelTopology
+
+PICKUP_SCORES: tuple[int, ...] = tuple(
+    {
+        pickup.value(): pickup.score()
+        for pickup in (
+            PacDot(),
+            PowerPellet(),
+            Cherry(),
+            Strawberry(),
+            Orange(),
+            Apple(),
+            Melon(),
+            Galaxian(),
+            Bell(),
+            Key(),
+        )
+    }.get(value, 0)
+    for value in range(11)
+)
+"""The score of each pickup, indexed by the pickup's value."""
+
+POWER_PELLET = PowerPellet().value()
+"""The value of a Power Pellet."""
+
+_SCATTER = MovementTypes.SCATTER.value
+_CHASE = MovementTypes.CHASE.value
+_FRIGHTENED = MovementTypes.FRIGHTENED.value
+_HOMEBOUND = MovementTypes.HOMEBOUND.value
+
+
+class GhostInfo(NamedTuple):
+    """The parts of a ghost which do not change during a game."""
+
+    value: int
+    """The ghost's representation within the array."""
+    score: int
+    """The score Pac-Man receives for consuming the ghost."""
+    respawn: int
+    """The cell the ghost is returned to when released or consumed."""
+    release_after: int
+    """
+    The number of pickups consumed when the ghost is placed on its respawn point,
+    `-1` for ghosts which start outside of the ghost house.
+    """
+    homes: tuple[int, ...]
+    """The cells the ghost visits in turn while scattering."""
+
+
+class SimulationState:
+    """
+    Model storing a compact, copyable copy of a game for simulating ahead.
+
+    `GameManager` runs a game on a `Graph` of `Node` objects holding entities,
+    which is far too slow to copy for every future an agent wishes to explore.
+    This model keeps only what a tick changes in flat values: which pickups
+    remain, the cell and mode of each agent, the frightened timers and the
+    score. Copying a state is a handful of list copies and a full tick can be
+    applied and undone in place.
+
+    Ghosts follow the rules of `GhostAgent`: chasing ghosts take the first
+    shortest route to Pac-Man, scattering ghosts visit their home corners,
+    frightened ghosts move randomly and ghosts in the ghost house are placed on
+    their respawn point on every tick where exactly their `release_after`
+    pickups have been consumed.
+
+    Collisions follow `Graph.move_agent` and `game_utils.handle_collision`: they
+    are only resolved when an agent moves into a space which then holds exactly
+    two entities. Pac-Man passes a ghost standing on a pickup without either
+    being consumed, and is safe from ghosts while on a teleporter.
+    """
+
+    def __init__(
+        self,
+        topology: LevelTopology,
+        pickups: bytearray,
+        pacman: int,
+        ghosts: tuple[GhostInfo, ...],
+        ghost_cells: list[int],
+        ghost_modes: list[int],
+        total_pickups: int,
+        score: int = 0,
+        energized: bool = False,
+        time: int = 0,
+    ) -> None:
+        """
+        Initialise the state.
+
+        Parameters
+        ----------
+        `topology` : `LevelTopology`
+            The layout of the level, shared between all copies.
+        `pickups` : `bytearray`
+            The value of the pickup in each cell, `0` if there is none.
+        `pacman` : `int`
+            The cell Pac-Man is in.
+        `ghosts` : `tuple[GhostInfo, ...]`
+            The fixed information about each ghost.
+        `ghost_cells` : `list[int]`
+            The cell each ghost is in.
+        `ghost_modes` : `list[int]`
+            The `MovementTypes` value of each ghost.
+        `total_pickups` : `int`
+            The number of pickups the level started with.
+        `score` : `int` DEFAULT = `0`
+            Pac-Man's score.
+        `energized` : `bool` DEFAULT = `False`
+            Whether Pac-Man is energized.
+        `time` : `int` DEFAULT = `0`
+            The game time.
+        """
+        self.topology = topology
+        """The layout of the level, shared between all copies."""
+        self.pickups = pickups
+        """The value of the pickup in each cell, `0` if there is none."""
+        self.remaining = sum(1 for value in pickups if value != 0)
+        """The number of pickups remaining."""
+        keys = topology.zobrist().pickups
+        self.pickup_hash = 0
+        """The XOR of the Zobrist keys of every remaining pickup."""
+        for cell, value in enumerate(pickups):
+            if value != 0:
+                self.pickup_hash ^= keys[cell]
+        self.total_pickups = total_pickups
+        """The number of pickups the level started with."""
+        self.pacman = pacman
+        """The cell Pac-Man is in."""
+        self.ghosts = ghosts
+        """The fixed information about each ghost, shared between all copies."""
+        self.ghost_cells = ghost_cells
+        """The cell each ghost is in."""
+        self.ghost_modes = ghost_modes
+        """The `MovementTypes` value of each ghost."""
+        self.ghost_countdowns: list[int] = [6] * len(ghosts)
+        """The number of ticks each ghost has left of being frightened."""
+        self.ghost_homes: list[int] = [0] * len(ghosts)
+        """The index of the home corner each ghost is scattering towards."""
+        self.score = score
+        """Pac-Man's score."""
+        self.energized = energized
+        """Whether Pac-Man is energized."""
+        self.ghost_streak = 0
+        """The number of ghosts consumed while energized."""
+        self.lives = 1
+        """The number of lives Pac-Man has remaining."""
+        self.time = time
+        """The game time."""
+
+    @classmethod
+    def from_graph(cls, graph: Graph, time: int = 0) -> "SimulationState":
+        """
+        Build a state from a game in progress.
+
+        Parameters
+        ----------
+        `graph` : `Graph`
+            The graph of the running game, containing the agents.
+        `time` : `int` DEFAULT = `0`
+            The current game time.
+
+        Returns
+        -------
+        A `SimulationState` matching the graph.
+        """
+        topology = graph.topology()
+        pickups = bytearray(len(topology))
+        pacman: PacmanAgent | None = None
+        pacman_cell = -1
+        found: list[tuple[GhostAgent, int]] = []
+        for node in graph.nodes():
+            cell = topology.cell(node.position)
+            for entity in node.entities:
+                if isinstance(entity, Pickup):
+                    pickups[cell] = entity.value()
+                elif isinstance(entity, PacmanAgent):
+                    pacman, pacman_cell = entity, cell
+                elif isinstance(entity, GhostAgent):
+                    found.append((entity, cell))
+        if pacman is None:
+            raise exceptions.InvalidGraphConfigurationException(
+                f"No instances of {PacmanAgent} could be found."
+            )
+        found.sort(key=lambda pair: pair[0].value())
+        ghosts = tuple(
+            GhostInfo(
+                ghost.value(),
+                ghost.score(),
+                topology.index.get(ghost.respawn_point, cell),
+                -1 if ghost.release_after is None else ghost.release_after,
+                tuple(
+                    topology.index[pos]
+                    for pos in ghost.home_path
+                    if pos in topology.index
+                ),
+            )
+            for ghost, cell in found
+        )
+        state = cls(
+            topology,
+            pickups,
+            pacman_cell,
+            ghosts,
+            [cell for _, cell in found],
+            [ghost.movement_type.value for ghost, _ in found],
+            getattr(graph, "total_pickups", 0),
+            pacman.score(),
+            pacman.energized,
+            time,
+        )
+        state.ghost_countdowns = [ghost._frightened_countdown for ghost, _ in found]
+        state.ghost_streak = pacman.temp_ghost_counter
+        state.lives = pacman.current_lives
+        if state.total_pickups == 0:
+            state.total_pickups = state.remaining
+        return state
+
+    def clone(self) -> "SimulationState":
+        """
+        Returns an independent copy of the state.
+
+        The topology and fixed ghost information are shared as they never change.
+        """
+        copy = SimulationState.__new__(SimulationState)
+        copy.topology = self.topology
+        copy.pickups = self.pickups[:]
+        copy.remaining = self.remaining
+        copy.pickup_hash = self.pickup_hash
+        copy.total_pickups = self.total_pickups
+        copy.pacman = self.pacman
+        copy.ghosts = self.ghosts
+        copy.ghost_cells = self.ghost_cells[:]
+        copy.ghost_modes = self.ghost_modes[:]
+        copy.ghost_countdowns = self.ghost_countdowns[:]
+        copy.ghost_homes = self.ghost_homes[:]
+        copy.score = self.score
+        copy.energized = self.energized
+        copy.ghost_streak = self.ghost_streak
+        copy.lives = self.lives
+        copy.time = self.time
+        return copy
+
+    def won(self) -> bool:
+        """Returns `True` if every pickup has been consumed."""
+        return self.remaining == 0
+
+    def lost(self) -> bool:
+        """Returns `True` if Pac-Man has no lives remaining."""
+        return self.lives == 0
+
+    def is_terminal(self) -> bool:
+        """Returns `True` if the game has ended."""
+        return self.remaining == 0 or self.lives == 0
+
+    def pacman_moves(self) -> tuple[int, ...]:
+        """Returns the cells Pac-Man can move to from his current cell."""
+        return self.topology.neighbours[self.pacman]
+
+    def ghost_moves(self, ghost: int) -> tuple[int, ...]:
+        """
+        Returns the cells a ghost can choose to move to.
+
+        Ghosts in the ghost house have no choice to make and so are only able
+        to follow their own rules, shown as a single move of `-1`.
+
+        Parameters
+        ----------
+        `ghost` : `int`
+            The index of the ghost.
+
+        Returns
+        -------
+        The cells the ghost can move to.
+        """
+        if self.ghost_modes[ghost] == _HOMEBOUND:
+            return (-1,)
+        return self.topology.neighbours[self.ghost_cells[ghost]] or (-1,)
+
+    def state_hash(self) -> int:
+        """
+        Returns the Zobrist hash of the state.
+
+        The hash covers Pac-Man's cell, the remaining pickups, the cell and mode
+        of every ghost and whether Pac-Man is energized. The score and time are
+        not included, so two routes to the same position share a hash.
+
+        Returns
+        -------
+        A 64-bit hash of the state.
+        """
+        keys = self.topology.zobrist()
+        value = self.pickup_hash ^ keys.pacman[self.pacman]
+        for ghost in range(len(self.ghost_cells)):
+            value ^= keys.ghost_cells[ghost][self.ghost_cells[ghost]]
+            value ^= keys.ghost_modes[ghost][self.ghost_modes[ghost]]
+        if self.energized:
+            value ^= keys.energized
+        return value
+
+    def apply(
+        self,
+        move: int,
+        rng: random.Random | None = None,
+        ghost_moves: Sequence[int] | None = None,
+    ) -> tuple:
+        """
+        Advance the game by a single tick.
+
+        Pac-Man moves first and then each ghost moves in turn, with collisions
+        checked after every move. Once the game has ended, applying a tick only
+        returns an undo record and leaves the state unchanged.
+
+        Parameters
+        ----------
+        `move` : `int`
+            The cell Pac-Man moves to, either his current cell or a neighbour.
+        `rng` : `random.Random` DEFAULT = `None`
+            The random generator used by frightened ghosts. If not provided the
+            `random` module is used.
+        `ghost_moves` : `Sequence[int]` DEFAULT = `None`
+            The cell each ghost moves to, taken from `ghost_moves`. A value of
+            `-1`, or not providing the moves, lets the ghost follow its own rules.
+
+        Returns
+        -------
+        A record which can be passed to `undo` to reverse the tick.
+        """
+        if self.is_terminal():
+            return (*self._snapshot(), -1, 0)
+        if move != self.pacman and move not in self.topology.neighbours[self.pacman]:
+            raise exceptions.InvalidMoveException(
+                self.topology.positions[self.pacman], self.topology.positions[move]
+            )
+        record = (*self._snapshot(), move, self.pickups[move])
+        self.time += 1
+        if move != self.pacman:
+            self.pacman = move
+            value = self.pickups[move]
+            ghosts = [i for i, cell in enumerate(self.ghost_cells) if cell == move]
+            if self._occupants(move) == 1:
+                if value != 0:
+                    self.score += PICKUP_SCORES[value]
+                    if value == POWER_PELLET:
+                        self.energized = True
+                    self.pickups[move] = 0
+                    self.pickup_hash ^= self.topology.zobrist().pickups[move]
+                    self.remaining -= 1
+                elif len(ghosts) > 0 and self._collide(ghosts[0]):
+                    return record
+        eaten = self.total_pickups - self.remaining
+        for i, info in enumerate(self.ghosts):
+            previous = self.ghost_cells[i]
+            if ghost_moves is None or ghost_moves[i] == -1:
+                self._move_ghost(i, rng)
+            else:
+                self._move_ghost_to(i, ghost_moves[i])
+            if eaten == info.release_after:
+                self.ghost_modes[i] = _CHASE
+                self.ghost_cells[i] = info.respawn
+            cell = self.ghost_cells[i]
+            if (
+                cell != previous
+                and cell == self.pacman
+                and self._occupants(cell) == 1
+                and self._collide(i)
+            ):
+                return record
+        return record
+
+    def undo(self, record: tuple) -> None:
+        """
+        Reverse a tick applied with `apply`.
+
+        Ticks must be undone in the reverse order they were applied and each
+        record can only be used once.
+
+        Parameters
+        ----------
+        `record` : `tuple`
+            The record returned by `apply`.
+        """
+        (
+            self.pacman,
+            self.ghost_cells,
+            self.ghost_modes,
+            self.ghost_countdowns,
+            self.ghost_homes,
+            self.score,
+            self.energized,
+            self.ghost_streak,
+            self.lives,
+            self.time,
+            self.remaining,
+            self.pickup_hash,
+            eaten_cell,
+            eaten_value,
+        ) = record
+        if eaten_cell != -1:
+            self.pickups[eaten_cell] = eaten_value
+
+    def _snapshot(self) -> tuple:
+        """Returns the values a tick can change, except the pickups."""
+        return (
+            self.pacman,
+            self.ghost_cells[:],
+            self.ghost_modes[:],
+            self.ghost_countdowns[:],
+            self.ghost_homes[:],
+            self.score,
+            self.energized,
+            self.ghost_streak,
+            self.lives,
+            self.time,
+            self.remaining,
+            self.pickup_hash,
+        )
+
+    def _occupants(self, cell: int) -> int:
+        """
+        Returns the number of entities in a space, not counting Pac-Man.
+
+        Parameters
+        ----------
+        `cell` : `int`
+            The cell of the space.
+
+        Returns
+        -------
+        The number of pickups, ghosts and fixtures in the space.
+        """
+        return (
+            (self.pickups[cell] != 0)
+            + self.ghost_cells.count(cell)
+            + (cell in self.topology.fixtures)
+        )
+
+    def _collide(self, ghost: int) -> bool:
+        """
+        Resolve Pac-Man and a ghost sharing a cell.
+
+        Parameters
+        ----------
+        `ghost` : `int`
+            The index of the ghost.
+
+        Returns
+        -------
+        `True` if Pac-Man died.
+        """
+        if self.energized:
+            self.ghost_streak += 1
+            self.score = add_ghost_score(
+                self.score, self.ghosts[ghost].score, self.ghost_streak
+            )
+            self.ghost_cells[ghost] = self.ghosts[ghost].respawn
+            self.ghost_modes[ghost] = _CHASE
+            return False
+        self.lives -= 1
+        return True
+
+    def _move_ghost_to(self, ghost: int, cell: int) -> None:
+        """
+        Move a ghost to a chosen cell, updating its frightened timer.
+
+        Parameters
+        ----------
+        `ghost` : `int`
+            The index of the ghost.
+        `cell` : `int`
+            The cell to move to.
+        """
+        if self.ghost_modes[ghost] == _FRIGHTENED:
+            self.ghost_countdowns[ghost] -= 1
+            if self.ghost_countdowns[ghost] == 0:
+                self.ghost_countdowns[ghost] = 6
+                self.ghost_modes[ghost] = _CHASE
+        self.ghost_cells[ghost] = cell
+
+    def _move_ghost(self, ghost: int, rng: random.Random | None) -> None:
+        """
+        Move a single ghost according to its mode.
+
+        Parameters
+        ----------
+        `ghost` : `int`
+            The index of the ghost.
+        `rng` : `random.Random | None`
+            The random generator used when the ghost is frightened.
+        """
+        cell = self.ghost_cells[ghost]
+        mode = self.ghost_modes[ghost]
+        if mode == _CHASE:
+            self.ghost_cells[ghost] = self.topology.step_towards(cell, self.pacman)
+        elif mode == _FRIGHTENED:
+            self.ghost_countdowns[ghost] -= 1
+            if self.ghost_countdowns[ghost] == 0:
+                self.ghost_countdowns[ghost] = 6
+                self.ghost_modes[ghost] = _CHASE
+            options = self.topology.neighbours[cell]
+            if len(options) > 0:
+                self.ghost_cells[ghost] = (rng or random).choice(options)
+        elif mode == _SCATTER:
+            homes = self.ghosts[ghost].homes
+            if len(homes) > 0:
+                target = homes[self.ghost_homes[ghost] % len(homes)]
+                if cell == target:
+                    self.ghost_homes[ghost] += 1
+                    target = homes[self.ghost_homes[ghost] % len(homes)]
+                self.ghost_cells[ghost] = self.topology.step_towards(cell, target)
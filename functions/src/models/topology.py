@@ -0,0 +1,483 @@
+"""Model representing the fixed layout of a level as flat, indexed tables."""
+
+from collections import deque
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+import numpy as np
+from src.models.environment import Gate, Teleporter
+from src.models.zobrist import ZobristKeys
+
+if TYPE_CHECKING:
+    from src.models.graph import Graph
+
+UNREACHABLE = int(np.iinfo(np.int16).max)
+"""
+The distance stored between two cells which cannot reach each other, for levels
+with fewer cells than this. Larger levels store `LevelTopology.unreachable`.
+"""
+
+ALL_PAIRS_LIMIT = 4096
+"""The most cells a level may have for `to_arrays` to include its all-pairs tables."""
+
+
+class LevelTopology:
+    """
+    Model representing the fixed layout of a level as flat, indexed tables.
+
+    While `Graph` stores what is currently in each space, the layout of the
+    level never changes during a game. Every walkable space is given an integer
+    index so that the layout can be stored in flat tables which are cheap to
+    share between games and to copy into search agents.
+
+    Movement follows the same rules as the path finding in `Graph`: an agent may
+    leave a `Gate` but can never move onto one.
+
+    Distances are searched for one source cell at a time, the first time they
+    are needed. The `(cells, cells)` `distance` and `next_hop` tables grow with
+    the square of the level, so they are only built for the agents which read
+    them, or loaded from a compiled level.
+
+    A topology is shared by games running on different threads without a lock.
+    The tables are never changed once built, and each cached route, corridor or
+    search is built locally and stored with a single assignment, so a thread
+    never sees a partly built entry. Two threads may build the same entry at
+    once, but as it only depends on the layout they build equal values.
+    """
+
+    def __init__(self, graph: "Graph") -> None:
+        """
+        Build the topology from a fully mapped `Graph`.
+
+        Parameters
+        ----------
+        `graph` : `Graph`
+            The graph of the level. Only its layout is used.
+        """
+        nodes = sorted(
+            graph.nodes(), key=lambda node: (node.position[1], node.position[0])
+        )
+        self.positions: list[tuple[int, int]] = [node.position for node in nodes]
+        """The position of each cell, indexed by cell number in row-major order."""
+        self.index: dict[tuple[int, int], int] = {
+            pos: i for i, pos in enumerate(self.positions)
+        }
+        """Mapping of positions to their cell number."""
+        self.gates: frozenset[int] = frozenset(
+            self.index[node.position] for node in nodes if node.contains(Gate)
+        )
+        """The cells containing a `Gate`."""
+        self.teleporters: tuple[int, ...] = tuple(
+            self.index[node.position] for node in nodes if node.contains(Teleporter)
+        )
+        """The cells containing a `Teleporter`."""
+        self.neighbours: list[tuple[int, ...]] = [
+            tuple(
+                self.index[child.position]
+                for child in graph.get_adjacent(node)
+                if self.index[child.position] not in self.gates
+            )
+            for node in nodes
+        ]
+        """The cells which can be moved to from each cell, in the graph's order."""
+        self.width = max(pos[0] for pos in self.positions) + 1
+        """The width of the smallest board containing every cell."""
+        self.height = max(pos[1] for pos in self.positions) + 1
+        """The height of the smallest board containing every cell."""
+        self._index_tables()
+
+    def _index_tables(self) -> None:
+        """Build the lookups derived from `neighbours`."""
+        size = len(self.positions)
+        self.dtype: type = np.int16 if size < UNREACHABLE else np.int32
+        """
+        The integer type of the distance tables, wide enough for every cell
+        number and distance of the level.
+        """
+        self.unreachable: int = int(np.iinfo(self.dtype).max)
+        """The distance stored between two cells which cannot reach each other."""
+        self._distance: np.ndarray | None = None
+        """The all-pairs distance table, built on first use."""
+        self._next_hop: np.ndarray | None = None
+        """The all-pairs next hop table, built on first use."""
+        self._distance_rows: dict[int, list[int]] = {}
+        """The distance from each source cell which has been searched from."""
+        self._next_hop_rows: dict[int, list[int]] = {}
+        """The next hop from each source cell which has been searched from."""
+        self._distance_arrays: dict[int, np.ndarray] = {}
+        """The rows of `_distance_rows` as arrays, built on first use."""
+        self.junctions: frozenset[int] = frozenset(
+            cell
+            for cell, neighbours in enumerate(self.neighbours)
+            if len(neighbours) != 2
+        )
+        """
+        The cells where an agent has a decision to make, any cell which does not
+        have exactly two neighbours. Every other cell is part of a corridor.
+        """
+        self.fixtures: frozenset[int] = self.gates.union(self.teleporters)
+        """
+        The cells holding a `Gate` or `Teleporter`, which take up a place in the
+        space like any other entity.
+        """
+        self._corridors: dict[tuple[int, int], tuple[int, ...]] = {}
+        """Cache of the corridors which have been followed."""
+        self._zobrist: ZobristKeys | None = None
+        """The keys used to hash states of this level, generated on first use."""
+        self._parents: dict[int, list[int]] = {}
+        """
+        The cell each cell is first reached from by a search from a source
+        cell, for the sources which have been routed from.
+        """
+        self._routes: dict[tuple[int, int], tuple[int, ...]] = {}
+        """Cache of the routes which have been requested."""
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> "LevelTopology":
+        """
+        Rebuild a topology from the arrays written by `to_arrays`.
+
+        No searches are run, so this is far cheaper than building the topology
+        from a `Graph`.
+
+        Parameters
+        ----------
+        `arrays` : `Mapping[str, np.ndarray]`
+            The arrays of a compiled level, such as an opened `.npz` file.
+
+        Returns
+        -------
+        The `LevelTopology` of the compiled level.
+        """
+        topology = cls.__new__(cls)
+        topology.positions = [(x, y) for x, y in arrays["positions"].tolist()]
+        topology.index = {pos: i for i, pos in enumerate(topology.positions)}
+        topology.gates = frozenset(arrays["gates"].tolist())
+        topology.teleporters = tuple(arrays["teleporters"].tolist())
+        indptr = arrays["adjacency_indptr"].tolist()
+        indices = arrays["adjacency_indices"].tolist()
+        topology.neighbours = [
+            tuple(indices[start:end]) for start, end in zip(indptr, indptr[1:])
+        ]
+        topology.width = max(pos[0] for pos in topology.positions) + 1
+        topology.height = max(pos[1] for pos in topology.positions) + 1
+        topology._index_tables()
+        if "distance" in arrays:
+            topology._distance = np.array(arrays["distance"], dtype=topology.dtype)
+            topology._next_hop = np.array(arrays["next_hop"], dtype=topology.dtype)
+        starts = arrays["corridor_starts"].tolist()
+        indptr = arrays["corridor_indptr"].tolist()
+        cells = arrays["corridor_cells"].tolist()
+        for (cell, first), start, end in zip(starts, indptr, indptr[1:]):
+            topology._corridors[(cell, first)] = tuple(cells[start:end])
+        return topology
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Returns the tables of the topology as flat arrays.
+
+        The neighbours are stored in compressed sparse row form: the neighbours
+        of a cell are `adjacency_indices[adjacency_indptr[cell]:
+        adjacency_indptr[cell + 1]]`. The corridors leaving every junction,
+        which form the graph of junctions, are stored in the same way. The
+        `distance` and `next_hop` tables are only included for levels of up to
+        `ALL_PAIRS_LIMIT` cells.
+
+        Returns
+        -------
+        A `dict` of arrays which can be saved with `np.savez`.
+        """
+        indptr = [0]
+        for neighbours in self.neighbours:
+            indptr.append(indptr[-1] + len(neighbours))
+        starts, corridor_indptr, corridor_cells = [], [0], []
+        for cell in sorted(self.junctions):
+            for first in self.neighbours[cell]:
+                corridor = self.corridor(cell, first)
+                starts.append((cell, first))
+                corridor_cells.extend(corridor)
+                corridor_indptr.append(len(corridor_cells))
+        arrays = {
+            "positions": np.array(self.positions, dtype=np.int32).reshape(-1, 2),
+            "gates": np.array(sorted(self.gates), dtype=np.int32),
+            "teleporters": np.array(self.teleporters, dtype=np.int32),
+            "adjacency_indptr": np.array(indptr, dtype=np.int32),
+            "adjacency_indices": np.array(
+                [cell for neighbours in self.neighbours for cell in neighbours],
+                dtype=np.int32,
+            ),
+            "corridor_starts": np.array(starts, dtype=np.int32).reshape(-1, 2),
+            "corridor_indptr": np.array(corridor_indptr, dtype=np.int32),
+            "corridor_cells": np.array(corridor_cells, dtype=np.int32),
+        }
+        if len(self) <= ALL_PAIRS_LIMIT:
+            arrays["distance"] = self.distance
+            arrays["next_hop"] = self.next_hop
+        return arrays
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def distance(self) -> np.ndarray:
+        """
+        `(cells, cells)` table of the number of moves between two cells.
+
+        The table is built from a search from every cell the first time it is
+        read. `distances_from` should be preferred where only some sources are
+        needed.
+        """
+        if self._distance is None:
+            self._all_pairs()
+        return self._distance  # type: ignore[return-value]
+
+    @property
+    def next_hop(self) -> np.ndarray:
+        """
+        `(cells, cells)` table of the first cell to move to from one cell to reach
+        another, or `-1` if the other cell cannot be reached.
+
+        The table is built with `distance`.
+        """
+        if self._next_hop is None:
+            self._all_pairs()
+        return self._next_hop  # type: ignore[return-value]
+
+    def _all_pairs(self) -> None:
+        """Build the `distance` and `next_hop` tables from every source cell."""
+        size = len(self.positions)
+        distance = np.empty((size, size), dtype=self.dtype)
+        next_hop = np.empty((size, size), dtype=self.dtype)
+        for source in range(size):
+            distance[source] = self.distances_from(source)
+            next_hop[source] = self._next_hop_rows[source]
+        self._next_hop = next_hop
+        self._distance = distance
+
+    def distances_from(self, source: int) -> list[int]:
+        """
+        Returns the number of moves from a cell to every cell.
+
+        Parameters
+        ----------
+        `source` : `int`
+            The cell to search from.
+
+        Returns
+        -------
+        The distance to each cell, `unreachable` for cells which cannot be
+        reached.
+        """
+        if source not in self._distance_rows:
+            self._search(source)
+        return self._distance_rows[source]
+
+    def distance_row(self, source: int) -> np.ndarray:
+        """
+        Returns `distances_from` as an array.
+
+        Parameters
+        ----------
+        `source` : `int`
+            The cell to search from.
+
+        Returns
+        -------
+        The distance to each cell as an array of `dtype`, which must not be
+        changed.
+        """
+        if self._distance is not None:
+            return self._distance[source]
+        if source not in self._distance_arrays:
+            row = np.array(self.distances_from(source), dtype=self.dtype)
+            row.flags.writeable = False
+            self._distance_arrays[source] = row
+        return self._distance_arrays[source]
+
+    def _search(self, source: int) -> None:
+        """
+        Run a breadth first search from a cell and store its rows.
+
+        The first step of each route is inherited from the cell it was reached
+        from, so the route chosen is the first shortest route found when
+        neighbours are expanded in order, matching `Graph.shortest_path_to`.
+
+        Parameters
+        ----------
+        `source` : `int`
+            The cell to search from.
+        """
+        if self._distance is not None and self._next_hop is not None:
+            self._next_hop_rows[source] = self._next_hop[source].tolist()
+            self._distance_rows[source] = self._distance[source].tolist()
+            return
+        size = len(self.positions)
+        dist_row = [self.unreachable] * size
+        hop_row = [-1] * size
+        dist_row[source] = 0
+        hop_row[source] = source
+        queue = deque([source])
+        while len(queue) > 0:
+            current = queue.popleft()
+            for child in self.neighbours[current]:
+                if dist_row[child] == self.unreachable:
+                    dist_row[child] = dist_row[current] + 1
+                    hop_row[child] = child if current == source else hop_row[current]
+                    queue.append(child)
+        # The distance row is stored last as it marks the source as searched.
+        self._next_hop_rows[source] = hop_row
+        self._distance_rows[source] = dist_row
+
+    def zobrist(self) -> ZobristKeys:
+        """
+        Returns the keys used to hash states of this level.
+
+        Returns
+        -------
+        The `ZobristKeys` for the cells of this level.
+        """
+        if self._zobrist is None:
+            self._zobrist = ZobristKeys(len(self.positions))
+        return self._zobrist
+
+    def cell(self, pos: tuple[int, int]) -> int:
+        """
+        Returns the cell number of a position.
+
+        Parameters
+        ----------
+        `pos` : `tuple[int, int]`
+            The position to look up.
+
+        Returns
+        -------
+        The cell number, `KeyError` is raised if the position is not walkable.
+        """
+        return self.index[pos]
+
+    def step_towards(self, source: int, target: int) -> int:
+        """
+        Returns the next cell on a shortest route between two cells.
+
+        Parameters
+        ----------
+        `source` : `int`
+            The current cell.
+        `target` : `int`
+            The cell to move towards.
+
+        Returns
+        -------
+        The cell to move to, or `source` if `target` cannot be reached.
+        """
+        if source not in self._distance_rows:
+            self._search(source)
+        hop = self._next_hop_rows[source][target]
+        return source if hop == -1 else hop
+
+    def route(self, source: int, target: int) -> tuple[int, ...]:
+        """
+        Returns the cells of a shortest route between two cells.
+
+        The route is the one `Graph.shortest_path_to` would find. Routes are
+        cached, and as the topology of a level is shared by every game of it, a
+        route is only ever traced once per process.
+
+        Parameters
+        ----------
+        `source` : `int`
+            The cell the route starts from.
+        `target` : `int`
+            The cell the route ends at.
+
+        Returns
+        -------
+        The cells of the route including both ends, or an empty `tuple` if
+        `target` cannot be reached.
+        """
+        key = (source, target)
+        if key not in self._routes:
+            parents = self._parents_of(source)
+            route: list[int] = []
+            if parents[target] != -1:
+                current = target
+                while current != source:
+                    route.append(current)
+                    current = parents[current]
+                route.append(source)
+                route.reverse()
+            self._routes[key] = tuple(route)
+        return self._routes[key]
+
+    def precompute_routes(self, targets: Iterable[int]) -> None:
+        """
+        Trace the route from every cell to each of a set of cells.
+
+        Used for the fixed targets of a level, such as the corners the ghosts
+        scatter to and the cells they respawn at, so that reaching them during
+        a game is only ever a lookup.
+
+        Parameters
+        ----------
+        `targets` : `Iterable[int]`
+            The cells to trace routes to.
+        """
+        for target in targets:
+            for source in range(len(self.positions)):
+                self.route(source, target)
+
+    def _parents_of(self, source: int) -> list[int]:
+        """
+        Returns the cell each cell is first reached from when searching outwards
+        from a source cell, with neighbours expanded in order.
+
+        Parameters
+        ----------
+        `source` : `int`
+            The cell the search starts from.
+
+        Returns
+        -------
+        The parent of each cell, the source for itself and `-1` for cells which
+        cannot be reached.
+        """
+        if source not in self._parents:
+            parents = [-1] * len(self.positions)
+            parents[source] = source
+            queue = deque([source])
+            while len(queue) > 0:
+                current = queue.popleft()
+                for child in self.neighbours[current]:
+                    if parents[child] == -1:
+                        parents[child] = current
+                        queue.append(child)
+            self._parents[source] = parents
+        return self._parents[source]
+
+    def corridor(self, cell: int, first: int) -> tuple[int, ...]:
+        """
+        Returns the cells passed when leaving a cell in a given direction and
+        following the corridor until the next junction.
+
+        Parameters
+        ----------
+        `cell` : `int`
+            The cell the agent is leaving.
+        `first` : `int`
+            The neighbouring cell the agent moves to first.
+
+        Returns
+        -------
+        The cells of the corridor in the order they are visited, ending at the
+        junction.
+        """
+        key = (cell, first)
+        if key not in self._corridors:
+            route = [first]
+            previous, current = cell, first
+            while current not in self.junctions and current != cell:
+                options = self.neighbours[current]
+                following = options[0] if options[0] != previous else options[1]
+                previous, current = current, following
+                route.append(current)
+            self._corridors[key] = tuple(route)
+        return self._corridors[key]
@@ -0,0 +1,50 @@
+"""Random keys used to hash the state of a game with Zobrist hashing."""
+
+import random
+
+from src.models.movement_types import MovementTypes
+
+
+class ZobristKeys:
+    """
+    Random keys used to hash the state of a game with Zobrist hashing.
+
+    Each part of the state which can change, such as Pac-Man being in a given
+    cell or a pickup remaining in a given cell, is given a random 64-bit key.
+    The hash of a state is the XOR of the keys of every part which is present,
+    so when a single part changes the hash can be updated by XOR-ing the key in
+    or out rather than hashing the whole state again.
+
+    The keys are generated from a fixed seed so that hashes are the same
+    across processes.
+    """
+
+    def __init__(self, cells: int, ghosts: int = 4, seed: int = 0x5EED) -> None:
+        """
+        Generate the keys.
+
+        Parameters
+        ----------
+        `cells` : `int`
+            The number of cells in the level.
+        `ghosts` : `int` DEFAULT = `4`
+            The number of ghosts in the level.
+        `seed` : `int` DEFAULT = `0x5EED`
+            The seed used to generate the keys.
+        """
+        rng = random.Random(seed)
+        self.pacman: list[int] = [rng.getrandbits(64) for _ in range(cells)]
+        """The key for Pac-Man being in each cell."""
+        self.pickups: list[int] = [rng.getrandbits(64) for _ in range(cells)]
+        """The key for a pickup remaining in each cell."""
+        self.ghost_cells: list[list[int]] = [
+            [rng.getrandbits(64) for _ in range(cells)] for _ in range(ghosts)
+        ]
+        """The key for each ghost being in each cell."""
+        self.ghost_modes: list[list[int]] = [
+            [rng.getrandbits(64) for _ in range(len(MovementTypes))]
+            for _ in range(ghosts)
+        ]
+        """The key for each ghost having each `MovementTypes` value."""
+        self.energized: int = rng.getrandbits(64)
+        """The key for Pac-Man being energized."""
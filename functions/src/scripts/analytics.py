@@ -1,55 +1,185 @@
 """Analytics tool designed to compare the performance of various agents."""
 
 import time
-from typing import Type
+from collections import defaultdict
+from typing import Callable, Optional, Type
 
+import numpy as np
 from src.models.agents.custom_agents.inactive import InactivePacMan
 from src.models.agents.custom_agents.informed import InformedPacMan
 from src.models.agents.custom_agents.random import RandomPacMan
 from src.models.agents.pacman_agent import PacmanAgent
+from src.models.batch_simulation import BatchSimulation, greedy_policy, random_policy
+from src.models.simulation_state import SimulationState
 from src.services import game_manager
+from src.services.results_store import ResultsStore
+from src.utils.stats_utils import RunningStats, bootstrap_ci, permutation_test
 
 
 class PacmanAnalytics:
     """Analytics tool designed to compare the performance of various agents."""
 
-    def __init__(self, runs: int = 10, custom_agents: list[Type[PacmanAgent]] = []):
+    PERCENTILES = (50, 90, 99)
+    """The percentiles of real time and game length reported."""
+    SIGNIFICANCE = 0.05
+    """The p-value below which a difference from the baseline is significant."""
+
+    def __init__(
+        self,
+        runs: int = 10,
+        custom_agents: list[Type[PacmanAgent]] = [],
+        configuration: game_manager.RunConfiguration = (
+            game_manager.RunConfiguration.ANALYTIC
+        ),
+        baseline: Type[PacmanAgent] = InformedPacMan,
+        output_file: Optional[str] = None,
+        level_num: int = 1,
+        max_ticks: int = 5000,
+    ):
         """
         Initialise the class.
 
-        - It is assumed that the analytics will be run on the first level as this
-        is the most proven level and the easiest for testing.
+        - By default the analytics are run on the first level as this is the
+        most proven level and the easiest for testing.
 
         Parameters
         ----------
         `runs` : `int` DEFAULT = `10`
-            The number of iterations each agent will be tested for.
+            The number of iterations each agent will be tested for. Run `i` of
+            every agent is played with seed `i`.
         `custom_agents` : `list[PacmanAgent]` DEFAULT = `[]`
             Any custom agents the user wishes to compare against
+        `configuration` : `RunConfiguration` DEFAULT = `ANALYTIC`
+            The headless configuration the games are run with. `SERIES` also
+            records the score and energised state of every tick.
+        `baseline` : `Type[PacmanAgent]` DEFAULT = `InformedPacMan`
+            The agent every other agent is tested against.
+        `output_file` : `str` DEFAULT = `None`
+            The CSV file every run is appended to. Runs already in the file are
+            not played again, so an interrupted sweep can be resumed.
+        `level_num` : `int` DEFAULT = `1`
+            The level the games are played on.
+        `max_ticks` : `int` DEFAULT = `5000`
+            The number of ticks a game may last before it is stopped. Stopped
+            games are recorded as capped.
         """
         self.runs = runs
+        self.output_file = output_file
+        self.level_num = level_num
+        self.max_ticks = max_ticks
+        self.configuration = configuration
+        self.baseline = baseline
         self.agents: list[Type[PacmanAgent]] = [
             InactivePacMan,
             RandomPacMan,
             InformedPacMan,
         ] + custom_agents
-        self.results = {}
+        if baseline not in self.agents:
+            self.agents.append(baseline)
+        self.results: dict[str, dict[str, RunningStats]] = {}
+        """
+        The statistics of every measurement of each agent, keyed by the name of
+        the agent and then of the measurement. Times are in seconds.
+        """
         self.run_models()
         self.render_data()
 
     def run_models(self):
-        """Run the models and collect the data."""
-        for agent in self.agents:
-            runs: list[dict] = []
-            for _ in range(self.runs):
-                start_time = time.time()
-                game = game_manager.GameManager(
-                    1, game_manager.RunConfiguration.ANALYTIC, custom_pacman=agent
-                )
-                results = game.game_loop()
-                results["time_real"] = time.time() - start_time
-                runs.append(results)
-            self.results[agent.__name__] = runs
+        """
+        Run the models and collect the data.
+
+        Each run is timed in three parts, the setup of the game, the simulation
+        and the teardown collecting its results. Only running statistics are
+        kept, so memory does not grow with the number of runs.
+
+        If an output file was given, each run is appended to it as soon as it
+        finishes, and runs already in the file are read back into the
+        statistics rather than being played again.
+        """
+        store = ResultsStore(self.output_file) if self.output_file else None
+        stats: dict[str, dict[str, RunningStats]] = {
+            agent.__name__: defaultdict(RunningStats) for agent in self.agents
+        }
+        completed: set[tuple[str, int]] = set()
+        try:
+            if store is not None:
+                for row in store.rows():
+                    key = (row["agent"], row["seed"])
+                    if (
+                        row["agent"] in stats
+                        and row["level"] == self.level_num
+                        and row["seed"] < self.runs
+                        and key not in completed
+                    ):
+                        completed.add(key)
+                        self._add_result(stats[row["agent"]], row)
+            for agent in self.agents:
+                for seed in range(self.runs):
+                    if (agent.__name__, seed) in completed:
+                        continue
+                    row = self._play(agent, seed, stats[agent.__name__])
+                    if store is not None:
+                        store.write(row)
+        finally:
+            if store is not None:
+                store.close()
+        self.results = {agent: dict(data) for agent, data in stats.items()}
+
+    def _play(
+        self, agent: Type[PacmanAgent], seed: int, stats: dict[str, RunningStats]
+    ) -> dict:
+        """
+        Play and time a single run, adding its results to `stats`.
+
+        Returns
+        -------
+        The result of the run, with a value for each of the `COLUMNS` of a
+        `ResultsStore` other than `run_id`.
+        """
+        start_time = time.perf_counter_ns()
+        game = game_manager.GameManager(
+            self.level_num,
+            self.configuration,
+            custom_pacman=agent,
+            seed=seed,
+            max_ticks=self.max_ticks,
+        )
+        game.setup_game()
+        game.running = True
+        setup_time = time.perf_counter_ns()
+        while game.running:
+            game.tick()
+        simulation_time = time.perf_counter_ns()
+        game.record()
+        results = game.handle_end()
+        won = game.win()
+        agent_stats = game.pacman.statistics()
+        end_time = time.perf_counter_ns()
+        row = {
+            "seed": seed,
+            "agent": agent.__name__,
+            "level": self.level_num,
+            "score": results["score"],
+            "ticks": results["time_game"],
+            "won": won,
+            "capped": game.capped,
+            "time_setup": (setup_time - start_time) / 1e9,
+            "time_real": (simulation_time - setup_time) / 1e9,
+            "time_teardown": (end_time - simulation_time) / 1e9,
+        }
+        self._add_result(stats, row)
+        for stat, value in agent_stats.items():
+            stats[f"agent_{stat}"].add(value)
+        return row
+
+    @staticmethod
+    def _add_result(stats: dict[str, RunningStats], row: dict) -> None:
+        """Add the result of a run to the statistics of its agent."""
+        for stat in ("time_setup", "time_real", "time_teardown", "score"):
+            stats[stat].add(row[stat])
+        stats["time_game"].add(row["ticks"])
+        stats["won"].add(float(row["won"]))
+        stats["capped"].add(float(row["capped"]))
 
     def render_data(self):
         """Use the data to render a comparison of models."""
@@ -57,14 +187,101 @@ class PacmanAnalytics:
         print("RUN COMPLETE")
         print("############################")
         print(f"\nAfter {self.runs} runs:\n")
+        baseline = self.results.get(self.baseline.__name__)
         for agent, data in self.results.items():
             print(agent)
-            avg_time_real = round(
-                (sum([run["time_real"] for run in data]) / self.runs), 4
-            )
-            avg_time_game = sum([run["time_game"] for run in data]) / self.runs
-            avg_score = sum([run["score"] for run in data]) / self.runs
-            print(f"avg time (in seconds) = {avg_time_real}")
-            print(f"avg time (in game) = {avg_time_game}")
-            print(f"avg score = {avg_score}")
+            score, won = data["score"], data["won"]
+            low, high = bootstrap_ci(score.sample, seed=0)
+            print(f"avg score = {round(score.mean, 4)} (95% CI {low:.4f} - {high:.4f})")
+            low, high = bootstrap_ci(won.sample, seed=0)
+            print(f"win rate = {round(won.mean, 4)} (95% CI {low:.4f} - {high:.4f})")
+            print(f"capped rate = {round(data['capped'].mean, 4)}")
+            for name, label, scale in [
+                ("time_real", "real time (in ms)", 1000),
+                ("time_game", "time (in game)", 1),
+            ]:
+                values = data[name].percentiles(self.PERCENTILES)
+                for percentile, value in zip(self.PERCENTILES, values):
+                    print(f"p{percentile} {label} = {round(value * scale, 4)}")
+            for name in ("time_setup", "time_teardown"):
+                print(f"avg {name} (in ms) = {round(data[name].mean * 1000, 4)}")
+            for stat, values in data.items():
+                if stat.startswith("agent_"):
+                    print(f"avg {stat[len('agent_'):]} = {round(values.mean, 4)}")
+            if baseline is not None and data is not baseline:
+                self._render_comparison(data, baseline)
             print("\n")
+
+    def _render_comparison(
+        self, data: dict[str, RunningStats], baseline: dict[str, RunningStats]
+    ) -> None:
+        """Print whether an agent differs significantly from the baseline."""
+        name = self.baseline.__name__
+        for stat in ("score", "won"):
+            p_value = permutation_test(data[stat].sample, baseline[stat].sample, seed=0)
+            difference = data[stat].mean - baseline[stat].mean
+            if p_value >= self.SIGNIFICANCE:
+                verdict = f"no significant difference from {name}"
+            elif difference > 0:
+                verdict = f"significantly better than {name}"
+            else:
+                verdict = f"significantly worse than {name}"
+            print(f"{stat} vs {name}: {verdict} (p = {round(p_value, 4)})")
+
+
+def run_batch_analytics(
+    games: int = 10000,
+    policies: list[Callable[[BatchSimulation], np.ndarray]] = [
+        random_policy,
+        greedy_policy,
+    ],
+    max_ticks: int = 1000,
+    level_num: int = 1,
+) -> dict[str, dict[str, np.ndarray]]:
+    """
+    Compare Pac-Man policies over many games played in lockstep.
+
+    Unlike `PacmanAnalytics`, which runs each game through `GameManager`, the
+    games are advanced together by a `BatchSimulation`, which makes sweeps of
+    thousands of games practical. Only policies which work on the whole batch
+    at once can be compared.
+
+    Parameters
+    ----------
+    `games` : `int` DEFAULT = `10000`
+        The number of games each policy is tested for.
+    `policies` : `list[Callable[[BatchSimulation], np.ndarray]]`
+        The policies to compare, DEFAULT = `[random_policy, greedy_policy]`.
+    `max_ticks` : `int` DEFAULT = `1000`
+        The game time at which games are stopped.
+    `level_num` : `int` DEFAULT = `1`
+        The level the games are played on.
+
+    Returns
+    -------
+    The results of every game, keyed by the name of the policy.
+    """
+    game = game_manager.GameManager(level_num, game_manager.RunConfiguration.ANALYTIC)
+    game.setup_game()
+    state = SimulationState.from_graph(game.game)
+    results = {}
+    rates = {}
+    for policy in policies:
+        batch = BatchSimulation(state, games)
+        start_time = time.perf_counter()
+        data = batch.run(policy, max_ticks)
+        rates[policy.__name__] = data["time"].sum() / (time.perf_counter() - start_time)
+        results[policy.__name__] = data
+
+    print("############################")
+    print("BATCH RUN COMPLETE")
+    print("############################")
+    print(f"\nAfter {games} runs:\n")
+    for name, data in results.items():
+        print(name)
+        print(f"game ticks per second = {round(rates[name])}")
+        print(f"avg time (in game) = {data['time'].mean()}")
+        print(f"median score = {np.median(data['score'])}")
+        print(f"win rate = {data['won'].mean()}")
+        print("\n")
+    return results
@@ -0,0 +1,317 @@
+"""Benchmarking and profiling tools measuring the speed of the game engine."""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Iterable, Optional, Type
+
+import numpy as np
+from src.models.agents.custom_agents.inactive import InactivePacMan
+from src.models.agents.custom_agents.informed import InformedPacMan
+from src.models.agents.custom_agents.random import RandomPacMan
+from src.models.agents.pacman_agent import PacmanAgent
+from src.models.decision_cache import DecisionCache
+from src.services import game_manager, level_handler
+from src.utils import memory_utils
+
+BENCH_AGENTS: list[Type[PacmanAgent]] = [InactivePacMan, RandomPacMan, InformedPacMan]
+"""The agents benchmarked by default, those quick enough for every run."""
+
+PERCENTILES = (50, 95, 99)
+"""The percentiles of tick latency reported."""
+
+
+def play(
+    level_num: int,
+    agent: Type[PacmanAgent],
+    seed: int,
+    max_ticks: int = 5000,
+    ghosts: str = "classic",
+    history_window: Optional[int] = None,
+    keyframe_interval: int = 100,
+    decision_cache: Optional[DecisionCache] = None,
+) -> tuple[game_manager.GameManager, list[int]]:
+    """
+    Play a single headless game, timing every tick.
+
+    The game follows `GameManager.game_loop`, but is stopped after `max_ticks`
+    so that a game which never ends cannot stall a benchmark.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The level the game is played on.
+    `agent` : `Type[PacmanAgent]`
+        The agent playing the game.
+    `seed` : `int`
+        The seed of the random generator, so that each run plays the same game.
+    `max_ticks` : `int` DEFAULT = `5000`
+        The number of ticks the game may last before it is stopped.
+    `ghosts` : `str` DEFAULT = `"classic"`
+        The name of the configuration in `GHOST_CONFIGURATIONS` choosing which
+        ghosts play.
+    `history_window` : `int` DEFAULT = `None`
+        If given, the history of the game is recorded keeping only this many
+        states in memory, for soak testing long games. Otherwise nothing is
+        recorded.
+    `keyframe_interval` : `int` DEFAULT = `100`
+        The number of states between each full board of the recorded history.
+    `decision_cache` : `DecisionCache` DEFAULT = `None`
+        If given, the cache the agents read their earlier searches from.
+
+    Returns
+    -------
+    The finished game and the duration of each of its ticks in nanoseconds.
+    """
+    game = game_manager.GameManager(
+        level_num,
+        (
+            game_manager.RunConfiguration.ANALYTIC
+            if history_window is None
+            else game_manager.RunConfiguration.SERVER
+        ),
+        custom_pacman=agent,
+        ghosts=ghosts,
+        history_window=history_window,
+        keyframe_interval=keyframe_interval,
+        decision_cache=decision_cache,
+        seed=seed,
+    )
+    game.setup_game()
+    game.running = True
+    latencies: list[int] = []
+    while game.running and len(latencies) < max_ticks:
+        start_time = time.perf_counter_ns()
+        game.tick()
+        latencies.append(time.perf_counter_ns() - start_time)
+    return game, latencies
+
+
+def run_benchmark(
+    agents: Iterable[Type[PacmanAgent]] = BENCH_AGENTS,
+    levels: Optional[Iterable[int]] = None,
+    seeds: int = 10,
+    max_ticks: int = 5000,
+    history_window: Optional[int] = None,
+    keyframe_interval: int = 100,
+    decision_cache: Optional[int] = None,
+) -> dict[str, dict[str, float]]:
+    """
+    Measure the speed of each agent on each level over a fixed set of seeds.
+
+    Each pairing of agent and level plays the seeds `0` to `seeds - 1`, so the
+    workload is the same on every run and results can be compared between
+    changes to the engine.
+
+    Parameters
+    ----------
+    `agents` : `Iterable[Type[PacmanAgent]]` DEFAULT = `BENCH_AGENTS`
+        The agents to benchmark.
+    `levels` : `Iterable[int]` DEFAULT = `None`
+        The levels to benchmark, every level if not given.
+    `seeds` : `int` DEFAULT = `10`
+        The number of games played by each agent on each level.
+    `max_ticks` : `int` DEFAULT = `5000`
+        The number of ticks a game may last before it is stopped.
+    `history_window` : `int` DEFAULT = `None`
+        If given, the history of each game is recorded keeping only this many
+        states in memory, as passed to `play`.
+    `keyframe_interval` : `int` DEFAULT = `100`
+        The number of states between each full board of the recorded history.
+    `decision_cache` : `int` DEFAULT = `None`
+        If given, the agents of each pairing share a `DecisionCache` holding
+        this many decisions, whose hit rate is reported.
+
+    Returns
+    -------
+    The measurements of each pairing, keyed by `"<agent> level <number>"`. The
+    peak memory is the largest peak resident set size of a single game.
+    """
+    level_nums = list(levels) if levels is not None else None
+    if level_nums is None:
+        level_nums = level_handler.get_level_numbers()
+    results = {}
+    print("############################")
+    print("BENCHMARK")
+    print("############################")
+    print(f"\n{seeds} games per agent and level:\n")
+    for agent in agents:
+        for level_num in level_nums:
+            latencies: list[int] = []
+            peak = 0
+            cache = DecisionCache(decision_cache) if decision_cache else None
+            start_time = time.perf_counter()
+            for seed in range(seeds):
+                memory_utils.reset_peak_rss()
+                latencies.extend(
+                    play(
+                        level_num,
+                        agent,
+                        seed,
+                        max_ticks,
+                        history_window=history_window,
+                        keyframe_interval=keyframe_interval,
+                        decision_cache=cache,
+                    )[1]
+                )
+                peak = max(peak, memory_utils.peak_rss())
+            elapsed = time.perf_counter() - start_time
+            ticks = np.array(latencies) / 1e6
+            result = {
+                "games_per_second": seeds / elapsed,
+                "ticks_per_second": len(latencies) / elapsed,
+                "peak_rss_mb": peak / 2**20,
+            }
+            if cache is not None:
+                result["cache_hit_rate"] = cache.statistics()["hit_rate"]
+            for percentile in PERCENTILES:
+                result[f"p{percentile}_ms"] = float(np.percentile(ticks, percentile))
+            name = f"{agent.__name__} level {level_num}"
+            results[name] = result
+            print(name)
+            print(f"games per second = {round(result['games_per_second'], 2)}")
+            print(f"ticks per second = {round(result['ticks_per_second'])}")
+            for percentile in PERCENTILES:
+                latency = round(result[f"p{percentile}_ms"], 4)
+                print(f"p{percentile} tick latency (in ms) = {latency}")
+            print(f"peak RSS per game (in MB) = {round(result['peak_rss_mb'], 1)}")
+            if cache is not None:
+                print(f"decision cache hit rate = {round(result['cache_hit_rate'], 3)}")
+            print("\n")
+    return results
+
+
+class StackSampler:
+    """
+    Sampling profiler recording the call stack of a thread at a fixed interval.
+
+    The stacks are counted in the folded format read by flame graph tools such
+    as `flamegraph.pl` and speedscope, one line per stack of `;` separated
+    frames followed by the number of samples taken of it.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """
+        Initialise the sampler.
+
+        Parameters
+        ----------
+        `interval` : `float` DEFAULT = `0.001`
+            The time in seconds between samples.
+        """
+        self.interval = interval
+        """The time in seconds between samples."""
+        self.stacks: Counter[str] = Counter()
+        """The number of samples taken of each folded stack."""
+        self._target = threading.get_ident()
+        """The identifier of the thread being sampled."""
+        self._stop = threading.Event()
+        """Set to end sampling."""
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        """The thread taking the samples."""
+
+    def __enter__(self) -> "StackSampler":
+        self._target = threading.get_ident()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    @staticmethod
+    def _fold(frame: Optional[FrameType]) -> str:
+        """Returns a stack in the folded format, outermost frame first."""
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(frames))
+
+    def _sample(self) -> None:
+        """Sample the target thread until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                self.stacks[self._fold(frame)] += 1
+
+    def write(self, output_file: str) -> None:
+        """
+        Write the stacks to a file in the folded format.
+
+        Parameters
+        ----------
+        `output_file` : `str`
+            The file to write the stacks to.
+        """
+        with open(output_file, "w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def profile_game(
+    level_num: int = 1,
+    agent: Type[PacmanAgent] = InformedPacMan,
+    seed: int = 0,
+    output_prefix: str = "profile",
+    max_ticks: int = 5000,
+    limit: int = 30,
+) -> tuple[str, str]:
+    """
+    Profile a single game, writing a report of the hottest functions and a file
+    of stacks for drawing a flame graph.
+
+    The game is played twice with the same seed, once under `cProfile` for the
+    report and once under a `StackSampler` for the stacks, so neither profiler
+    distorts the other.
+
+    Parameters
+    ----------
+    `level_num` : `int` DEFAULT = `1`
+        The level the game is played on.
+    `agent` : `Type[PacmanAgent]` DEFAULT = `InformedPacMan`
+        The agent playing the game.
+    `seed` : `int` DEFAULT = `0`
+        The seed of the random generator.
+    `output_prefix` : `str` DEFAULT = `"profile"`
+        The path the output files are named from, with `.txt` added for the
+        report and `.folded` for the stacks.
+    `max_ticks` : `int` DEFAULT = `5000`
+        The number of ticks the game may last before it is stopped.
+    `limit` : `int` DEFAULT = `30`
+        The number of functions included in the report.
+
+    Returns
+    -------
+    The paths of the report and of the stacks.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    game, _ = play(level_num, agent, seed, max_ticks)
+    profiler.disable()
+    report = io.StringIO()
+    report.write(
+        f"{agent.__name__} on level {level_num} with seed {seed}, "
+        f"{game.timer} ticks, score {game.pacman.score()}\n"
+    )
+    for sort in (pstats.SortKey.TIME, pstats.SortKey.CUMULATIVE):
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats(sort).print_stats(limit)
+    report_file = f"{output_prefix}.txt"
+    with open(report_file, "w") as file:
+        file.write(report.getvalue())
+
+    with StackSampler() as sampler:
+        play(level_num, agent, seed, max_ticks)
+    stacks_file = f"{output_prefix}.folded"
+    sampler.write(stacks_file)
+
+    print(f"hot functions written to {report_file}")
+    print(f"{sum(sampler.stacks.values())} stack samples written to {stacks_file}")
+    return report_file, stacks_file
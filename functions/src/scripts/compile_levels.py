@@ -0,0 +1,26 @@
+"""Build step compiling every level to a binary file of precomputed tables."""
+
+import time
+
+from src.services import level_handler
+
+
+def compile_levels() -> list[str]:
+    """
+    Compile every level in `levels.json`.
+
+    Should be run whenever `levels.json` changes, before deploying. Levels which
+    have not been compiled, or have changed since, still work but must build
+    their tables when first loaded.
+
+    Returns
+    -------
+    The paths of the compiled files.
+    """
+    paths = []
+    for level_num in level_handler.get_level_numbers():
+        start_time = time.perf_counter()
+        paths.append(level_handler.compile_level(level_num))
+        elapsed = round(time.perf_counter() - start_time, 4)
+        print(f"compiled level {level_num} to {paths[-1]} in {elapsed}s")
+    return paths
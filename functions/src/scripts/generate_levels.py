@@ -0,0 +1,265 @@
+"""Generator of synthetic levels of any size, used to test how the game scales."""
+
+import json
+import random
+from typing import Iterable, Optional
+
+from src.models import data_types
+
+WALL = 99
+"""The map value of a wall."""
+EMPTY = 0
+"""The map value of an empty space."""
+PAC_DOT = 1
+"""The map value of a pac-dot."""
+POWER_PELLET = 2
+"""The map value of a power pellet."""
+GATE = 20
+"""The map value of the gate of the ghost house."""
+TELEPORTER = 88
+"""The map value of a teleporter."""
+AGENTS = {"blinky": 21, "pinky": 22, "inky": 23, "clyde": 24, "pacman": 44}
+"""The map value of each agent."""
+
+_HOUSE_WIDTH = 6
+"""The distance from the centre of a level to the sides of the ghost house ring."""
+_HOUSE_HEIGHT = 4
+"""The distance from the centre of a level to the top and bottom of the ring."""
+MIN_WIDTH = 2 * _HOUSE_WIDTH + 7
+"""The narrowest level which can be generated."""
+MIN_HEIGHT = 2 * _HOUSE_HEIGHT + 11
+"""The shortest level which can be generated."""
+
+
+def _odd(value: int) -> int:
+    """Returns `value` if it is odd, otherwise the odd number below it."""
+    return value if value % 2 == 1 else value - 1
+
+
+def generate_level(
+    width: int,
+    height: int,
+    loop_density: float = 0.1,
+    seed: Optional[int] = None,
+    name: Optional[str] = None,
+) -> data_types.LevelData:
+    """
+    Generate a random level in the schema of `levels.json`.
+
+    The corridors run along the odd rows and columns of the board. A randomised
+    depth first search joins every crossing of these into a spanning tree, and
+    the remaining walls between neighbouring crossings are then knocked through
+    with a chance of `loop_density`. Dead ends are always opened up, as in the
+    original game every corridor leads somewhere.
+
+    The ghost house sits in the centre of the board surrounded by an empty
+    ring of corridor, with Blinky above the gate and the other ghosts inside.
+    Pac-Man starts below the house, a teleporter is placed at each end of the
+    centre row and a power pellet near each corner. Every other space of
+    corridor holds a pac-dot.
+
+    Parameters
+    ----------
+    `width` : `int`
+        The width of the board, including the outer walls.
+    `height` : `int`
+        The height of the board, including the outer walls.
+    `loop_density` : `float` DEFAULT = `0.1`
+        The chance of each wall between two crossings being removed, from `0`
+        for as few loops as possible to `1` for an open grid.
+    `seed` : `int` DEFAULT = `None`
+        The seed of the random generator, for repeatable levels.
+    `name` : `str` DEFAULT = `None`
+        The name of the level, describing its size if not given.
+
+    Returns
+    -------
+    The `LevelData` of the level, with every position given as `[x, y]`.
+    """
+    if width < MIN_WIDTH or height < MIN_HEIGHT:
+        raise ValueError(
+            f"Levels must be at least {MIN_WIDTH}x{MIN_HEIGHT}, not {width}x{height}."
+        )
+    rng = random.Random(seed)
+    grid = [[WALL] * width for _ in range(height)]
+    right = _odd(width - 2)
+    bottom = _odd(height - 2)
+    centre_x = _odd(width // 2)
+    centre_y = _odd(height // 2)
+
+    def in_house(x: int, y: int) -> bool:
+        """Returns `True` if a crossing is inside the ring around the ghost house."""
+        return abs(x - centre_x) < _HOUSE_WIDTH and abs(y - centre_y) < _HOUSE_HEIGHT
+
+    crossings = [
+        (x, y)
+        for y in range(1, bottom + 1, 2)
+        for x in range(1, right + 1, 2)
+        if not in_house(x, y)
+    ]
+    members = set(crossings)
+
+    def neighbours(x: int, y: int) -> list[tuple[int, int]]:
+        """Returns the crossings next to a crossing."""
+        around = [(x + 2, y), (x - 2, y), (x, y + 2), (x, y - 2)]
+        return [cell for cell in around if cell in members]
+
+    def join(a: tuple[int, int], b: tuple[int, int]) -> None:
+        """Knock through the wall between two neighbouring crossings."""
+        grid[(a[1] + b[1]) // 2][(a[0] + b[0]) // 2] = PAC_DOT
+
+    for x, y in crossings:
+        grid[y][x] = PAC_DOT
+
+    # Randomised depth first search for the spanning tree.
+    start = crossings[0]
+    seen = {start}
+    stack = [start]
+    while len(stack) > 0:
+        current = stack[-1]
+        unseen = [cell for cell in neighbours(*current) if cell not in seen]
+        if len(unseen) == 0:
+            stack.pop()
+            continue
+        chosen = rng.choice(unseen)
+        join(current, chosen)
+        seen.add(chosen)
+        stack.append(chosen)
+
+    for x, y in crossings:
+        for nx, ny in neighbours(x, y):
+            if (nx, ny) > (x, y) and rng.random() < loop_density:
+                join((x, y), (nx, ny))
+
+    for x, y in crossings:
+        around = neighbours(x, y)
+        walls = [
+            (nx, ny) for nx, ny in around if grid[(y + ny) // 2][(x + nx) // 2] == WALL
+        ]
+        if len(around) - len(walls) < 2 and len(walls) > 0:
+            join((x, y), rng.choice(walls))
+
+    # The ring around the ghost house, which the maze only joins from outside.
+    top = centre_y - _HOUSE_HEIGHT
+    base = centre_y + _HOUSE_HEIGHT
+    left = centre_x - _HOUSE_WIDTH
+    side = centre_x + _HOUSE_WIDTH
+    for x in range(left, side + 1):
+        grid[top][x] = EMPTY
+        grid[base][x] = EMPTY
+    for y in range(top, base + 1):
+        grid[y][left] = EMPTY
+        grid[y][side] = EMPTY
+
+    # The ghost house, entered through the gate below Blinky.
+    grid[top][centre_x] = AGENTS["blinky"]
+    grid[top + 1][centre_x] = GATE
+    grid[top + 2][centre_x] = EMPTY
+    for y in range(centre_y - 1, centre_y + 2):
+        for x in range(centre_x - 2, centre_x + 3):
+            grid[y][x] = EMPTY
+    grid[centre_y][centre_x - 1] = AGENTS["pinky"]
+    grid[centre_y][centre_x] = AGENTS["inky"]
+    grid[centre_y][centre_x + 1] = AGENTS["clyde"]
+
+    # The tunnel between the teleporters at each end of the centre row.
+    grid[centre_y][0] = TELEPORTER
+    grid[centre_y][width - 1] = TELEPORTER
+    for x in range(right + 1, width - 1):
+        grid[centre_y][x] = EMPTY
+
+    pacman = (centre_x, base + 4 if base + 4 <= bottom else base + 2)
+    grid[pacman[1]][pacman[0]] = AGENTS["pacman"]
+
+    for x, y in [(1, 3), (right, 3), (1, bottom - 2), (right, bottom - 2)]:
+        grid[y][x] = POWER_PELLET
+
+    return {
+        "name": name or f"Generated {width}x{height}",
+        "map": grid,
+        "homes": {
+            "pacman": [list(pacman)],
+            "blinky": [[right, 1], [right - 4, 1], [right - 4, 5], [right, 5]],
+            "pinky": [[1, 1], [5, 1], [5, 5], [1, 5]],
+            "inky": [
+                [right, bottom],
+                [right - 4, bottom],
+                [right - 4, bottom - 4],
+                [right, bottom - 4],
+            ],
+            "clyde": [[1, bottom], [5, bottom], [5, bottom - 4], [1, bottom - 4]],
+        },
+        "respawn": {
+            "pacman": list(pacman),
+            "blinky": [centre_x, top],
+            "pinky": [centre_x, top + 1],
+            "inky": [centre_x, top + 1],
+            "clyde": [centre_x, top + 1],
+        },
+    }
+
+
+def generate_levels(
+    sizes: Iterable[tuple[int, int]],
+    loop_density: float = 0.1,
+    seed: Optional[int] = None,
+    first_level: int = 1,
+) -> dict[str, data_types.LevelData]:
+    """
+    Generate a level of each size, keyed as in `levels.json`.
+
+    Parameters
+    ----------
+    `sizes` : `Iterable[tuple[int, int]]`
+        The width and height of each level.
+    `loop_density` : `float` DEFAULT = `0.1`
+        The chance of each wall between two crossings being removed.
+    `seed` : `int` DEFAULT = `None`
+        The seed of the random generator, for repeatable levels.
+    `first_level` : `int` DEFAULT = `1`
+        The number given to the first level.
+
+    Returns
+    -------
+    A `dict` mapping `"level <number>"` to each level.
+    """
+    rng = random.Random(seed)
+    return {
+        f"level {level_num}": generate_level(
+            width, height, loop_density, rng.randrange(2**32)
+        )
+        for level_num, (width, height) in enumerate(sizes, start=first_level)
+    }
+
+
+def write_levels(
+    output_file: str,
+    sizes: Iterable[tuple[int, int]],
+    loop_density: float = 0.1,
+    seed: Optional[int] = None,
+) -> dict[str, data_types.LevelData]:
+    """
+    Generate a level of each size and write them to a file in the schema of
+    `levels.json`.
+
+    Parameters
+    ----------
+    `output_file` : `str`
+        The file to write the levels to.
+    `sizes` : `Iterable[tuple[int, int]]`
+        The width and height of each level.
+    `loop_density` : `float` DEFAULT = `0.1`
+        The chance of each wall between two crossings being removed.
+    `seed` : `int` DEFAULT = `None`
+        The seed of the random generator, for repeatable levels.
+
+    Returns
+    -------
+    The levels which were written.
+    """
+    levels = generate_levels(sizes, loop_density, seed)
+    with open(output_file, "w") as file:
+        json.dump(levels, file)
+    for key, level in levels.items():
+        print(f"generated {key}: {level['name']}")
+    return levels
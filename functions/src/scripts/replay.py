@@ -0,0 +1,163 @@
+"""Replay games from their action logs, checking that they play out the same."""
+
+import json
+from typing import Optional
+
+from src.models.action_log import ActionLog
+from src.services import game_manager
+
+
+def record_game(
+    level_num: int,
+    agent: str = "InformedPacMan",
+    seed: Optional[int] = None,
+    ghosts: str = "classic",
+    output_file: Optional[str] = None,
+) -> ActionLog:
+    """
+    Play a game, recording its action log.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The level the game is played on.
+    `agent` : `str` DEFAULT = `"InformedPacMan"`
+        The name of the Pac-Man agent, a key of `PACMAN_AGENTS`.
+    `seed` : `int` DEFAULT = `None`
+        The seed of the game, drawn at random if not given.
+    `ghosts` : `str` DEFAULT = `"classic"`
+        The name of the ghost configuration, a key of `GHOST_CONFIGURATIONS`.
+    `output_file` : `str` DEFAULT = `None`
+        If given, the file the log is written to as JSON.
+
+    Returns
+    -------
+    The `ActionLog` of the game.
+    """
+    game = game_manager.GameManager(
+        level_num,
+        game_manager.RunConfiguration.ANALYTIC,
+        custom_pacman=game_manager.PACMAN_AGENTS[agent],
+        ghosts=ghosts,
+        seed=seed,
+        record_actions=True,
+    )
+    game.game_loop()
+    log: ActionLog = game.action_log  # type: ignore
+    if output_file is not None:
+        with open(output_file, "w") as file:
+            json.dump(log.to_json(), file)
+    return log
+
+
+def replay(
+    log: ActionLog,
+    configuration: game_manager.RunConfiguration = (
+        game_manager.RunConfiguration.ANALYTIC
+    ),
+) -> game_manager.GameManager:
+    """
+    Simulate a game again from its action log.
+
+    The game is played from the seed of the log for as many ticks as were
+    recorded, so a game which was stopped early is stopped at the same tick.
+    Its own moves are recorded, so they can be compared with the log.
+
+    Parameters
+    ----------
+    `log` : `ActionLog`
+        The log of the game.
+    `configuration` : `RunConfiguration` DEFAULT = `ANALYTIC`
+        The configuration of the replay, `SERVER` to rebuild the full history
+        of the game from the log.
+
+    Returns
+    -------
+    The replayed game.
+    """
+    game = game_manager.GameManager(
+        log.level_num,
+        configuration,
+        custom_pacman=game_manager.PACMAN_AGENTS[log.agent],
+        ghosts=log.ghosts,
+        seed=log.seed,
+        record_actions=True,
+    )
+    game.setup_game()
+    game.running = True
+    while game.running and len(game.action_log) < len(log):  # type: ignore
+        game.tick()
+    game.record()
+    return game
+
+
+def verify(log: ActionLog) -> dict:
+    """
+    Replay a game and check that it plays out as recorded.
+
+    Parameters
+    ----------
+    `log` : `ActionLog`
+        The log of the game.
+
+    Returns
+    -------
+    `dict`
+        Whether the replay matched, the first tick whose moves differ, if any,
+        and each value of the end state which differs, as its recorded and
+        replayed values.
+    """
+    game = replay(log)
+    moves = game.action_log.moves  # type: ignore
+    divergence = next(
+        (
+            index // log.agents
+            for index, (recorded, replayed) in enumerate(zip(log.moves, moves))
+            if recorded != replayed
+        ),
+        None,
+    )
+    if divergence is None and len(moves) != len(log.moves):
+        divergence = min(len(moves), len(log.moves)) // log.agents
+    end = game.end_state()
+    differences = {
+        key: (value, end.get(key))
+        for key, value in log.end.items()
+        if end.get(key) != value
+    }
+    return {
+        "match": divergence is None and len(differences) == 0,
+        "divergence": divergence,
+        "differences": differences,
+    }
+
+
+def verify_file(log_file: str) -> dict:
+    """
+    Replay the game in a log file, printing whether it played out as recorded.
+
+    Parameters
+    ----------
+    `log_file` : `str`
+        The file the log was written to by `record_game`.
+
+    Returns
+    -------
+    `dict`
+        The result of `verify`.
+    """
+    with open(log_file) as file:
+        log = ActionLog.from_json(json.load(file))
+    result = verify(log)
+    print(
+        f"{log.agent} on level {log.level_num} with seed {log.seed}, "
+        f"{len(log)} ticks in {len(log.moves)} bytes"
+    )
+    if result["match"]:
+        print("replay matches the recorded game")
+    else:
+        if result["divergence"] is not None:
+            print(f"moves diverge at tick {result['divergence']}")
+        for key, (recorded, replayed) in result["differences"].items():
+            print(f"{key}: recorded {recorded}, replayed {replayed}")
+    return result
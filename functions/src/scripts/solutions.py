@@ -0,0 +1,108 @@
+"""Offline tool finding the solution of each level to be served by default."""
+
+import time
+from typing import Callable, Type
+
+from src.models.agents.custom_agents.informed import InformedPacMan
+from src.models.agents.pacman_agent import PacmanAgent
+from src.models.game_state_store import GameStateStore
+from src.services import game_manager, level_handler, solution_store
+
+CRITERIA: dict[str, Callable[[dict], tuple]] = {
+    "score": lambda run: (run["score"], run["won"], -run["time_game"]),
+    "time": lambda run: (run["won"], -run["time_game"], run["score"]),
+    "win": lambda run: (run["won"], run["score"], -run["time_game"]),
+}
+"""
+How runs are ranked by each criterion, the run with the largest key is kept.
+`score` prefers the highest score, `time` the quickest win and `win` the
+highest scoring win.
+"""
+
+
+def solve_level(
+    level_num: int,
+    seeds: int = 10,
+    agent: Type[PacmanAgent] = InformedPacMan,
+    criterion: str = "win",
+    max_ticks: int = 5000,
+) -> tuple[GameStateStore, dict]:
+    """
+    Simulate a level with a number of seeds and keep the best run.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the level to solve.
+    `seeds` : `int` DEFAULT = `10`
+        The number of seeds to simulate, from `0` to `seeds - 1`.
+    `agent` : `Type[PacmanAgent]` DEFAULT = `InformedPacMan`
+        The agent playing the level.
+    `criterion` : `str` DEFAULT = `"win"`
+        The name of the criterion in `CRITERIA` used to choose the best run.
+    `max_ticks` : `int` DEFAULT = `5000`
+        The number of ticks a run is stopped after if it has not ended.
+
+    Returns
+    -------
+    The history of the best run and the details of how it was found.
+    """
+    rank = CRITERIA[criterion]
+    best_store, best = None, None
+    for seed in range(seeds):
+        game = game_manager.GameManager(
+            level_num,
+            game_manager.RunConfiguration.SERVER,
+            custom_pacman=agent,
+            seed=seed,
+            max_ticks=max_ticks,
+        )
+        game.game_loop()
+        run = {
+            "agent": agent.__name__,
+            "seed": seed,
+            "criterion": criterion,
+            "time_game": game.timer,
+            "score": game.pacman.score(),
+            "won": game.win(),
+        }
+        if best is None or rank(run) > rank(best):
+            best_store, best = game.state_store, run
+    assert best_store is not None and best is not None
+    return best_store, best
+
+
+def build_solutions(
+    seeds: int = 10,
+    agent: Type[PacmanAgent] = InformedPacMan,
+    criterion: str = "win",
+    max_ticks: int = 5000,
+) -> None:
+    """
+    Solve and store every level.
+
+    Only a run which wins is stored as the solution of a level. A level which
+    no run wins is left without one, so it is simulated when requested.
+
+    Parameters
+    ----------
+    `seeds` : `int` DEFAULT = `10`
+        The number of seeds simulated for each level.
+    `agent` : `Type[PacmanAgent]` DEFAULT = `InformedPacMan`
+        The agent playing the levels.
+    `criterion` : `str` DEFAULT = `"win"`
+        The name of the criterion in `CRITERIA` used to choose the best run.
+    `max_ticks` : `int` DEFAULT = `5000`
+        The number of ticks a run is stopped after if it has not ended.
+    """
+    for level_num in level_handler.get_level_numbers():
+        start_time = time.time()
+        store, details = solve_level(level_num, seeds, agent, criterion, max_ticks)
+        print(f"level {level_num} simulated in {round(time.time() - start_time, 4)}s")
+        print(f"best run = {details}")
+        if details["won"]:
+            path = solution_store.save_solution(level_num, store, details)
+            print(f"stored at {path}\n")
+        else:
+            solution_store.delete_solution(level_num)
+            print("no run won the level, so no solution is stored\n")
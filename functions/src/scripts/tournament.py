@@ -0,0 +1,234 @@
+"""Tournament scheduler playing every agent on every level across processes."""
+
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Optional
+
+from src.scripts.benchmark import play
+from src.services import game_manager, level_handler
+from src.utils import memory_utils
+from src.utils.stats_utils import RunningStats
+
+AGENT_COSTS: dict[str, float] = {
+    "InactivePacMan": 1.0,
+    "RandomPacMan": 1.0,
+    "InformedPacMan": 1.0,
+    "QLearningPacMan": 1.2,
+    "MCTSPacMan": 6.0,
+    "ExpectimaxPacMan": 13.0,
+    "MinimaxPacMan": 20.0,
+}
+"""
+The time each agent takes per tick relative to `InactivePacMan`, measured with
+`runner.py bench`. Agents which are not listed are assumed to cost `1`.
+"""
+
+Match = tuple[int, str, str, int]
+"""A single game of a tournament, as `(level, agent, ghosts, seed)`."""
+
+
+def play_match(match: Match, max_ticks: int = 5000) -> dict:
+    """
+    Play a single game of a tournament.
+
+    This runs in a worker process, so it takes and returns only plain values.
+
+    Parameters
+    ----------
+    `match` : `Match`
+        The level, name of the Pac-Man agent, name of the ghost configuration
+        and seed of the game.
+    `max_ticks` : `int` DEFAULT = `5000`
+        The number of ticks the game may last before it is stopped.
+
+    Returns
+    -------
+    The match with its score, length, whether it was won, its real time and
+    the peak resident set size of the worker while it was played.
+    """
+    level_num, agent, ghosts, seed = match
+    memory_utils.reset_peak_rss()
+    start_time = time.perf_counter()
+    game, _ = play(
+        level_num, game_manager.PACMAN_AGENTS[agent], seed, max_ticks, ghosts
+    )
+    return {
+        "level": level_num,
+        "agent": agent,
+        "ghosts": ghosts,
+        "seed": seed,
+        "score": game.pacman.score(),
+        "ticks": game.timer,
+        "won": game.win(),
+        "time_real": time.perf_counter() - start_time,
+        "peak_rss_mb": memory_utils.peak_rss() / 2**20,
+    }
+
+
+class Tournament:
+    """
+    Tournament playing every Pac-Man agent on every level against every ghost
+    configuration with every seed.
+
+    The games are shared between a pool of processes. Each game is given an
+    estimated cost from the speed of its agent and the size of its level, and
+    the most expensive games are started first so that no slow game is left
+    running alone at the end of the tournament.
+    """
+
+    def __init__(
+        self,
+        agents: Iterable[str],
+        levels: Optional[Iterable[int]] = None,
+        ghosts: Iterable[str] = ("classic",),
+        seeds: int = 10,
+        workers: Optional[int] = None,
+        max_ticks: int = 5000,
+    ) -> None:
+        """
+        Initialise the tournament.
+
+        Parameters
+        ----------
+        `agents` : `Iterable[str]`
+            The names of the Pac-Man agents, keys of `PACMAN_AGENTS`.
+        `levels` : `Iterable[int]` DEFAULT = `None`
+            The levels played, every level if not given.
+        `ghosts` : `Iterable[str]` DEFAULT = `("classic",)`
+            The names of the ghost configurations, keys of
+            `GHOST_CONFIGURATIONS`.
+        `seeds` : `int` DEFAULT = `10`
+            The number of seeds played of every other combination.
+        `workers` : `int` DEFAULT = `None`
+            The number of processes, one per CPU if not given.
+        `max_ticks` : `int` DEFAULT = `5000`
+            The number of ticks a game may last before it is stopped.
+        """
+        self.levels = (
+            list(levels) if levels is not None else level_handler.get_level_numbers()
+        )
+        """The levels played."""
+        self.matches: list[Match] = list(
+            itertools.product(self.levels, agents, ghosts, range(seeds))
+        )
+        """Every game of the tournament."""
+        self.workers = workers or os.cpu_count() or 1
+        """The number of processes playing games."""
+        self.max_ticks = max_ticks
+        """The number of ticks a game may last before it is stopped."""
+        self.results: list[dict] = []
+        """The result of every game played, in the order they finished."""
+
+    def cost(self, match: Match) -> float:
+        """
+        Estimate the relative cost of a game.
+
+        Parameters
+        ----------
+        `match` : `Match`
+            The game to estimate.
+
+        Returns
+        -------
+        The cost of the agent per tick multiplied by the number of cells of the
+        level, which bounds how long games last and how costly searches are.
+        """
+        level_num, agent, _, _ = match
+        cells = len(level_handler.get_topology(level_num))
+        return AGENT_COSTS.get(agent, 1.0) * cells
+
+    def run(self) -> list[dict]:
+        """
+        Play every game of the tournament, reporting progress as games finish.
+
+        Returns
+        -------
+        The leaderboard, as given by `leaderboard`.
+        """
+        costs = {match: self.cost(match) for match in self.matches}
+        schedule = sorted(self.matches, key=lambda match: costs[match], reverse=True)
+        total_cost = sum(costs.values())
+        done_cost = 0.0
+        start_time = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(play_match, match, self.max_ticks): match
+                for match in schedule
+            }
+            for future in as_completed(futures):
+                self.results.append(future.result())
+                done_cost += costs[futures[future]]
+                self._report(start_time, done_cost, total_cost)
+        sys.stdout.write("\n")
+        return self.leaderboard()
+
+    def _report(self, start_time: float, done_cost: float, total_cost: float) -> None:
+        """Print the progress of the tournament and its estimated time left."""
+        elapsed = time.perf_counter() - start_time
+        remaining = elapsed / done_cost * (total_cost - done_cost)
+        sys.stdout.write(
+            f"\r{len(self.results)}/{len(self.matches)} games, "
+            f"{round(elapsed)}s elapsed, ETA {round(remaining)}s   "
+        )
+        sys.stdout.flush()
+
+    def leaderboard(self) -> list[dict]:
+        """
+        Rank the agents by their results over the games played.
+
+        Returns
+        -------
+        A row for each agent in order of win rate and then mean score, with
+        its number of games, win rate, mean score, mean game length, mean
+        real time per game in seconds and largest peak memory of a game in MB.
+        """
+        stats: dict[str, dict[str, RunningStats]] = {}
+        for result in self.results:
+            agent = stats.setdefault(
+                result["agent"],
+                {
+                    name: RunningStats()
+                    for name in ("won", "score", "ticks", "time", "memory")
+                },
+            )
+            agent["won"].add(float(result["won"]))
+            agent["score"].add(result["score"])
+            agent["ticks"].add(result["ticks"])
+            agent["time"].add(result["time_real"])
+            agent["memory"].add(result["peak_rss_mb"])
+        rows = [
+            {
+                "agent": name,
+                "games": data["won"].count,
+                "win_rate": data["won"].mean,
+                "score": data["score"].mean,
+                "ticks": data["ticks"].mean,
+                "time_real": data["time"].mean,
+                "peak_rss_mb": data["memory"].maximum,
+            }
+            for name, data in stats.items()
+        ]
+        rows.sort(key=lambda row: (row["win_rate"], row["score"]), reverse=True)
+        return rows
+
+    def render_leaderboard(self) -> None:
+        """Print the leaderboard as a table."""
+        print("############################")
+        print("LEADERBOARD")
+        print("############################")
+        print(
+            f"\n{len(self.results)} games over levels {self.levels}\n\n"
+            f"{'rank':<5}{'agent':<20}{'games':>7}{'win rate':>10}"
+            f"{'avg score':>11}{'avg ticks':>11}{'avg time (s)':>14}"
+            f"{'peak RSS (MB)':>15}"
+        )
+        for rank, row in enumerate(self.leaderboard(), start=1):
+            print(
+                f"{rank:<5}{row['agent']:<20}{row['games']:>7}"
+                f"{row['win_rate']:>10.3f}{row['score']:>11.1f}"
+                f"{row['ticks']:>11.1f}{row['time_real']:>14.4f}"
+                f"{row['peak_rss_mb']:>15.1f}"
+            )
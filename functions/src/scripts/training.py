@@ -0,0 +1,192 @@
+"""Training tool for the learning Pac-Man agents."""
+
+import random
+import time
+from typing import Optional
+
+import numpy as np
+from src.models.agents.custom_agents.q_learning import (
+    DEFAULT_WEIGHTS,
+    FEATURES,
+    WEIGHTS_FILE,
+    QLearningPacMan,
+    action_features,
+)
+from src.models.simulation_state import SimulationState
+from src.services import game_manager
+
+
+class QLearningTrainer:
+    """
+    Training tool for `QLearningPacMan`.
+
+    Games are played headless on a `SimulationState` of the level, which follows
+    the same rules as the full game but is far cheaper to advance. Each move is
+    chosen epsilon-greedily and the weights are updated after every move with
+    the approximate Q-learning rule.
+    """
+
+    def __init__(
+        self,
+        level_num: int = 1,
+        alpha: float = 0.001,
+        gamma: float = 0.9,
+        epsilon: float = 0.1,
+        max_ticks: int = 1000,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialise the trainer.
+
+        Parameters
+        ----------
+        `level_num` : `int` DEFAULT = `1`
+            The level the games are played on.
+        `alpha` : `float` DEFAULT = `0.001`
+            The learning rate.
+        `gamma` : `float` DEFAULT = `0.9`
+            The discount applied to future rewards.
+        `epsilon` : `float` DEFAULT = `0.1`
+            The chance of taking a random move rather than the best move.
+        `max_ticks` : `int` DEFAULT = `1000`
+            The number of ticks a game may last before it is stopped.
+        `seed` : `int` DEFAULT = `None`
+            The seed of the random generator, for repeatable training.
+        """
+        self.alpha = alpha
+        """The learning rate."""
+        self.gamma = gamma
+        """The discount applied to future rewards."""
+        self.epsilon = epsilon
+        """The chance of taking a random move rather than the best move."""
+        self.max_ticks = max_ticks
+        """The number of ticks a game may last before it is stopped."""
+        self.max_gain = 20
+        """The most score a single tick is rewarded for."""
+        self.rng = random.Random(seed)
+        """The random generator used for exploration and frightened ghosts."""
+        self.weights = DEFAULT_WEIGHTS.astype(float)
+        """The weights being trained, starting from `DEFAULT_WEIGHTS`."""
+        game = game_manager.GameManager(
+            level_num, game_manager.RunConfiguration.ANALYTIC
+        )
+        game.setup_game()
+        self.start = SimulationState.from_graph(game.game)
+        """The state at the start of the level, copied for every game."""
+
+    def reward(self, before: SimulationState, after: SimulationState) -> float:
+        """
+        Returns the reward for a single tick.
+
+        The reward is the score gained, measured in Pac-Dots, less a small cost
+        for the time taken. Dying and clearing the level carry a large penalty
+        and bonus. The score of consuming a ghost grows with every ghost in a
+        streak, so the score gained is capped at `max_gain`.
+
+        Parameters
+        ----------
+        `before` : `SimulationState`
+            The state before the tick.
+        `after` : `SimulationState`
+            The state after the tick.
+
+        Returns
+        -------
+        The reward.
+        """
+        reward = min(after.score - before.score, self.max_gain) / 10 - 0.1
+        if after.lost():
+            reward -= 50
+        elif after.won():
+            reward += 50
+        return reward
+
+    def play(self) -> dict[str, float]:
+        """
+        Play a single training game, updating the weights after every move.
+
+        Returns
+        -------
+        The score, pickups eaten, length and outcome of the game.
+        """
+        state = self.start.clone()
+        features = action_features(state, state.pacman_moves())
+        while not state.is_terminal() and state.time < self.max_ticks:
+            moves = state.pacman_moves()
+            values = features @ self.weights
+            if self.rng.random() < self.epsilon:
+                choice = self.rng.randrange(len(moves))
+            else:
+                choice = int(np.argmax(values))
+            before = state.clone()
+            state.apply(moves[choice], self.rng)
+            target = self.reward(before, state)
+            following = None
+            if not state.is_terminal():
+                following = action_features(state, state.pacman_moves())
+                target += self.gamma * float((following @ self.weights).max())
+            error = target - values[choice]
+            self.weights += self.alpha * error * features[choice]
+            features = following
+        return {
+            "score": state.score,
+            "pickups": state.total_pickups - state.remaining,
+            "time": state.time,
+            "won": state.won(),
+        }
+
+    def train(self, episodes: int) -> list[dict[str, float]]:
+        """
+        Play a number of training games.
+
+        Parameters
+        ----------
+        `episodes` : `int`
+            The number of games to play.
+
+        Returns
+        -------
+        The result of each game.
+        """
+        return [self.play() for _ in range(episodes)]
+
+    def save(self, file: str = WEIGHTS_FILE) -> None:
+        """
+        Save the weights to a compressed `.npz` file.
+
+        Parameters
+        ----------
+        `file` : `str` DEFAULT = `WEIGHTS_FILE`
+            The file to write to.
+        """
+        np.savez_compressed(file, weights=self.weights, features=np.array(FEATURES))
+        QLearningPacMan._loaded.pop(file, None)
+
+
+def run_training(episodes: int, output_file: Optional[str] = None) -> None:
+    """
+    Train `QLearningPacMan` and save its weights.
+
+    Parameters
+    ----------
+    `episodes` : `int`
+        The number of games to train for.
+    `output_file` : `str` DEFAULT = `None`
+        The file to save the weights to, `WEIGHTS_FILE` if not provided.
+    """
+    trainer = QLearningTrainer()
+    start_time = time.time()
+    results = trainer.train(episodes)
+    trainer.save(output_file or WEIGHTS_FILE)
+    print("############################")
+    print("TRAINING COMPLETE")
+    print("############################")
+    print(f"\nAfter {episodes} games:\n")
+    print(f"time (in seconds) = {round(time.time() - start_time, 4)}")
+    recent = results[-100:]
+    avg_pickups = sum([run["pickups"] for run in recent]) / len(recent)
+    win_rate = sum([run["won"] for run in recent]) / len(recent)
+    print(f"avg pickups eaten (last {len(recent)} games) = {avg_pickups}")
+    print(f"win rate (last {len(recent)} games) = {win_rate}")
+    for name, weight in zip(FEATURES, trainer.weights):
+        print(f"{name} = {round(float(weight), 4)}")
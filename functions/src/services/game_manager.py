@@ -1,15 +1,25 @@
 """Service managing the running of the game."""
 
+import random
 from enum import Enum
+from typing import Optional
 
 from src import exceptions
+from src.models.action_log import ActionLog
 from src.models.agents import ghost_agent
+from src.models.agents.custom_agents.inactive import InactivePacMan
 from src.models.agents.custom_agents.informed import InformedPacMan
+from src.models.agents.custom_agents.mcts import MCTSPacMan
+from src.models.agents.custom_agents.minimax import ExpectimaxPacMan, MinimaxPacMan
+from src.models.agents.custom_agents.q_learning import QLearningPacMan
+from src.models.agents.custom_agents.random import RandomPacMan
 from src.models.agents.pacman_agent import PacmanAgent
 from src.models.agents.placeholder_agent import PlaceholderAgent
+from src.models.decision_cache import DecisionCache
 from src.models.game_state import GameState
 from src.models.game_state_store import GameStateStore
 from src.models.graph import Graph
+from src.models.rolling_game_state_store import RollingGameStateStore
 from src.services import level_handler
 from src.utils import game_utils, level_utils
 
@@ -20,6 +30,49 @@ class RunConfiguration(Enum):
     LOCAL = "local"
     SERVER = "server"
     ANALYTIC = "analytic"
+    """Headless run which records no history and only returns the final result."""
+    SERIES = "series"
+    """Headless run which records only the score and energised state per tick."""
+
+
+PACMAN_AGENTS: dict[str, type[PacmanAgent]] = {
+    agent.__name__: agent
+    for agent in (
+        InactivePacMan,
+        RandomPacMan,
+        InformedPacMan,
+        MCTSPacMan,
+        MinimaxPacMan,
+        ExpectimaxPacMan,
+        QLearningPacMan,
+    )
+}
+"""The Pac-Man agents which can be requested by name."""
+
+API_AGENTS: tuple[str, ...] = ("InactivePacMan", "RandomPacMan", "InformedPacMan")
+"""
+The agents games can be requested with through the API. The search and learning
+agents take far longer to decide and are only run offline.
+"""
+
+API_MAX_TICKS = 5000
+"""The number of ticks a game requested through the API is stopped after."""
+
+GHOST_AGENTS: dict[str, type[ghost_agent.GhostAgent]] = {
+    "blinky": ghost_agent.BlinkyAgent,
+    "pinky": ghost_agent.PinkyAgent,
+    "inky": ghost_agent.InkyAgent,
+    "clyde": ghost_agent.ClydeAgent,
+}
+"""The ghost agents, keyed by the name of the ghost in the level data."""
+
+GHOST_CONFIGURATIONS: dict[str, tuple[str, ...]] = {
+    "classic": ("blinky", "pinky", "inky", "clyde"),
+    "blinky_pinky": ("blinky", "pinky"),
+    "blinky": ("blinky",),
+    "none": (),
+}
+"""The ghosts which play in each configuration, any others are left out."""
 
 
 class GameManager:
@@ -33,6 +86,14 @@ class GameManager:
         configuration: RunConfiguration,
         custom_pacman: type[PacmanAgent] = InformedPacMan,
         verbose: bool = False,
+        ghosts: str = "classic",
+        history_window: Optional[int] = None,
+        keyframe_interval: int = 100,
+        history_file: Optional[str] = None,
+        seed: Optional[int] = None,
+        record_actions: bool = False,
+        decision_cache: Optional[DecisionCache] = None,
+        max_ticks: Optional[int] = None,
     ) -> None:
         """
         Initialises the `GameManager`.
@@ -47,6 +108,10 @@ class GameManager:
         server then all output should be returned so that it can be passed back
         in server messages.
 
+        The `analytic` and `series` configurations run headless. No board
+        snapshots are taken, so benchmarks measure the agents rather than the
+        recording of the game.
+
         Parameters
         ----------
         `level_num` : `int`
@@ -61,7 +126,37 @@ class GameManager:
             indicate whether output should be printed or not.
         `verbose` : `bool` DEFAULT = `False`
             If `True`, the verbose output will be displayed
+        `ghosts` : `str` DEFAULT = `"classic"`
+            The name of the configuration in `GHOST_CONFIGURATIONS` choosing
+            which ghosts play.
+        `history_window` : `int` DEFAULT = `None`
+            If given, only this many of the latest states are kept in memory and
+            the rest of the history is spilled to a file, so that long games run
+            in bounded memory. See `RollingGameStateStore`.
+        `keyframe_interval` : `int` DEFAULT = `100`
+            The number of states between each full board in the spill file.
+        `history_file` : `str` DEFAULT = `None`
+            The path of the spill file, a temporary file if not given.
+        `seed` : `int` DEFAULT = `None`
+            The seed of the game's random generator, drawn from the `random`
+            module if not given. Each game has its own generator, so games run
+            on different threads at the same time do not affect each other.
+        `record_actions` : `bool` DEFAULT = `False`
+            If `True`, the move of each agent on each tick is recorded in
+            `action_log`, from which the game can be replayed exactly.
+        `decision_cache` : `DecisionCache` DEFAULT = `None`
+            If given, the agents read the searches they have made before from
+            this cache, which can be shared between games.
+        `max_ticks` : `int` DEFAULT = `None`
+            If given, the game is stopped once this many ticks have been played
+            without it being won or lost, and `capped` is set. Games run for
+            others, such as by the API, should always be given a limit as some
+            agents can play forever.
         """
+        self.seed: int = seed if seed is not None else random.randrange(2**32)
+        """The seed the game is played with."""
+        self.rng = random.Random(self.seed)
+        """The random generator of the game, shared by its agents."""
         self.configuration: RunConfiguration = configuration
         """The configuration used for the model run."""
         self.verbose: bool = verbose
@@ -77,39 +172,70 @@ class GameManager:
         different times and then having to factor this into collision
         calculations.
         """
-        self.state_store = GameStateStore()
+        self.state_store: GameStateStore = (
+            RollingGameStateStore(history_window, keyframe_interval, history_file)
+            if history_window is not None
+            else GameStateStore()
+        )
         """The store containing the history of the agents movements."""
+        self.score_series: list[int] = []
+        """Pac-Man's score at each tick, only recorded in the `series` configuration."""
+        self.energised_series: list[bool] = []
+        """
+        Whether Pac-Man was energised at each tick, only recorded in the `series`
+        configuration.
+        """
         self.game: Graph = level_utils.array_to_graph(level_handler.get_map(level_num))
         """The graph containing the game."""
+        self.game.set_topology(level_handler.get_topology(level_num))
         self.running = False
         """Indicates whether the game is currently running."""
-        self.agent_home = level_handler.get_homes(level_num)
+        self.max_ticks = max_ticks
+        """The number of ticks the game is stopped after, if limited."""
+        self.capped = False
+        """Whether the game was stopped by `max_ticks` before it ended."""
+        self.routes = level_handler.get_ghost_routes(level_num)
+        """The routes of the level, shared between every game of it."""
+        self.agent_home = {name: list(home) for name, home in self.routes.homes.items()}
         """Dictionary containing the homes of the agents."""
-        self.respawn = level_handler.get_respawn_points(level_num)
+        self.respawn = self.routes.respawns
         """Dictionary containing the agents respawn points."""
         self.pacman = custom_pacman(self.agent_home["pacman"], self.respawn["pacman"])
         """Representation of the Pac-Man agent."""
-        self.agents: list[PacmanAgent | ghost_agent.GhostAgent] = [
-            self.pacman,
-            ghost_agent.BlinkyAgent(self.agent_home["blinky"], self.respawn["blinky"]),
-            ghost_agent.PinkyAgent(self.agent_home["pinky"], self.respawn["pinky"]),
-            ghost_agent.InkyAgent(self.agent_home["inky"], self.respawn["inky"]),
-            ghost_agent.ClydeAgent(self.agent_home["clyde"], self.respawn["clyde"]),
+        self.agents: list[PacmanAgent | ghost_agent.GhostAgent] = [self.pacman] + [
+            GHOST_AGENTS[name](self.agent_home[name], self.respawn[name])
+            for name in GHOST_CONFIGURATIONS[ghosts]
         ]
         """Array containing all of the agents."""
+        for agent in self.agents:
+            agent.rng = self.rng
+            agent.decision_cache = decision_cache
+            if isinstance(agent, ghost_agent.GhostAgent):
+                agent.routes = self.routes
+        self.action_log: Optional[ActionLog] = (
+            ActionLog(
+                level_num, custom_pacman.__name__, ghosts, self.seed, len(self.agents)
+            )
+            if record_actions
+            else None
+        )
+        """The move of each agent on each tick, if the actions are recorded."""
 
     def setup_game(self) -> None:
         """
         Setup the game and board before the game starts.
 
-        Injects the populated agents into the place of the dummy agents.
+        Injects the populated agents into the place of the dummy agents. Dummy
+        agents of ghosts which are not playing are removed.
         """
         for placeholder in self.game.find_node_by_entity(PlaceholderAgent):
+            dummy = placeholder.get_higher_entity()
+            placeholder.remove_entity(dummy)
             for ag in self.agents:
-                if placeholder.get_higher_entity().value() == ag.value():
-                    placeholder.remove_entity(placeholder.get_higher_entity())
+                if dummy.value() == ag.value():
                     placeholder.add_entity(ag)
                     break
+        self.game.relocate()
 
     def win(self) -> bool:
         """
@@ -131,14 +257,56 @@ class GameManager:
         """
         return self.pacman.current_lives == 0
 
+    def end_state(self) -> dict:
+        """
+        Summarise the state the game is in, used to check that a replay ends
+        the same way as the game it replays.
+
+        Returns
+        -------
+        `dict`
+            The time, score, lives, remaining pickups, whether the game was won
+            or lost and the position of each agent.
+        """
+        return {
+            "time": self.timer,
+            "score": self.pacman.score(),
+            "lives": self.pacman.current_lives,
+            "pickups": self.game.remaining_pickups(),
+            "won": self.win(),
+            "lost": self.lost(),
+            "positions": {
+                ag.name(): list(self.game.find_node_by_entity(type(ag))[0].position)
+                for ag in self.agents
+            },
+        }
+
+    def record(self) -> None:
+        """
+        Record the current state of the game.
+
+        Full snapshots of the board are only taken when the history is returned,
+        headless configurations record at most the scalar values of each tick.
+        """
+        match self.configuration:
+            case RunConfiguration.LOCAL | RunConfiguration.SERVER:
+                self.state_store.add(
+                    GameState(
+                        self.timer,
+                        level_utils.graph_to_array(self.game),
+                        self.pacman.energized,
+                        self.pacman.score(),
+                    )
+                )
+            case RunConfiguration.SERIES:
+                self.score_series.append(self.pacman.score())
+                self.energised_series.append(self.pacman.energized)
+            case RunConfiguration.ANALYTIC:
+                pass
+
     def tick(self) -> None:
         """Increments the game time and processes all time based events."""
-        level_array = level_utils.graph_to_array(self.game)
-        self.state_store.add(
-            GameState(
-                self.timer, level_array, self.pacman.energized, self.pacman.score()
-            )
-        )
+        self.record()
         if self.win() or self.lost():
             self.running = False
         else:
@@ -146,26 +314,55 @@ class GameManager:
         for ag in self.agents:
             try:
                 ag.position = self.game.find_node_by_entity(type(ag))[0].position
-                self.game.move_agent(
-                    ag.position, ag.cycle(self.timer, self.game), type(ag)
-                )
+                move = ag.cycle(self.timer, self.game)
+                if self.action_log is not None:
+                    self.action_log.record(self.game, ag.position, move)
+                self.game.move_agent(ag.position, move, type(ag))
             except exceptions.CollisionException as collision:
                 try:
-                    game_utils.handle_collision(collision.node)
+                    game_utils.handle_collision(collision.node, self.game)
                 except exceptions.PacManDiedException:
                     self.running = False
                 except exceptions.GhostDiedException as ghost:
                     if isinstance(ghost.ghost, ghost_agent.GhostAgent):
-                        ghost.ghost.handle_capture()
-                        self.game.move_agent(
-                            collision.node.position,
-                            self.respawn[ghost.ghost.name().lower()],
-                            type(ghost.ghost),
-                        )
+                        self.respawn_ghost(ghost.ghost, collision.node.position)
             except IndexError as e:
                 print(f"{ag} - {e}")
                 self.running = False
                 raise
+        if (
+            self.running
+            and self.max_ticks is not None
+            and self.timer >= self.max_ticks
+            and not (self.win() or self.lost())
+        ):
+            self.running = False
+            self.capped = True
+
+    def respawn_ghost(
+        self, ghost: ghost_agent.GhostAgent, position: tuple[int, int]
+    ) -> None:
+        """
+        Return a ghost consumed by Pac-Man to its respawn point.
+
+        The ghost is placed rather than moved, so it does not collide with what
+        is already on its respawn point, such as the gate of the ghost house.
+        `SimulationState` places consumed ghosts the same way.
+
+        Parameters
+        ----------
+        `ghost` : `GhostAgent`
+            The consumed ghost.
+        `position` : `tuple[int, int]`
+            The position the ghost was consumed at.
+        """
+        ghost.handle_capture()
+        try:
+            self.game.move_agent(
+                position, self.respawn[ghost.name().lower()], type(ghost)
+            )
+        except exceptions.CollisionException:
+            pass
 
     def game_loop(self) -> dict:
         """
@@ -185,14 +382,9 @@ class GameManager:
                 print("\nSimulation manually stopped")
                 break
         # append final state after game ended
-        self.state_store.add(
-            GameState(
-                self.timer,
-                level_utils.graph_to_array(self.game),
-                self.pacman.energized,
-                self.pacman.score(),
-            )
-        )
+        self.record()
+        if self.action_log is not None:
+            self.action_log.end = self.end_state()
         return self.handle_end()
 
     def print_current_state(self) -> None:
@@ -232,3 +424,11 @@ class GameManager:
 
             case RunConfiguration.ANALYTIC:
                 return {"time_game": self.timer, "score": self.pacman.score()}
+
+            case RunConfiguration.SERIES:
+                return {
+                    "time_game": self.timer,
+                    "score": self.pacman.score(),
+                    "scores": self.score_series,
+                    "energised": self.energised_series,
+                }
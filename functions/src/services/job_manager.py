@@ -0,0 +1,220 @@
+"""Service running games in the background so they can be polled for."""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Optional
+
+from src import exceptions
+from src.services import game_manager
+
+
+class JobStatus(Enum):
+    """The stage a `Job` has reached."""
+
+    PENDING = "pending"
+    """Waiting for a worker to become free."""
+    RUNNING = "running"
+    """The game is being simulated."""
+    COMPLETE = "complete"
+    """The game has ended and its result is available."""
+    FAILED = "failed"
+    """The game could not be simulated."""
+
+
+class Job:
+    """A single game requested to be simulated in the background."""
+
+    def __init__(self, level_num: int, agent: str, seed: Optional[int]) -> None:
+        """
+        Initialise the job.
+
+        Parameters
+        ----------
+        `level_num` : `int`
+            The number of the level to be run.
+        `agent` : `str`
+            The name of the Pac-Man agent, one of `API_AGENTS`.
+        `seed` : `int | None`
+            The seed of the game, or `None` for a random game.
+        """
+        self.id = uuid.uuid4().hex
+        """The unique identifier of the job."""
+        self.level_num = level_num
+        """The number of the level to be run."""
+        self.agent = agent
+        """The name of the Pac-Man agent."""
+        self.seed = seed
+        """The seed of the game, or `None` for a random game."""
+        self.status = JobStatus.PENDING
+        """The stage the job has reached."""
+        self.game: Optional[game_manager.GameManager] = None
+        """The game being simulated, once the job has started."""
+        self.result: Optional[dict] = None
+        """The history of the game, once it has ended."""
+        self.error: Optional[str] = None
+        """The reason the job failed, if it did."""
+        self.finished: Optional[float] = None
+        """The time the job completed or failed."""
+        self.future: Optional[Future] = None
+        """The future of the worker running the job."""
+
+    def done(self) -> bool:
+        """Returns whether the job has completed or failed."""
+        return self.status in (JobStatus.COMPLETE, JobStatus.FAILED)
+
+    def to_json(self) -> dict:
+        """
+        Format the job into a JSON object for communication with the front-end.
+
+        Returns
+        -------
+        `dict`
+            The status of the job, the progress of the game while it is running
+            and the result once it has completed.
+        """
+        json: dict = {
+            "id": self.id,
+            "status": self.status.value,
+            "level_num": self.level_num,
+            "agent": self.agent,
+            "seed": self.seed,
+        }
+        if self.game is not None:
+            json["progress"] = {
+                "time": self.game.timer,
+                "score": self.game.pacman.score(),
+            }
+        if self.status == JobStatus.COMPLETE:
+            json["result"] = self.result
+            json["capped"] = self.game is not None and self.game.capped
+        if self.status == JobStatus.FAILED:
+            json["error"] = self.error
+        return json
+
+    def run(self) -> None:
+        """Simulate the game, recording the result or the reason it failed."""
+        self.status = JobStatus.RUNNING
+        try:
+            self.game = game_manager.GameManager(
+                self.level_num,
+                configuration=game_manager.RunConfiguration.SERVER,
+                custom_pacman=game_manager.PACMAN_AGENTS[self.agent],
+                seed=self.seed,
+                max_ticks=game_manager.API_MAX_TICKS,
+            )
+            self.result = self.game.game_loop()
+            self.status = JobStatus.COMPLETE
+        except Exception as e:
+            self.error = str(e)
+            self.status = JobStatus.FAILED
+        finally:
+            self.finished = time.monotonic()
+
+
+class JobManager:
+    """
+    Service running games in the background so they can be polled for.
+
+    Games are run by a pool of worker threads, so a request for a slow game
+    returns at once and no longer holds up the server. Jobs are kept in a
+    bounded store: finished jobs are removed once `ttl` seconds have passed,
+    or sooner when room is needed for a new job.
+
+    Each game has its own random generator, so a seeded game repeats exactly
+    however many other games are running at the same time. Only the agents in
+    `API_AGENTS` can be requested and every game is stopped after
+    `API_MAX_TICKS`, so no job can hold a worker indefinitely.
+    """
+
+    def __init__(
+        self, max_workers: int = 2, max_jobs: int = 100, ttl: float = 600
+    ) -> None:
+        """
+        Initialise the service.
+
+        Parameters
+        ----------
+        `max_workers` : `int` DEFAULT = `2`
+            The number of games simulated at the same time.
+        `max_jobs` : `int` DEFAULT = `100`
+            The number of jobs held at once, finished or not.
+        `ttl` : `float` DEFAULT = `600`
+            The number of seconds a finished job is held for.
+        """
+        self.max_jobs = max_jobs
+        """The number of jobs held at once, finished or not."""
+        self.ttl = ttl
+        """The number of seconds a finished job is held for."""
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        """The pool of threads running the games."""
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        """The jobs held, oldest first."""
+        self.lock = threading.Lock()
+        """Lock guarding `jobs`."""
+
+    def submit(
+        self, level_num: int, agent: str = "InformedPacMan", seed: Optional[int] = None
+    ) -> Job:
+        """
+        Request a game to be simulated in the background.
+
+        Parameters
+        ----------
+        `level_num` : `int`
+            The number of the level to be run.
+        `agent` : `str` DEFAULT = `"InformedPacMan"`
+            The name of the Pac-Man agent, one of `API_AGENTS`.
+        `seed` : `int` DEFAULT = `None`
+            The seed of the game, or `None` for a random game.
+
+        Returns
+        -------
+        The `Job` of the game.
+        """
+        if agent not in game_manager.API_AGENTS:
+            raise KeyError(f"Unknown agent {agent}.")
+        job = Job(level_num, agent, seed)
+        with self.lock:
+            self._evict()
+            if len(self.jobs) >= self.max_jobs:
+                raise exceptions.JobQueueFullException(self.max_jobs)
+            self.jobs[job.id] = job
+        job.future = self.executor.submit(job.run)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Returns a job which is still held.
+
+        Parameters
+        ----------
+        `job_id` : `str`
+            The identifier of the job.
+
+        Returns
+        -------
+        The `Job`, or `None` if it does not exist or has expired.
+        """
+        with self.lock:
+            self._evict()
+            return self.jobs.get(job_id)
+
+    def _evict(self) -> None:
+        """
+        Remove expired jobs, then the oldest finished jobs if the store is full.
+
+        Must be called while holding `lock`.
+        """
+        now = time.monotonic()
+        finished = [job for job in self.jobs.values() if job.done()]
+        for job in finished:
+            if job.finished is not None and now - job.finished >= self.ttl:
+                del self.jobs[job.id]
+        for job in finished:
+            if len(self.jobs) < self.max_jobs:
+                break
+            self.jobs.pop(job.id, None)
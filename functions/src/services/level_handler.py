@@ -7,14 +7,63 @@ run and therefore would mean that the file is open in a number of places
 at any one time. Standalone functions mean that the file can be opened
 and closed within the lifetime of a function and also prevents the instantiation
 of a number of unnecessary files.
+
+The parsed levels are kept for the lifetime of the process once read, as they
+do not change while the backend is running. The data returned is shared and
+must not be modified.
+
+The functions may be called from any number of threads, as by the job manager
+or a threaded server. The caches are only written while holding `_lock`, so
+each level is loaded once and no thread sees a partly built entry, while
+reading an entry which is already cached takes no lock.
 """
 
+import functools
+import hashlib
 import json
 import os
+import threading
+from typing import TYPE_CHECKING, Optional
 
 from src import exceptions
 from src.models import data_types
 
+if TYPE_CHECKING:
+    from src.models.ghost_routes import GhostRoutes
+    from src.models.topology import LevelTopology
+
+# NumPy and the level models are imported by the functions which need them, so
+# the endpoints which only read the levels do not wait for them at cold start.
+
+COMPILED_DIRECTORY = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "../models/compiled")
+)
+"""The directory containing the compiled levels."""
+
+_topologies: dict[str, "LevelTopology"] = {}
+"""The topologies loaded by this process, keyed by the hash of their level."""
+
+_ghost_routes: dict[str, "GhostRoutes"] = {}
+"""The route tables built by this process, keyed by the hash of their level."""
+
+_hashes: dict[int, str] = {}
+"""The hash of each level, computed on first use."""
+
+_added_levels: dict[str, data_types.LevelData] = {}
+"""Levels added with `add_levels`, such as generated levels, keyed as in levels.json."""
+
+_lock = threading.RLock()
+"""Guards the writes to the caches of this module."""
+
+
+@functools.cache
+def _read_levels() -> dict:
+    """Parses the levels.json file once per process."""
+    absolute_path = os.path.dirname(__file__)
+    relative_path = "../models/levels.json"
+    with open(os.path.join(absolute_path, relative_path)) as raw_levels:
+        return json.load(raw_levels)
+
 
 def get_levels():
     """
@@ -25,12 +74,42 @@ def get_levels():
     -------
     A `dict` object containing the levels and their data.
     """
-    absolute_path = os.path.dirname(__file__)
-    relative_path = "../models/levels.json"
-    raw_levels = open(os.path.join(absolute_path, relative_path))
-    json_data = json.load(raw_levels)
-    yield json_data
-    raw_levels.close()
+    yield _read_levels()
+    if len(_added_levels) > 0:
+        # A copy, so levels being added by another thread do not break iteration.
+        yield dict(_added_levels)
+
+
+def add_levels(levels: dict[str, data_types.LevelData]) -> None:
+    """
+    Make more levels available for the lifetime of the process.
+
+    The levels are returned alongside those in levels.json, so they can be
+    played and benchmarked by number like any other level. A level with the
+    same key as an added level replaces it, but levels in levels.json take
+    precedence.
+
+    Parameters
+    ----------
+    `levels` : `dict[str, LevelData]`
+        The levels in the schema of levels.json, such as those made by
+        `generate_levels`.
+    """
+    with _lock:
+        for key, level in levels.items():
+            _added_levels[key] = level
+            _hashes.pop(int(key.split(" ")[-1]), None)
+
+
+def get_level_numbers() -> list[int]:
+    """
+    Returns the number of every level.
+
+    Returns
+    -------
+    A `list` of the numbers of all levels, in the order they are stored.
+    """
+    return [int(key.split(" ")[-1]) for levels in get_levels() for key in levels]
 
 
 def get_level(level_num: int) -> data_types.LevelData:
@@ -164,3 +243,158 @@ def get_respawn_points(level_num: int) -> data_types.AgentRespawn:
         return formatted_points  # type: ignore
     else:
         raise exceptions.InvalidLevelConfigurationException(level_num)
+
+
+def level_hash(level_num: int) -> str:
+    """
+    Returns a hash of the data of a level.
+
+    A compiled level stores the hash of the data it was compiled from, so any
+    change to the level in `levels.json` means it is compiled again.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the desired level
+
+    Returns
+    -------
+    The SHA-256 hash of the level's data as a hexadecimal string.
+    """
+    key = _hashes.get(level_num)
+    if key is None:
+        with _lock:
+            data = json.dumps(
+                get_level(level_num), sort_keys=True, separators=(",", ":")
+            )
+            key = hashlib.sha256(data.encode()).hexdigest()
+            _hashes[level_num] = key
+    return key
+
+
+def compiled_path(level_num: int, directory: Optional[str] = None) -> str:
+    """
+    Returns the path of the compiled file of a level.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the desired level
+    `directory` : `str` DEFAULT = `COMPILED_DIRECTORY`
+        The directory containing the compiled levels.
+
+    Returns
+    -------
+    The path of the level's `.npz` file.
+    """
+    return os.path.join(directory or COMPILED_DIRECTORY, f"level_{level_num}.npz")
+
+
+def compile_level(level_num: int, directory: Optional[str] = None) -> str:
+    """
+    Compile a level to a binary file containing its precomputed tables.
+
+    The file holds the map of the level, the arrays of its `LevelTopology` and
+    the hash of the data it was compiled from.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the desired level
+    `directory` : `str` DEFAULT = `COMPILED_DIRECTORY`
+        The directory to write the compiled level to.
+
+    Returns
+    -------
+    The path of the compiled file.
+    """
+    import numpy as np
+    from src.models.topology import LevelTopology
+    from src.utils import level_utils
+
+    level_map = get_map(level_num)
+    topology = LevelTopology(level_utils.array_to_graph(level_map))
+    path = compiled_path(level_num, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(
+        path,
+        source_hash=np.array(level_hash(level_num)),
+        board=np.array(level_map, dtype=np.int8),
+        **topology.to_arrays(),
+    )
+    return path
+
+
+def get_topology(level_num: int, directory: Optional[str] = None) -> "LevelTopology":
+    """
+    Returns the `LevelTopology` of a level, loading the compiled level if possible.
+
+    The topology is read from the compiled file when its hash matches the level,
+    and is otherwise built from the level's map. Each level is only loaded once
+    per process and the same topology is shared by every game of the level.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the desired level
+    `directory` : `str` DEFAULT = `COMPILED_DIRECTORY`
+        The directory containing the compiled levels.
+
+    Returns
+    -------
+    The `LevelTopology` of the level.
+    """
+    key = level_hash(level_num)
+    topology = _topologies.get(key)
+    if topology is not None:
+        return topology
+    import numpy as np
+    from src.models.topology import LevelTopology
+    from src.utils import level_utils
+
+    with _lock:
+        # Another thread may have loaded the level while this one waited.
+        if key not in _topologies:
+            path = compiled_path(level_num, directory)
+            if os.path.exists(path):
+                with np.load(path) as compiled:
+                    if str(compiled["source_hash"]) == key:
+                        topology = LevelTopology.from_arrays(compiled)
+            if topology is None:
+                topology = LevelTopology(level_utils.array_to_graph(get_map(level_num)))
+            _topologies[key] = topology
+        return _topologies[key]
+
+
+def get_ghost_routes(level_num: int, directory: Optional[str] = None) -> "GhostRoutes":
+    """
+    Returns the routes the ghosts of a level take to its fixed targets.
+
+    The table is built once per process from the level's homes, respawn points
+    and topology, and the same table is shared by every game of the level.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the desired level
+    `directory` : `str` DEFAULT = `COMPILED_DIRECTORY`
+        The directory containing the compiled levels.
+
+    Returns
+    -------
+    The `GhostRoutes` of the level.
+    """
+    key = level_hash(level_num)
+    routes = _ghost_routes.get(key)
+    if routes is not None:
+        return routes
+    from src.models.ghost_routes import GhostRoutes
+
+    with _lock:
+        if key not in _ghost_routes:
+            _ghost_routes[key] = GhostRoutes(
+                get_topology(level_num, directory),
+                get_homes(level_num),  # type: ignore
+                get_respawn_points(level_num),  # type: ignore
+            )
+        return _ghost_routes[key]
@@ -0,0 +1,169 @@
+"""
+Service streaming the result of each analytics run to an append-only file.
+
+Results are written as CSV, one row per run, and flushed as soon as the run
+finishes, so a sweep which is interrupted loses at most the run in progress
+and memory does not grow with the number of runs. The columns are fixed, so
+the file can be read as a single table by anything reading CSV, such as
+`pandas` or `pyarrow` when converting it to Parquet.
+"""
+
+import csv
+import os
+from typing import Iterator, Optional, TextIO
+
+COLUMNS = (
+    "run_id",
+    "seed",
+    "agent",
+    "level",
+    "score",
+    "ticks",
+    "won",
+    "capped",
+    "time_setup",
+    "time_real",
+    "time_teardown",
+)
+"""The columns of the file, times are in seconds."""
+
+_TYPES = {
+    "run_id": int,
+    "seed": int,
+    "agent": str,
+    "level": int,
+    "score": int,
+    "ticks": int,
+    "won": lambda value: value == "True",
+    "capped": lambda value: value == "True",
+    "time_setup": float,
+    "time_real": float,
+    "time_teardown": float,
+}
+"""How the value of each column is read back."""
+
+_DEFAULTS = {"capped": "False"}
+"""The values of columns missing from files written before they were added."""
+
+
+class ResultsStore:
+    """Append-only file of the results of analytics runs."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Open the file, creating it if it does not exist.
+
+        A row left incomplete by an interrupted sweep is removed, so the next
+        row starts on a new line.
+
+        Parameters
+        ----------
+        `path` : `str`
+            The path of the file.
+        """
+        self.path = path
+        """The path of the file."""
+        self.count = 0
+        """The number of runs in the file."""
+        self._file: Optional[TextIO] = None
+        """The file, opened for appending on the first run written."""
+        self._writer: Optional[csv.DictWriter] = None
+        """The writer of rows to `_file`."""
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._truncate_partial_row()
+            self.count = sum(1 for _ in self.rows())
+
+    def _truncate_partial_row(self) -> None:
+        """Cut the file back to the end of its last complete row."""
+        with open(self.path, "rb+") as file:
+            file.seek(0, os.SEEK_END)
+            end = file.tell()
+            position = end
+            while position > 0:
+                step = min(4096, position)
+                file.seek(position - step)
+                chunk = file.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            if position != end:
+                file.truncate(position)
+
+    def rows(self) -> Iterator[dict]:
+        """
+        Read the runs in the file one at a time.
+
+        Rows which cannot be read, such as one cut short by a crash, are
+        skipped.
+
+        Returns
+        -------
+        An iterator of each run, with the values of `COLUMNS` keyed by name.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, newline="") as file:
+            for row in csv.DictReader(file):
+                try:
+                    yield {
+                        column: _TYPES[column](
+                            row[column] if column in row else _DEFAULTS[column]
+                        )
+                        for column in COLUMNS
+                    }
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+    def completed(self) -> set[tuple[str, int, int]]:
+        """
+        Returns the runs already in the file.
+
+        Returns
+        -------
+        A `set` of the `(agent, level, seed)` of each run.
+        """
+        return {(row["agent"], row["level"], row["seed"]) for row in self.rows()}
+
+    def write(self, result: dict) -> int:
+        """
+        Append a run to the file.
+
+        Parameters
+        ----------
+        `result` : `dict`
+            The values of every column other than `run_id`.
+
+        Returns
+        -------
+        The `run_id` given to the run.
+        """
+        if self._file is None or self._writer is None:
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            columns: list[str] = list(COLUMNS)
+            if not new:
+                # Keep to the columns of files written before a column was added.
+                with open(self.path, newline="") as file:
+                    columns = next(csv.reader(file), columns)
+            self._file = open(self.path, "a", newline="")
+            self._writer = csv.DictWriter(self._file, columns, extrasaction="ignore")
+            if new:
+                self._writer.writeheader()
+        run_id = self.count
+        self._writer.writerow({**result, "run_id": run_id})
+        self._file.flush()
+        self.count += 1
+        return run_id
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
@@ -0,0 +1,185 @@
+"""
+Service encoding game histories for transport to the front-end.
+
+A game history is a list of full boards, which as JSON is large and highly
+repetitive. Clients can ask for a smaller encoding through their request
+headers: `Accept: application/msgpack` packs the boards into a single stream of
+bytes, and `Accept-Encoding: gzip` compresses the response. Clients which ask
+for neither receive the same JSON as before.
+"""
+
+import gzip
+import json
+import time
+from typing import Optional
+
+import msgpack
+
+JSON = "application/json"
+"""The media type of JSON responses."""
+MSGPACK = "application/msgpack"
+"""The media type of msgpack responses."""
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+"""The media types clients may use to ask for msgpack."""
+
+
+def _preferences(header: Optional[str]) -> dict[str, float]:
+    """
+    Parse an `Accept` or `Accept-Encoding` header.
+
+    Parameters
+    ----------
+    `header` : `str | None`
+        The value of the header.
+
+    Returns
+    -------
+    A `dict` mapping each value listed to its quality, from `0` to `1`.
+    """
+    preferences: dict[str, float] = {}
+    for item in (header or "").split(","):
+        value, *params = [part.strip() for part in item.split(";")]
+        if value == "":
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        preferences[value.lower()] = quality
+    return preferences
+
+
+def negotiate(
+    accept: Optional[str], accept_encoding: Optional[str]
+) -> tuple[str, bool]:
+    """
+    Choose the encoding of a response from the request headers.
+
+    Parameters
+    ----------
+    `accept` : `str | None`
+        The `Accept` header of the request.
+    `accept_encoding` : `str | None`
+        The `Accept-Encoding` header of the request.
+
+    Returns
+    -------
+    The media type of the response and whether it should be compressed with
+    gzip.
+    """
+    media = _preferences(accept)
+    packed = max((media.get(kind, 0.0) for kind in _MSGPACK_TYPES), default=0.0)
+    plain = max(media.get(JSON, 0.0), media.get("*/*", 0.0) if media else 1.0)
+    encodings = _preferences(accept_encoding)
+    compress = encodings.get("gzip", encodings.get("*", 0.0)) > 0
+    return (MSGPACK if packed > 0 and packed >= plain else JSON), compress
+
+
+def pack_states(data: dict) -> bytes:
+    """
+    Pack a game history into msgpack.
+
+    The boards of every state are stored as one stream of `int8` values, board
+    after board in row-major order, with the scalar values of each state in
+    separate lists. Any other keys of `data` are packed unchanged.
+
+    Parameters
+    ----------
+    `data` : `dict`
+        The history as returned by `GameStateStore.to_json`.
+
+    Returns
+    -------
+    The packed history.
+    """
+    # NumPy is only needed for msgpack, so it is not imported at cold start.
+    import numpy as np
+
+    states = data["states"]
+    boards = np.array([state["state"] for state in states], dtype=np.int8)
+    packed = {key: value for key, value in data.items() if key != "states"}
+    packed.update(
+        {
+            "height": int(boards.shape[1]) if boards.ndim == 3 else 0,
+            "width": int(boards.shape[2]) if boards.ndim == 3 else 0,
+            "times": [state["time"] for state in states],
+            "energised": [state["energised"] for state in states],
+            "scores": [state["score"] for state in states],
+            "boards": boards.tobytes(),
+        }
+    )
+    return msgpack.packb(packed, use_bin_type=True)
+
+
+def unpack_states(body: bytes) -> dict:
+    """
+    Unpack a game history packed with `pack_states`.
+
+    Parameters
+    ----------
+    `body` : `bytes`
+        The packed history.
+
+    Returns
+    -------
+    The history in the same format as `GameStateStore.to_json`.
+    """
+    import numpy as np
+
+    packed = msgpack.unpackb(body, raw=False)
+    count = len(packed["times"])
+    boards = np.frombuffer(packed.pop("boards"), dtype=np.int8).reshape(
+        count, packed.pop("height"), packed.pop("width")
+    )
+    states = [
+        {"time": time, "state": board, "energised": energised, "score": score}
+        for time, board, energised, score in zip(
+            packed.pop("times"),
+            boards.tolist(),
+            packed.pop("energised"),
+            packed.pop("scores"),
+        )
+    ]
+    return {"states": states, **packed}
+
+
+def encode(
+    data: dict, accept: Optional[str], accept_encoding: Optional[str]
+) -> tuple[bytes, dict[str, str]]:
+    """
+    Encode a game history in the format the client asked for.
+
+    The time taken to serialize and compress the history is reported in the
+    `Server-Timing` header, in milliseconds.
+
+    Parameters
+    ----------
+    `data` : `dict`
+        The history as returned by `GameStateStore.to_json`.
+    `accept` : `str | None`
+        The `Accept` header of the request.
+    `accept_encoding` : `str | None`
+        The `Accept-Encoding` header of the request.
+
+    Returns
+    -------
+    The body of the response and its headers.
+    """
+    media, compress = negotiate(accept, accept_encoding)
+    start = time.perf_counter()
+    if media == MSGPACK:
+        body = pack_states(data)
+    else:
+        body = json.dumps(data, separators=(",", ":")).encode()
+    serialized = time.perf_counter()
+    headers = {"Content-Type": media, "Vary": "Accept, Accept-Encoding"}
+    timings = [f"serialize;dur={(serialized - start) * 1000:.3f}"]
+    if compress:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+        timings.append(f"compress;dur={(time.perf_counter() - serialized) * 1000:.3f}")
+    headers["Server-Timing"] = ", ".join(timings)
+    return body, headers
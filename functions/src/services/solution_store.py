@@ -0,0 +1,134 @@
+"""
+Service storing the precomputed solution of each level.
+
+Simulating a game takes far longer than serving one, so the best run of each
+level is found offline by `src.scripts.solutions` and stored as a compact,
+delta-encoded replay. Like `level_handler`, this service runs as standalone
+functions. Solutions are read once per process and the data returned is shared
+and must not be modified.
+"""
+
+import json
+import os
+from typing import Optional
+
+from src.models.game_state_store import GameStateStore
+from src.services import level_handler
+
+SOLUTIONS_DIRECTORY = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), "../models/solutions")
+)
+"""The directory containing the stored solutions."""
+
+_solutions: dict[str, Optional[dict]] = {}
+"""The solutions read by this process, keyed by their path."""
+
+
+def solution_path(level_num: int, directory: Optional[str] = None) -> str:
+    """
+    Returns the path of the stored solution of a level.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the desired level
+    `directory` : `str` DEFAULT = `SOLUTIONS_DIRECTORY`
+        The directory containing the solutions.
+
+    Returns
+    -------
+    The path of the level's solution.
+    """
+    return os.path.join(directory or SOLUTIONS_DIRECTORY, f"level_{level_num}.json")
+
+
+def save_solution(
+    level_num: int,
+    store: GameStateStore,
+    details: dict,
+    directory: Optional[str] = None,
+) -> str:
+    """
+    Store the solution of a level.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the level solved.
+    `store` : `GameStateStore`
+        The history of the game.
+    `details` : `dict`
+        Information about how the solution was found, such as the agent and
+        seed used.
+    `directory` : `str` DEFAULT = `SOLUTIONS_DIRECTORY`
+        The directory to write the solution to.
+
+    Returns
+    -------
+    The path of the stored solution.
+    """
+    path = solution_path(level_num, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "level_hash": level_handler.level_hash(level_num),
+                "details": details,
+                "replay": store.to_deltas(),
+            },
+            file,
+            separators=(",", ":"),
+        )
+    _solutions.pop(path, None)
+    return path
+
+
+def delete_solution(level_num: int, directory: Optional[str] = None) -> None:
+    """
+    Remove the stored solution of a level, if it has one.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the level.
+    `directory` : `str` DEFAULT = `SOLUTIONS_DIRECTORY`
+        The directory containing the solutions.
+    """
+    path = solution_path(level_num, directory)
+    if os.path.exists(path):
+        os.remove(path)
+    _solutions.pop(path, None)
+
+
+def get_solution(level_num: int, directory: Optional[str] = None) -> Optional[dict]:
+    """
+    Returns the stored solution of a level.
+
+    Solutions stored for an older version of the level, or whose run did not
+    win, are ignored.
+
+    Parameters
+    ----------
+    `level_num` : `int`
+        The number of the desired level
+    `directory` : `str` DEFAULT = `SOLUTIONS_DIRECTORY`
+        The directory containing the solutions.
+
+    Returns
+    -------
+    The solution in the same format as a game run by the server, with its
+    details under `"solution"`, or `None` if there is no solution.
+    """
+    path = solution_path(level_num, directory)
+    if path not in _solutions:
+        solution = None
+        if os.path.exists(path):
+            with open(path) as file:
+                stored = json.load(file)
+            if stored["level_hash"] == level_handler.level_hash(level_num) and stored[
+                "details"
+            ].get("won", False):
+                solution = GameStateStore.from_deltas(stored["replay"]).to_json()
+                solution["solution"] = stored["details"]
+        _solutions[path] = solution
+    return _solutions[path]
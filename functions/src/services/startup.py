@@ -0,0 +1,119 @@
+"""
+Service recording and reducing the time taken to start the backend.
+
+Times are measured from the start of the process, so the steps taken before
+this module is imported are included. It should not import anything heavy
+itself.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+def _process_start() -> float:
+    """
+    Returns the `time.perf_counter` value at which the process started.
+
+    The start is read from `/proc`, and where that is not available the time
+    this module was imported is used instead.
+    """
+    now = time.perf_counter()
+    try:
+        with open("/proc/self/stat") as file:
+            # The fields after the name of the command, from the third onwards.
+            fields = file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as file:
+            uptime = float(file.read().split()[0])
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return now
+    return now - max(uptime - started, 0.0)
+
+
+_origin = _process_start()
+"""The time the process started."""
+
+_steps: dict[str, float] = {}
+"""The number of seconds taken by each step of starting up."""
+
+
+@contextmanager
+def timed(step: str) -> Iterator[None]:
+    """
+    Record the time taken by a step of starting up.
+
+    Parameters
+    ----------
+    `step` : `str`
+        The name of the step. Repeated steps are added together.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _steps[step] = _steps.get(step, 0.0) + time.perf_counter() - start
+
+
+def mark(step: str) -> None:
+    """
+    Record the time since the process started.
+
+    Parameters
+    ----------
+    `step` : `str`
+        The name of the point reached, such as `"ready"`.
+    """
+    _steps[step] = time.perf_counter() - _origin
+
+
+def prewarm_levels() -> None:
+    """
+    Load the data, topology, routes and solution of every level.
+
+    Topologies are loaded from the compiled levels where possible.
+    """
+    from src.services import level_handler, solution_store
+
+    with timed("read levels"):
+        level_numbers = level_handler.get_level_numbers()
+    for level_num in level_numbers:
+        with timed(f"level {level_num}"):
+            level_handler.get_topology(level_num)
+            level_handler.get_ghost_routes(level_num)
+        with timed(f"solution {level_num}"):
+            solution_store.get_solution(level_num)
+    mark("prewarmed")
+
+
+def prewarm_in_background() -> threading.Thread:
+    """
+    Start loading every level on a daemon thread, see `prewarm_levels`.
+
+    The instance answers requests while the levels load, as a request for a
+    level which is not loaded yet loads it itself and `level_handler` builds
+    each level only once however many threads ask for it.
+
+    Returns
+    -------
+    The thread loading the levels.
+    """
+    thread = threading.Thread(target=prewarm_levels, name="prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def report() -> dict[str, float]:
+    """
+    Returns the time taken by each step of starting up.
+
+    Returns
+    -------
+    A `dict` mapping the name of each step to the milliseconds it took, along
+    with the `uptime` of the process.
+    """
+    times = {step: round(seconds * 1000, 3) for step, seconds in _steps.items()}
+    times["uptime"] = round((time.perf_counter() - _origin) * 1000, 3)
+    return times
@@ -1,6 +1,6 @@
 """Utility functions for the Agents."""
 
-from random import choice
+import random
 
 from src import exceptions
 from src.models.graph import Graph
@@ -9,7 +9,10 @@ from src.models.path import Path
 
 
 def gen_random_path(
-    state: Graph, current_pos: tuple[int, int], move_history: list[tuple[int, int]]
+    state: Graph,
+    current_pos: tuple[int, int],
+    move_history: list[tuple[int, int]],
+    rng: random.Random | None = None,
 ) -> tuple[list[tuple[int, int]], Path]:
     """
     Generate a random path given the context of the current state.
@@ -21,6 +24,8 @@ def gen_random_path(
     `current_pos` : `tuple[int, int]`
         The agents current position.
     `move_history` : `list[tuple[int, int]]`
+    `rng` : `random.Random` DEFAULT = `None`
+        The random generator used. If not provided the `random` module is used.
 
     Returns
     -------
@@ -28,7 +33,7 @@ def gen_random_path(
         A tuple containing the list of targets and the path to the first target.
     """
     target = []
-    target.append(state.random_node().position)
+    target.append(state.random_node(rng).position)
     # Find path to target
     path = state.shortest_path_to(current_pos, target[0])
     if len(move_history) > 0:
@@ -36,12 +41,17 @@ def gen_random_path(
         # is not moving backwards
         while path.backwards(move_history):
             target.pop(0)
-            target.append(state.random_node().position)
+            target.append(state.random_node(rng).position)
             path = state.shortest_path_to(current_pos, target[0])
     return (target, path)
 
 
-def choose_random_turn(state: Graph, node: Node, prev_pos: tuple[int, int]) -> Node:
+def choose_random_turn(
+    state: Graph,
+    node: Node,
+    prev_pos: tuple[int, int],
+    rng: random.Random | None = None,
+) -> Node:
     """
     Chooses a random direction to turn at a junction.
 
@@ -51,6 +61,8 @@ def choose_random_turn(state: Graph, node: Node, prev_pos: tuple[int, int]) -> N
         The state at the current time.
     `node` : `Node`
         The current position to be used.
+    `rng` : `random.Random` DEFAULT = `None`
+        The random generator used. If not provided the `random` module is used.
 
     Returns
     -------
@@ -60,4 +72,4 @@ def choose_random_turn(state: Graph, node: Node, prev_pos: tuple[int, int]) -> N
     if not state.is_junction(node, prev_pos):
         raise exceptions.InvalidNodeException("Node is not junction")
     adjacent = state.get_adjacent(node)
-    return choice(adjacent)
+    return (rng or random).choice(adjacent)
@@ -1,12 +1,25 @@
 """Utility functions to assist running the game."""
 
+from typing import Optional
+
 from src.models import environment, pickups
 from src.models.agents import ghost_agent
 from src.models.agents.pacman_agent import PacmanAgent
+from src.models.graph import Graph
 from src.models.node import Node
 
 
-def handle_collision(node: Node) -> None:
+def handle_collision(node: Node, level: Optional[Graph] = None) -> None:
+    """
+    Resolve a collision between the entities in a node.
+
+    Parameters
+    ----------
+    `node` : `Node`
+        The node the collision happened in.
+    `level` : `Graph` DEFAULT = `None`
+        The graph holding the node, kept up to date as pickups are eaten.
+    """
     if node.contains(environment.Teleporter):
         # If passing through teleporter, ignore
         return
@@ -25,4 +38,7 @@ def handle_collision(node: Node) -> None:
         pacman = node.get_entity(PacmanAgent)
         pickup = node.get_entity(pickups.Pickup)
         pacman.handle_consume(pickup)
-        node.entities.remove(pickup)
+        if level is not None:
+            level.remove_pickup(node)
+        else:
+            node.entities.remove(pickup)
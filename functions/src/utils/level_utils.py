@@ -1,6 +1,7 @@
 """Generic functions to be applied to instances of Levels."""
 
-from src import constants
+from collections import deque
+
 from src.exceptions import NodeNotFoundException
 from src.models.graph import Graph
 from src.models.node import Node
@@ -38,12 +39,12 @@ def array_to_graph(level: list[list[int]]) -> Graph:
     height = len(level)
     width = len(level[0])
     # queue to store the positions to be looked into
-    queue: list[tuple[int, int]] = [first_non_wall_node(level)]
+    queue: deque[tuple[int, int]] = deque([first_non_wall_node(level)])
     adjacency_list: dict[tuple[int, int], list[tuple[int, int]]] = {}
-    graph = Graph()
+    graph = Graph(width, height)
 
     while len(queue) > 0:
-        current = queue.pop(0)
+        current = queue.popleft()
 
         # invalid positions should be ignored
         if (
@@ -86,9 +87,9 @@ def graph_to_array(graph: Graph) -> list[list[int]]:
     A 2-D list containing the level.
     """
     level = []
-    for row in range(constants.PACMAN_BOARD_HEIGHT):
+    for row in range(graph.height):
         level.append([])
-        for column in range(constants.PACMAN_BOARD_WIDTH):
+        for column in range(graph.width):
             try:
                 node = graph.find_node_by_pos((column, row))
                 if node.empty():
@@ -0,0 +1,42 @@
+"""Utility functions measuring the memory used by the process."""
+
+import resource
+import sys
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak resident set size of the process to its current size, so
+    that the peak of a single game can be measured.
+
+    This is only supported on Linux, elsewhere the peak is that of the whole
+    process.
+
+    Returns
+    -------
+    `True` if the peak was reset and `False` otherwise.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process in bytes.
+
+    On Linux this is the peak since `reset_peak_rss` was last called.
+    """
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux and the BSDs report kilobytes.
+    return peak if sys.platform == "darwin" else peak * 1024
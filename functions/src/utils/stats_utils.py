@@ -0,0 +1,194 @@
+"""Statistical functions used to compare the results of agents."""
+
+import math
+import random
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+_BATCH_VALUES = 1_000_000
+"""The most values resampled at once, bounding the memory of each batch."""
+
+
+def _batches(resamples: int, size: int) -> list[int]:
+    """Split `resamples` rows of `size` values into batches of bounded memory."""
+    rows = max(1, _BATCH_VALUES // max(1, size))
+    return [min(rows, resamples - start) for start in range(0, resamples, rows)]
+
+
+class RunningStats:
+    """
+    Summary statistics of a stream of values, held in constant memory.
+
+    The mean and variance are updated with Welford's algorithm, which stays
+    accurate over millions of values. Percentiles and confidence intervals are
+    estimated from a uniform reservoir sample of at most `capacity` values, so
+    memory does not grow however many values are added.
+    """
+
+    def __init__(self, capacity: int = 10000, seed: Optional[int] = None) -> None:
+        """
+        Initialise the statistics.
+
+        Parameters
+        ----------
+        `capacity` : `int` DEFAULT = `10000`
+            The largest number of values kept to estimate percentiles.
+        `seed` : `int` DEFAULT = `None`
+            The seed of the generator choosing which values are kept.
+        """
+        self.count = 0
+        """The number of values added."""
+        self.mean = 0.0
+        """The mean of the values added."""
+        self._squares = 0.0
+        """The sum of squared differences from the mean."""
+        self.minimum = math.inf
+        """The smallest value added."""
+        self.maximum = -math.inf
+        """The largest value added."""
+        self.capacity = capacity
+        """The largest number of values kept to estimate percentiles."""
+        self.sample: list[float] = []
+        """A uniform random sample of the values added."""
+        self._rng = random.Random(seed)
+        """The generator choosing which values are kept."""
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the statistics.
+
+        Parameters
+        ----------
+        `value` : `float`
+            The value to add.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squares += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if len(self.sample) < self.capacity:
+            self.sample.append(value)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.capacity:
+                self.sample[slot] = value
+
+    @property
+    def variance(self) -> float:
+        """The sample variance of the values, `0` for fewer than two values."""
+        return self._squares / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """The sample standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+    def percentiles(self, percentiles: Sequence[float]) -> list[float]:
+        """
+        Estimate percentiles of the values.
+
+        Parameters
+        ----------
+        `percentiles` : `Sequence[float]`
+            The percentiles to estimate, between `0` and `100`.
+
+        Returns
+        -------
+        The value at each percentile, exact while fewer than `capacity` values
+        have been added.
+        """
+        if len(self.sample) == 0:
+            return [math.nan] * len(percentiles)
+        return [float(value) for value in np.percentile(self.sample, percentiles)]
+
+
+def bootstrap_ci(
+    values: Sequence[float],
+    statistic: Callable[[np.ndarray], np.ndarray] = lambda sample: sample.mean(1),
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: Optional[int] = None,
+) -> tuple[float, float]:
+    """
+    Estimate a confidence interval of a statistic by the percentile bootstrap.
+
+    Parameters
+    ----------
+    `values` : `Sequence[float]`
+        The observed values.
+    `statistic` : `Callable[[np.ndarray], np.ndarray]` DEFAULT = the mean
+        Computes the statistic of each row of a `(resamples, len(values))`
+        array of resampled values.
+    `confidence` : `float` DEFAULT = `0.95`
+        The probability the interval covers the true value.
+    `resamples` : `int` DEFAULT = `2000`
+        The number of bootstrap resamples drawn.
+    `seed` : `int` DEFAULT = `None`
+        The seed of the generator drawing the resamples.
+
+    Returns
+    -------
+    The lower and upper bounds of the interval.
+    """
+    data = np.asarray(values, dtype=float)
+    if len(data) == 0:
+        return (math.nan, math.nan)
+    rng = np.random.default_rng(seed)
+    estimates = np.concatenate(
+        [
+            statistic(data[rng.integers(0, len(data), (rows, len(data)))])
+            for rows in _batches(resamples, len(data))
+        ]
+    )
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.percentile(estimates, [tail, 100 - tail])
+    return (float(lower), float(upper))
+
+
+def permutation_test(
+    first: Sequence[float],
+    second: Sequence[float],
+    resamples: int = 10000,
+    seed: Optional[int] = None,
+) -> float:
+    """
+    Test whether two samples have different means.
+
+    The values of both samples are pooled and repeatedly shuffled between them,
+    and the p-value is the share of shuffles whose difference in means is at
+    least as large as the one observed. No distribution is assumed, which suits
+    scores and win rates.
+
+    Parameters
+    ----------
+    `first` : `Sequence[float]`
+        The values of the first sample.
+    `second` : `Sequence[float]`
+        The values of the second sample.
+    `resamples` : `int` DEFAULT = `10000`
+        The number of shuffles drawn.
+    `seed` : `int` DEFAULT = `None`
+        The seed of the generator shuffling the values.
+
+    Returns
+    -------
+    The two-sided p-value of the samples having the same mean.
+    """
+    a = np.asarray(first, dtype=float)
+    b = np.asarray(second, dtype=float)
+    if len(a) == 0 or len(b) == 0:
+        return math.nan
+    observed = abs(a.mean() - b.mean())
+    pooled = np.concatenate([a, b])
+    rng = np.random.default_rng(seed)
+    extreme = 0
+    split = len(a)
+    for rows in _batches(resamples, len(pooled)):
+        shuffled = rng.permuted(np.tile(pooled, (rows, 1)), axis=1)
+        means = shuffled[:, :split].mean(1) - shuffled[:, split:].mean(1)
+        extreme += int(np.sum(np.abs(means) >= observed - 1e-12))
+    # Count the observed split as one of the shuffles so p is never 0.
+    return (extreme + 1) / (resamples + 1)
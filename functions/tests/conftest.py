@@ -0,0 +1,24 @@
+"""Fixtures shared by the tests of several packages."""
+
+import pytest
+from src.services import level_handler, solution_store
+
+
+@pytest.fixture(scope="function")
+def level_caches():
+    """
+    Snapshot the per-process caches of levels and solutions, and restore them
+    after the test, so that tests may clear them or add levels freely.
+    """
+    caches = [
+        level_handler._topologies,
+        level_handler._ghost_routes,
+        level_handler._hashes,
+        level_handler._added_levels,
+        solution_store._solutions,
+    ]
+    snapshots = [dict(cache) for cache in caches]
+    yield
+    for cache, snapshot in zip(caches, snapshots):
+        cache.clear()
+        cache.update(snapshot)
@@ -0,0 +1,132 @@
+"""Tests for the HTTP endpoints of the backend."""
+
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+pytest.importorskip("firebase_functions")
+
+import main  # noqa: E402
+from src.models.agents.custom_agents.inactive import InactivePacMan  # noqa: E402
+from src.scripts.solutions import solve_level  # noqa: E402
+from src.services import solution_store, startup  # noqa: E402
+
+
+@pytest.fixture(scope="function")
+def client(monkeypatch):
+    """Generate a test client of the app without initialising Firebase."""
+    monkeypatch.setattr(main, "_firebase_initialised", True)
+    yield main.app.test_client()
+
+
+def test_get_game_serves_solution(client, monkeypatch, tmp_path, level_caches):
+    """Test that a game without a seed or agent is served from the solutions."""
+    store, details = solve_level(1, seeds=1, agent=InactivePacMan)
+    details["won"] = True
+    solution_store.save_solution(1, store, details, str(tmp_path))
+    monkeypatch.setattr(solution_store, "SOLUTIONS_DIRECTORY", str(tmp_path))
+    response = client.get("/get_game?level_num=1", headers={"Accept": "*/*"})
+    assert response.status_code == 200
+    assert response.get_json()["solution"] == details
+
+
+def test_get_game_without_solution(client, monkeypatch, tmp_path, level_caches):
+    """Test that a fresh game is played for levels without a solution."""
+    monkeypatch.setattr(solution_store, "SOLUTIONS_DIRECTORY", str(tmp_path))
+    response = client.get("/get_game?level_num=1", headers={"Accept": "*/*"})
+    assert response.status_code == 200
+    assert "solution" not in response.get_json()
+
+
+def test_get_game_capped(client):
+    """Test that a fresh game reports whether it was stopped at the tick limit."""
+    response = client.get("/get_game?level_num=1&seed=0")
+    assert response.status_code == 200
+    assert response.get_json()["capped"] is False
+
+
+@pytest.mark.parametrize("agent", ["MCTSPacMan", "QLearningPacMan", "Missing"])
+def test_get_game_rejects_agent(client, agent):
+    """Test that agents which are not served through the API are rejected."""
+    response = client.get(f"/get_game?level_num=1&agent={agent}")
+    assert response.status_code == 400
+    assert agent in response.get_json()["error"]
+
+
+def test_game_imports_timed_once(client):
+    """Test that importing the game engine is only reported by the first game."""
+    client.get("/get_game?level_num=1&seed=0")
+    imports = startup.report()["game imports"]
+    client.get("/get_game?level_num=1&seed=1")
+    assert startup.report()["game imports"] == imports
+
+
+def test_startup_report(client):
+    """Test that the startup report includes the instance becoming ready."""
+    report = client.get("/get_startup_report").get_json()
+    assert 0 <= report["ready"] <= report["uptime"]
+
+
+def test_create_and_get_game(client):
+    """Test that a game can be requested and then polled."""
+    response = client.post("/games", json={"level_num": 1, "seed": 0})
+    assert response.status_code == 202
+    job = response.get_json()
+    response = client.get(f"/games/{job['id']}")
+    assert response.status_code == 200
+    assert response.get_json()["id"] == job["id"]
+
+
+def test_create_game_bad_input(client):
+    """Test that a request without a level is rejected."""
+    assert client.post("/games", json={}).status_code == 400
+
+
+def test_get_unknown_game(client):
+    """Test that polling a game which was never requested is not found."""
+    assert client.get("/games/missing").status_code == 404
+
+
+def test_first_requests_set_up_once(monkeypatch):
+    """Test that requests arriving together set up each service only once."""
+    calls = []
+
+    def initialize_app():
+        calls.append("firebase")
+        if len(calls) > 1:
+            raise ValueError("The default Firebase app already exists.")
+        time.sleep(0.05)
+
+    monkeypatch.setitem(
+        sys.modules,
+        "firebase_admin",
+        types.SimpleNamespace(initialize_app=initialize_app),
+    )
+    monkeypatch.setattr(main, "_firebase_initialised", False)
+    monkeypatch.setattr(main, "_jobs", None)
+    from src.services import job_manager
+
+    class SlowJobManager(job_manager.JobManager):
+        def __init__(self):
+            calls.append("jobs")
+            time.sleep(0.05)
+            super().__init__(max_workers=1)
+
+    monkeypatch.setattr(job_manager, "JobManager", SlowJobManager)
+    barrier = threading.Barrier(8)
+
+    def first_request(_):
+        barrier.wait()
+        main.initialise_firebase()
+        return main.get_jobs()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        jobs = list(executor.map(first_request, range(8)))
+    assert calls.count("firebase") == 1 and calls.count("jobs") == 1
+    assert all(manager is jobs[0] for manager in jobs)
@@ -0,0 +1,30 @@
+"""Tests for the `ActionLog`."""
+
+from src.models.action_log import JUMP, STAY, ActionLog
+from src.services import level_handler
+from src.utils import level_utils
+
+
+def test_record_codes():
+    """Test that moves are stored by neighbour, with jumps kept aside."""
+    level = level_utils.array_to_graph(level_handler.get_map(1))
+    log = ActionLog(1, "InformedPacMan", "classic", 0, 1)
+    node = level.find_node_by_pos((1, 1))
+    neighbour = level.get_adjacent(node)[-1]
+    log.record(level, node.position, node.position)
+    log.record(level, node.position, neighbour.position)
+    log.record(level, node.position, (26, 29))
+    assert list(log.moves) == [STAY, len(level.get_adjacent(node)), JUMP]
+    assert log.jumps == [[26, 29]]
+    assert len(log) == 3
+
+
+def test_json_round_trip():
+    """Test that a log rebuilt from its JSON matches the original."""
+    log = ActionLog(2, "RandomPacMan", "blinky", 7, 2, bytearray([0, 1, 255, 2]))
+    log.jumps = [[3, 4]]
+    log.end = {"score": 10}
+    rebuilt = ActionLog.from_json(log.to_json())
+    assert rebuilt.to_json() == log.to_json()
+    assert rebuilt.moves == log.moves
+    assert len(rebuilt) == 2
@@ -0,0 +1,88 @@
+"""Tests for the `BatchSimulation`."""
+
+import numpy as np
+import pytest
+from src import exceptions
+from src.models.batch_simulation import BatchSimulation, greedy_policy, random_policy
+from src.models.simulation_state import SimulationState
+from src.services.game_manager import GameManager, RunConfiguration
+
+
+@pytest.fixture(scope="function")
+def state():
+    """Generate the state at the start of the first level."""
+    game = GameManager(1, RunConfiguration.ANALYTIC)
+    game.setup_game()
+    yield SimulationState.from_graph(game.game)
+
+
+def test_matches_simulation_state(state: SimulationState):
+    """Test that every game in the batch follows the same rules as a single game."""
+    batch = BatchSimulation(state, 3, seed=0)
+    for _ in range(150):
+        moves = greedy_policy(batch)
+        batch.apply(moves)
+        state.apply(int(moves[0]))
+        for game in range(3):
+            assert batch.pacman[game] == state.pacman
+            assert list(batch.ghost_cells[game]) == state.ghost_cells
+            assert list(batch.ghost_modes[game]) == state.ghost_modes
+            assert batch.score[game] == state.score
+            assert batch.remaining[game] == state.remaining
+
+
+def test_random_games_match_simulation_state(state: SimulationState):
+    """Test that games with different moves each follow the single game rules."""
+    batch = BatchSimulation(state, 20, seed=1)
+    states = [state.clone() for _ in range(20)]
+    for _ in range(100):
+        moves = random_policy(batch)
+        batch.apply(moves)
+        for game, single in enumerate(states):
+            single.apply(int(moves[game]))
+            assert batch.pacman[game] == single.pacman
+            assert list(batch.ghost_cells[game]) == single.ghost_cells
+            assert batch.score[game] == single.score
+            assert batch.lost()[game] == single.lost()
+
+
+@pytest.mark.parametrize("streak", [3, 55, 61, 1100])
+def test_ghost_streak_matches_simulation_state(state: SimulationState, streak: int):
+    """Test that long ghost streaks are scored and saturated like a single game."""
+    topology = state.topology
+    cell = next(
+        cell
+        for cell in topology.neighbours[state.pacman]
+        if cell not in topology.fixtures
+    )
+    if state.pickups[cell] != 0:
+        state.pickups[cell] = 0
+        state.remaining -= 1
+        state.total_pickups -= 1
+    state.ghost_cells[0] = cell
+    state.energized = True
+    state.ghost_streak = streak - 1
+    state.score = 10**6 + 10
+    batch = BatchSimulation(state, 2, seed=0)
+    batch.apply(np.full(2, cell))
+    state.apply(cell)
+    assert state.ghost_streak == streak
+    assert list(batch.score) == [state.score, state.score]
+
+
+def test_run_stops_games(state: SimulationState):
+    """Test that games stop once they end or reach the tick limit."""
+    batch = BatchSimulation(state, 50, seed=0)
+    results = batch.run(random_policy, 30)
+    assert (results["time"] <= 30).all()
+    assert ((results["time"] == 30) | results["lost"] | results["won"]).all()
+    ended = batch.time.copy()
+    batch.apply(random_policy(batch), np.zeros(50, dtype=bool))
+    assert np.array_equal(batch.time, ended)
+
+
+def test_invalid_move(state: SimulationState):
+    """Test that moving Pac-Man to a space which is not adjacent is rejected."""
+    batch = BatchSimulation(state, 2)
+    with pytest.raises(exceptions.InvalidMoveException):
+        batch.apply(np.array([state.pacman, state.topology.cell((1, 1))]))
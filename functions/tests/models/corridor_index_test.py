@@ -0,0 +1,54 @@
+"""Tests for the `CorridorIndex`."""
+
+import pytest
+from src.models.agents.pacman_agent import PacmanAgent
+from src.models.graph import Graph
+from src.models.path import Path
+from src.utils import game_utils
+from tests.mocks.mock_graph_test import mock_graph
+
+
+@pytest.fixture(scope="function")
+def graph():
+    """Generate the graph of the first level."""
+    yield mock_graph()
+
+
+def test_segments_cover_level(graph: Graph):
+    """Test that every cell belongs to exactly one segment."""
+    index = graph.pickup_index()
+    cells = [cell for segment in index.segments for cell in segment]
+    assert sorted(cells) == list(range(len(index.topology)))
+    for cell in index.topology.junctions:
+        assert index.segments[index.segment_of[cell]] == (cell,)
+    assert index.remaining == graph.remaining_pickups() == 244
+
+
+def test_route_score_matches_nodes(graph: Graph):
+    """Test that the cost of a route matches the pickups on its nodes."""
+    topology = graph.topology()
+    for target in range(0, len(topology), 7):
+        path = graph.path_from_cells(topology.route(0, target))
+        assert path.cost() == Path(path.route).cost()
+
+
+def test_eaten_pickup_removed(graph: Graph):
+    """Test that a pickup eaten in a collision is removed from the index."""
+    topology = graph.topology()
+    path = graph.path_from_cells(topology.route(topology.cell((12, 23)), 0))
+    cost = path.cost()
+    node = graph.find_node_by_pos((12, 23))
+    node.add_entity(PacmanAgent([(12, 23)], (12, 23)))
+    game_utils.handle_collision(node, graph)
+    assert path.cost() == cost - 10
+    assert graph.remaining_pickups() == 243
+
+
+def test_nearest_food(graph: Graph):
+    """Test that the closest corridor with pickups remaining is found."""
+    index = graph.pickup_index()
+    cell = graph.topology().cell((12, 23))
+    assert index.nearest_food(cell) in index.segments[index.segment_of[cell]]
+    for removed in range(len(index.topology)):
+        index.remove(removed)
+    assert index.nearest_food(cell) == -1
@@ -0,0 +1,75 @@
+"""Tests for the `DangerField`."""
+
+import pytest
+from src.exceptions import CollisionException
+from src.models.agents.ghost_agent import BlinkyAgent, GhostAgent
+from src.models.graph import Graph
+from src.models.movement_types import MovementTypes
+from src.models.topology import UNREACHABLE
+from tests.mocks.mock_graph_test import mock_graph
+
+
+@pytest.fixture(scope="function")
+def graph():
+    """Generate the graph of the first level with a ghost at (12, 23)."""
+    graph = mock_graph()
+    graph.find_node_by_pos((12, 23)).add_entity(BlinkyAgent([(1, 1)], (12, 23)))
+    yield graph
+
+
+def test_arrival_matches_distance(graph: Graph):
+    """Test that the field holds the ghost's distance to every cell."""
+    topology = graph.topology()
+    field = graph.danger_field(GhostAgent)
+    cell = topology.cell((12, 23))
+    assert (field.arrival() == topology.distance[cell]).all()
+
+
+def test_field_follows_moves(graph: Graph):
+    """Test that the field is updated when a ghost is moved."""
+    topology = graph.topology()
+    field = graph.danger_field(GhostAgent)
+    with pytest.raises(CollisionException):
+        graph.move_agent((12, 23), (11, 23), GhostAgent)
+    cell = topology.cell((11, 23))
+    assert field.cells == [cell]
+    assert (field.arrival() == topology.distance[cell]).all()
+
+
+def test_harmless_ghosts_ignored(graph: Graph):
+    """Test that a frightened ghost is left out of the field."""
+    field = graph.danger_field(GhostAgent)
+    field.ghosts[0].movement_type = MovementTypes.FRIGHTENED
+    assert (field.arrival() == UNREACHABLE).all()
+    field.ghosts[0].movement_type = MovementTypes.CHASE
+    assert field.arrival().min() == 0
+
+
+def test_path_near_ghost_unsafe(graph: Graph):
+    """Test that a path a ghost could reach first is unsafe."""
+    topology = graph.topology()
+    field = graph.danger_field(GhostAgent)
+    towards = graph.path_from_cells(
+        topology.route(topology.cell((7, 23)), topology.cell((11, 23)))
+    )
+    away = graph.path_from_cells(
+        topology.route(topology.cell((1, 5)), topology.cell((1, 1)))
+    )
+    assert towards.is_safe()
+    assert not towards.is_safe(danger=field)
+    assert away.is_safe(danger=field)
+
+
+def test_partly_consumed_path_unsafe(graph: Graph):
+    """Test that a partly followed path counts moves from where Pac-Man stands."""
+    topology = graph.topology()
+    field = graph.danger_field(GhostAgent)
+    path = graph.path_from_cells(
+        topology.route(topology.cell((7, 23)), topology.cell((10, 23)))
+    )
+    path.get_next_pos()
+    path.get_next_pos()
+    # Pac-Man stands at (8, 23) and reaches (10, 23) with the ghost.
+    assert not path.is_safe(danger=field)
+    path.get_next_pos()
+    assert path.is_safe(danger=field)
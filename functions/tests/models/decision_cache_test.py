@@ -0,0 +1,46 @@
+"""Tests for the `DecisionCache`."""
+
+import pytest
+from src.models.decision_cache import DecisionCache
+
+
+def test_hits_and_misses():
+    """Test that a decision is only made the first time it is needed."""
+    cache = DecisionCache(4)
+    calls = []
+    for _ in range(3):
+        assert cache.get("a", lambda: calls.append("a") or 1) == 1
+    assert calls == ["a"]
+    assert cache.statistics() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 1}
+
+
+def test_least_recently_used_dropped():
+    """Test that the least recently used decision is dropped when full."""
+    cache = DecisionCache(2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 1)
+    cache.get("c", lambda: 3)
+    assert len(cache) == 2
+    assert cache.get("a", lambda: -1) == 1
+    assert cache.get("b", lambda: -1) == -1
+
+
+def test_failed_decision_not_cached():
+    """Test that a decision which raises is not held."""
+    cache = DecisionCache()
+
+    def fail() -> int:
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        cache.get("a", fail)
+    assert len(cache) == 0
+    cache.clear()
+    assert cache.statistics()["misses"] == 0
+
+
+def test_invalid_size():
+    """Test that a cache must hold at least one decision."""
+    with pytest.raises(ValueError):
+        DecisionCache(0)
@@ -22,3 +22,15 @@ def test_add_ordering():
     for state in [state_1, state_2, state_3, state_4]:
         state_store.add(state)
     assert state_store.get() == [state_3, state_4, state_1, state_2]
+
+
+def test_deltas_round_trip():
+    """Tests that a store rebuilt from its deltas matches the original."""
+    state_store = GameStateStore()
+    state_store.add(GameState(0, [[1, 2], [3, 4]], False, 0))
+    state_store.add(GameState(1, [[1, 0], [3, 4]], False, 10))
+    state_store.add(GameState(2, [[1, 0], [5, 4]], True, 60))
+    deltas = state_store.to_deltas()
+    assert deltas["deltas"][1][3] == [[1, 0, 0]]
+    assert deltas["deltas"][2][3] == [[0, 1, 5]]
+    assert GameStateStore.from_deltas(deltas).to_json() == state_store.to_json()
@@ -8,3 +8,9 @@ from tests.mocks.mock_agent_test import mock_ghost
 def ghost():
     """Generate an agent of a Ghost which can be used for testing."""
     yield mock_ghost()
+
+
+def test_stays_when_path_is_exhausted(ghost):
+    """Test that a ghost with nowhere left to go stays where it is."""
+    ghost.position = (1, 1)
+    assert ghost._execute() == (1, 1)
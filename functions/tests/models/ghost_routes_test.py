@@ -0,0 +1,40 @@
+"""Tests for the `GhostRoutes`."""
+
+from src.models.agents.ghost_agent import PinkyAgent
+from src.models.movement_types import MovementTypes
+from src.services import level_handler
+from tests.mocks.mock_graph_test import mock_graph
+
+
+def test_routes_shared_between_games():
+    """Test that every game of a level shares the same table."""
+    routes = level_handler.get_ghost_routes(1)
+    assert level_handler.get_ghost_routes(1) is routes
+    assert routes.topology is level_handler.get_topology(1)
+    assert routes.respawns["pinky"] == (13, 12)
+
+
+def test_scatter_route_matches_shortest_path():
+    """Test that routes to a scatter corner are the shortest paths."""
+    routes = level_handler.get_ghost_routes(1)
+    graph = mock_graph()
+    graph.set_topology(routes.topology)
+    corner = routes.homes["blinky"][0]
+    route = routes.route((13, 11), corner)
+    assert graph.path_from_cells(route) == graph.shortest_path_to((13, 11), corner)
+    # Every route to a fixed target has been traced when the table was built.
+    cell = routes.topology.cell(corner)
+    assert (routes.topology.cell((26, 29)), cell) in routes.topology._routes
+
+
+def test_release_uses_exit_route():
+    """Test that a released ghost heads to its respawn point."""
+    routes = level_handler.get_ghost_routes(1)
+    graph = mock_graph()
+    graph.set_topology(routes.topology)
+    ghost = PinkyAgent(list(routes.homes["pinky"]), routes.respawns["pinky"])
+    ghost.routes = routes
+    ghost._release(graph)
+    assert ghost.movement_type == MovementTypes.CHASE
+    assert ghost.path.peek().position == (13, 12)
+    assert len(ghost.path) == 1
@@ -1,10 +1,14 @@
 import pytest
 from src import exceptions
 from src.models import environment, pickups
+from src.models.agents.custom_agents.random import RandomPacMan
 from src.models.agents.pacman_agent import PacmanAgent
 from src.models.graph import Graph
+from src.models.movement_types import MovementTypes
 from src.models.node import Node
 from src.models.path import Path
+from src.models.simulation_state import SimulationState
+from src.services.game_manager import GameManager, RunConfiguration
 from tests.mocks.mock_agent_test import mock_ghost
 
 
@@ -186,6 +190,15 @@ def test_move_nowhere(compiled_graph: Graph):
     assert compiled_graph.find_node_by_entity(PacmanAgent)[0].position == (0, 0)
 
 
+def test_locate_follows_moves(compiled_graph: Graph):
+    """Test that located agents are followed as they move."""
+    assert compiled_graph.locate(PacmanAgent)[0].position == (0, 0)
+    compiled_graph.move_agent((0, 0), (0, 3), PacmanAgent)
+    assert compiled_graph.locate(PacmanAgent)[0].position == (0, 3)
+    compiled_graph.move_agent((0, 3), (0, 0), PacmanAgent)
+    assert compiled_graph.locate(PacmanAgent)[0].position == (0, 0)
+
+
 def test_non_repeating_cycle(compiled_graph: Graph, nodes: list[Node]):
     """Test that non-repeating paths are detected."""
     test_1 = [nodes[0], nodes[1], nodes[2], nodes[3], nodes[4]]
@@ -293,3 +306,62 @@ def test_path_to_jct(compiled_graph: Graph):
     expected_end = compiled_graph.find_node_by_pos((0, 6))
     paths = compiled_graph.find_path_to_next_jct((0, 7))
     assert paths[0].route[-1] == expected_end
+
+
+@pytest.fixture(scope="function")
+def game():
+    """Generate a game of the first level with the agents in place."""
+    game = GameManager(1, RunConfiguration.ANALYTIC, custom_pacman=RandomPacMan, seed=1)
+    game.setup_game()
+    game.running = True
+    yield game
+
+
+def rebuilt_hash(graph: Graph) -> int:
+    """Returns the hash of a graph built again from scratch."""
+    graph.relocate()
+    return graph.state_hash()
+
+
+def test_state_hash_follows_game(game: GameManager):
+    """Test that the hash kept up to date matches the state of the game."""
+    game.game.state_hash()
+    while game.running and game.timer < 100:
+        game.tick()
+        expected = SimulationState.from_graph(game.game).state_hash()
+        assert game.game.state_hash() == expected
+    assert game.game.state_hash() == rebuilt_hash(game.game)
+
+
+def test_state_hash_follows_modes(game: GameManager):
+    """Test that the hash changes with the modes of the agents."""
+    start = game.game.state_hash()
+    game.pacman.energized = True
+    energized = game.game.state_hash()
+    assert energized != start
+    assert energized == rebuilt_hash(game.game)
+    ghost = game.agents[1]
+    ghost.movement_type = MovementTypes.SCATTER
+    assert game.game.state_hash() == rebuilt_hash(game.game)
+    ghost.movement_type = MovementTypes.CHASE
+    game.pacman.energized = False
+    assert game.game.state_hash() == start
+
+
+def test_state_hash_follows_pickups(game: GameManager):
+    """Test that eating a pickup changes the hash."""
+    start = game.game.state_hash()
+    node = next(node for node in game.game.nodes() if node.contains(pickups.Pickup))
+    game.game.remove_pickup(node)
+    assert game.game.state_hash() != start
+    assert game.game.state_hash() == rebuilt_hash(game.game)
+
+
+def test_agents_registered_when_placed(game: GameManager):
+    """Test that the placed agents report mode changes before the hash is built."""
+    for agent in game.agents:
+        assert agent.on_mode_change == game.game._toggle_mode
+    game.pacman.energized = True
+    energized = game.game.state_hash()
+    game.pacman.energized = False
+    assert game.game.state_hash() == rebuilt_hash(game.game) != energized
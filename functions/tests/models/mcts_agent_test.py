@@ -0,0 +1,111 @@
+"""Tests for the Monte Carlo Tree Search Pac-Man agent."""
+
+import contextlib
+
+import numpy as np
+import pytest
+from src import exceptions
+from src.models.agents.custom_agents.mcts import MCTSPacMan
+from src.models.topology import LevelTopology
+from src.services.game_manager import GameManager, RunConfiguration
+
+
+@pytest.fixture(scope="function")
+def game():
+    """Generate a game of the first level using a small search budget."""
+    game = GameManager(
+        1,
+        RunConfiguration.ANALYTIC,
+        custom_pacman=MCTSPacMan.with_budget(rollout_budget=20),
+        seed=0,
+    )
+    game.setup_game()
+    game.pacman.position = (13, 23)
+    yield game
+
+
+def test_with_budget():
+    """Test that a variant with a new budget can be created."""
+    agent = MCTSPacMan.with_budget(time_budget=0.01)
+    assert issubclass(agent, MCTSPacMan)
+    assert agent.time_budget == 0.01 and agent.rollout_budget is None
+    with pytest.raises(ValueError):
+        MCTSPacMan.with_budget()
+
+
+def test_move_is_adjacent(game: GameManager):
+    """Test that the chosen move is to a neighbouring space."""
+    move = game.pacman.cycle(1, game.game)
+    assert move in [(12, 23), (14, 23)]
+
+
+def test_statistics(game: GameManager):
+    """Test that the rollout budget is respected and reported."""
+    game.pacman.cycle(1, game.game)
+    stats = game.pacman.statistics()
+    assert stats["decisions"] == 1
+    assert stats["rollouts"] == 20
+    assert stats["rollouts_per_second"] > 0
+
+
+def move_pacman(game: GameManager, pos: tuple[int, int]) -> None:
+    """Move Pac-Man on the board, ignoring any collision."""
+    with contextlib.suppress(exceptions.CollisionException):
+        game.game.move_agent(game.pacman.position, pos, type(game.pacman))
+    game.pacman.position = pos
+
+
+def test_follows_corridor(game: GameManager):
+    """Test that no search takes place while following a corridor."""
+    move_pacman(game, (6, 10))
+    game.pacman.cycle(1, game.game)
+    move_pacman(game, game.pacman.move_history[-1])
+    game.pacman.cycle(2, game.game)
+    assert game.pacman.statistics()["decisions"] == 1
+
+
+def test_reuses_subtree(game: GameManager):
+    """Test that the subtree of the chosen corridor is searched again."""
+    game.pacman.cycle(1, game.game)
+    kept = game.pacman._root
+    visits = kept.visits
+    time = 2
+    while game.pacman.statistics()["decisions"] == 1:
+        move_pacman(game, game.pacman.move_history[-1])
+        game.pacman.cycle(time, game.game)
+        time += 1
+    assert game.game.topology().positions[kept.cell] == game.pacman.position
+    assert kept.visits == visits + 20
+
+
+def test_danger_triggers_search(game: GameManager):
+    """Test that a ghost close by makes Pac-Man reconsider his corridor."""
+    move_pacman(game, (6, 10))
+    game.pacman.cycle(1, game.game)
+    move_pacman(game, game.pacman.move_history[-1])
+    topology = game.game.topology()
+    near = topology.neighbours[topology.cell(game.pacman.position)][0]
+    blinky = type(game.agents[1])
+    start = game.game.find_node_by_entity(blinky)[0].position
+    with contextlib.suppress(exceptions.CollisionException):
+        game.game.move_agent(start, topology.positions[near], blinky)
+    game.pacman.cycle(2, game.game)
+    assert game.pacman.statistics()["decisions"] == 2
+
+
+def test_danger_zones_without_tables(game: GameManager):
+    """Test that the spaces near Pac-Man are found without the all-pairs tables."""
+    topology = LevelTopology(game.game)
+    game.pacman._topology = topology
+    game.pacman._zones = {}
+    # Pac-Man can never stand on a gate.
+    for cell, position in enumerate(topology.positions):
+        if cell in topology.gates:
+            continue
+        game.pacman.position = position
+        game.pacman._in_danger(game.game)
+    assert topology._distance is None
+    for cell, zone in game.pacman._zones.items():
+        column = topology.distance[:, cell]
+        expected = np.flatnonzero(column <= game.pacman.danger_distance).tolist()
+        assert sorted(zone) == expected
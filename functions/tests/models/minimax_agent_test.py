@@ -0,0 +1,78 @@
+"""Tests for the minimax and expectimax Pac-Man agents."""
+
+import math
+
+import pytest
+from src.models.agents.custom_agents.minimax import ExpectimaxPacMan, MinimaxPacMan
+from src.models.simulation_state import SimulationState
+from src.services.game_manager import GameManager, RunConfiguration
+
+
+def setup(agent: type[MinimaxPacMan]) -> GameManager:
+    """Generate a game of the first level using the given agent."""
+    game = GameManager(1, RunConfiguration.ANALYTIC, custom_pacman=agent, seed=0)
+    game.setup_game()
+    game.pacman.position = (13, 23)
+    return game
+
+
+@pytest.mark.parametrize("agent", [MinimaxPacMan, ExpectimaxPacMan])
+def test_move_is_adjacent(agent: type[MinimaxPacMan]):
+    """Test that the chosen move is to a neighbouring space."""
+    game = setup(agent)
+    move = game.pacman.cycle(1, game.game)
+    assert move in [(12, 23), (14, 23)]
+
+
+@pytest.mark.parametrize("agent", [MinimaxPacMan, ExpectimaxPacMan])
+def test_searches_with_game_generator(agent: type[MinimaxPacMan], monkeypatch):
+    """Test that searched ticks draw from the generator of the game."""
+    game = setup(agent)
+    generators = set()
+    apply = SimulationState.apply
+
+    def recording_apply(self, move, rng=None, ghost_moves=None):
+        generators.add(id(rng))
+        return apply(self, move, rng, ghost_moves)
+
+    monkeypatch.setattr(SimulationState, "apply", recording_apply)
+    game.pacman.cycle(1, game.game)
+    assert generators == {id(game.rng)}
+
+
+@pytest.mark.parametrize("agent", [MinimaxPacMan, ExpectimaxPacMan])
+def test_statistics(agent: type[MinimaxPacMan]):
+    """Test that the search reports its work."""
+    game = setup(agent)
+    game.pacman.cycle(1, game.game)
+    stats = game.pacman.statistics()
+    assert stats["decisions"] == 1
+    assert stats["expansions"] > 0
+    assert stats["expansions_per_second"] > 0
+    assert stats["average_depth"] >= 1
+    assert 0 <= stats["table_hit_rate"] <= 1
+
+
+def test_table_reused():
+    """Test that repeated positions are found in the transposition table."""
+    game = setup(MinimaxPacMan)
+    game.pacman.cycle(1, game.game)
+    assert game.pacman.statistics()["table_hit_rate"] > 0
+
+
+def test_table_values_follow_score():
+    """Test that stored values are reused for any score reaching a position."""
+    game = setup(MinimaxPacMan)
+    agent = game.pacman
+    state = SimulationState.from_graph(game.game)
+    agent._topology = state.topology
+    agent._deadline = math.inf
+    agent._root_score = state.score
+    value = agent._search(state, 3, -math.inf, math.inf)
+    richer = state.clone()
+    richer.score += 1000
+    hits = agent.hits
+    assert agent._search(richer, 3, -math.inf, math.inf) == value + 1000
+    assert agent.hits == hits + 1
+    richer.ghost_streak += 1
+    assert agent._key(richer) != agent._key(state)
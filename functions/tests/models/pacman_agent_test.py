@@ -3,7 +3,7 @@
 import pytest
 from src import exceptions
 from src.models.agents.agent import Agent
-from src.models.agents.pacman_agent import PacmanAgent
+from src.models.agents.pacman_agent import MAX_SCORE, PacmanAgent
 from src.models.pickups import Orange, PowerPellet
 from tests.mocks.mock_agent_test import mock_ghost
 
@@ -40,6 +40,15 @@ def test_valid_ghost_consume(pacman: PacmanAgent, ghost: Agent):
         pacman.handle_consume(ghost)
 
 
+def test_long_ghost_streak(pacman: PacmanAgent, ghost: Agent):
+    """Test that the score of a long streak of ghosts saturates."""
+    pacman.handle_consume(PowerPellet())
+    pacman.temp_ghost_counter = 1100
+    with pytest.raises(exceptions.GhostDiedException):
+        pacman.handle_consume(ghost)
+    assert pacman.score() == MAX_SCORE
+
+
 def test_invalid_ghost_consume(pacman: PacmanAgent, ghost: Agent):
     """Test Pac-man loses a life when he consumes a ghost without energizer."""
     with pytest.raises(exceptions.PacManDiedException):
@@ -68,3 +68,50 @@ def test_backwards(path_no_agents: Path):
     history: list[tuple[int, int]] = [(0, 0), (0, 1)]
     print(history[-2:])
     assert path_no_agents.backwards(history)
+
+
+def test_get_next_pos_keeps_route(path_no_agents: Path):
+    """Checks that consuming positions does not alter the shared route."""
+    nodes = path_no_agents.route
+    shared = Path(nodes)
+    path_no_agents.get_next_pos()
+    assert len(shared) == 8
+    assert shared.peek().position == (0, 0)
+    assert path_no_agents.peek().position == (0, 1)
+
+
+def test_path_cost_remaining(path_no_agents: Path):
+    """Checks that the cost only includes the remaining segment of the path."""
+    path_no_agents.cost()
+    path_no_agents.get_next_pos()
+    path_no_agents.get_next_pos()
+    assert path_no_agents.cost() == 30
+
+
+def test_safe_remaining_segment(path_with_agents: Path):
+    """Checks that only the nodes ahead of the agent are checked for safety."""
+    for _ in range(9):
+        path_with_agents.get_next_pos()
+    assert path_with_agents.is_safe()
+
+
+def test_unsafe_next_node(path_with_agents: Path):
+    """Checks that the next node of a partly consumed path is checked."""
+    for _ in range(8):
+        path_with_agents.get_next_pos()
+    assert not path_with_agents.is_safe()
+
+
+def test_safe_forward(path_with_agents: Path):
+    """Checks that only the given number of nodes ahead are checked."""
+    assert path_with_agents.is_safe(forward=7)
+    assert not path_with_agents.is_safe(forward=8)
+    path_with_agents.get_next_pos()
+    path_with_agents.get_next_pos()
+    assert not path_with_agents.is_safe(forward=7)
+
+
+def test_get_next_pos_empty():
+    """Checks that consuming an empty path raises an `IndexError`."""
+    with pytest.raises(IndexError):
+        Path([]).get_next_pos()
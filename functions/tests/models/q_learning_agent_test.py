@@ -0,0 +1,73 @@
+"""Tests for the Q-learning Pac-Man agent."""
+
+import numpy as np
+import pytest
+from src.models.agents.custom_agents.q_learning import (
+    DEFAULT_WEIGHTS,
+    FEATURES,
+    QLearningPacMan,
+    action_features,
+)
+from src.models.simulation_state import SimulationState
+from src.services.game_manager import GameManager, RunConfiguration
+
+
+@pytest.fixture(scope="function")
+def game():
+    """Generate a game of the first level using the Q-learning agent."""
+    game = GameManager(
+        1, RunConfiguration.ANALYTIC, custom_pacman=QLearningPacMan, seed=0
+    )
+    game.setup_game()
+    game.pacman.position = (13, 23)
+    yield game
+
+
+def test_action_features(game: GameManager):
+    """Test that a feature vector is built for every move."""
+    state = SimulationState.from_graph(game.game)
+    moves = state.pacman_moves()
+    features = action_features(state, moves)
+    assert features.shape == (len(moves), len(FEATURES))
+    assert (features[:, FEATURES.index("bias")] == 1).all()
+    eats = features[:, FEATURES.index("eats_pickup")]
+    nearest = features[:, FEATURES.index("nearest_pickup")]
+    for i, move in enumerate(moves):
+        assert eats[i] == (state.pickups[move] != 0)
+        assert (nearest[i] == 0) == (state.pickups[move] != 0)
+
+
+def test_move_is_adjacent(game: GameManager):
+    """Test that the chosen move is to a neighbouring space."""
+    move = game.pacman.cycle(1, game.game)
+    assert move in [(12, 23), (14, 23)]
+    assert game.pacman.statistics()["decisions"] == 1
+
+
+def test_decisions_match_state(game: GameManager):
+    """Test that features derived from the graph give the same moves as a state."""
+
+    class Checked(QLearningPacMan):
+        def _perceive(self, time, level):
+            super()._perceive(time, level)
+            state = SimulationState.from_graph(level, time)
+            moves = state.pacman_moves()
+            values = action_features(state, moves) @ self.weights()
+            assert self._next_move == moves[int(np.argmax(values))]
+
+    game = GameManager(1, RunConfiguration.ANALYTIC, custom_pacman=Checked, seed=0)
+    game.setup_game()
+    game.running = True
+    while game.running and game.timer < 200:
+        game.tick()
+    assert game.pacman.statistics()["decisions"] > 0
+
+
+def test_weights_loaded_lazily(tmp_path):
+    """Test that weights are read from the file on first use."""
+    file = str(tmp_path / "weights.npz")
+    np.savez_compressed(file, weights=np.arange(len(FEATURES), dtype=float))
+    agent = type("Agent", (QLearningPacMan,), {"weights_file": file})
+    assert list(agent.weights()) == list(range(len(FEATURES)))
+    missing = type("Agent", (QLearningPacMan,), {"weights_file": file + ".missing"})
+    assert (missing.weights() == DEFAULT_WEIGHTS).all()
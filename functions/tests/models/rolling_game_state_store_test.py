@@ -0,0 +1,54 @@
+"""Tests for the `RollingGameStateStore`."""
+
+import pytest
+from src.models.game_state import GameState
+from src.models.rolling_game_state_store import RollingGameStateStore
+
+
+def _state(time: int) -> GameState:
+    """Returns a state whose board changes a single space every tick."""
+    board = [[0] * 4 for _ in range(3)]
+    board[time % 3][time % 4] = 44
+    return GameState(time, board, time % 5 == 0, time * 10)
+
+
+def test_window_bounds_memory():
+    """Test that only the latest states are kept in memory."""
+    with RollingGameStateStore(window=5, keyframe_interval=4) as store:
+        for time in range(50):
+            store.add(_state(time))
+        assert [state.time for state in store.get()] == list(range(45, 50))
+        assert store.count == 50
+
+
+def test_reconstruct_any_tick(tmp_path):
+    """Test that every past tick is rebuilt exactly from the spill file."""
+    path = tmp_path / "history.jsonl"
+    with RollingGameStateStore(window=3, keyframe_interval=7, path=str(path)) as store:
+        for time in range(40):
+            store.add(_state(time))
+        for time in range(40):
+            state = store.reconstruct(time)
+            expected = _state(time)
+            assert state.time == time
+            assert state.board_state == expected.board_state
+            assert state.energised == expected.energised
+            assert state.score == expected.score
+        assert [state.time for state in store.history()] == list(range(40))
+    assert path.exists()
+
+
+def test_reconstruct_before_start():
+    """Test that a tick before the first state cannot be rebuilt."""
+    with RollingGameStateStore(window=2) as store:
+        store.add(_state(3))
+        with pytest.raises(KeyError):
+            store.reconstruct(2)
+
+
+def test_add_out_of_order():
+    """Test that a state earlier than the latest is rejected."""
+    with RollingGameStateStore(window=2) as store:
+        store.add(_state(5))
+        with pytest.raises(ValueError):
+            store.add(_state(4))
@@ -0,0 +1,149 @@
+"""Tests for the `SimulationState`."""
+
+import random
+
+import pytest
+from src import exceptions
+from src.models.agents.custom_agents.informed import InformedPacMan
+from src.models.agents.custom_agents.random import RandomPacMan
+from src.models.movement_types import MovementTypes
+from src.models.simulation_state import SimulationState
+from src.services.game_manager import GameManager, RunConfiguration
+
+
+@pytest.fixture(scope="function")
+def state():
+    """Generate the state at the start of the first level."""
+    game = GameManager(1, RunConfiguration.ANALYTIC)
+    game.setup_game()
+    yield SimulationState.from_graph(game.game)
+
+
+def fields(state: SimulationState) -> tuple:
+    """Collect every value of the state which a tick can change."""
+    return (
+        bytes(state.pickups),
+        state.remaining,
+        state.pacman,
+        tuple(state.ghost_cells),
+        tuple(state.ghost_modes),
+        tuple(state.ghost_countdowns),
+        state.score,
+        state.energized,
+        state.lives,
+        state.time,
+    )
+
+
+def test_from_graph(state: SimulationState):
+    """Test that the state matches the start of the level."""
+    assert state.remaining == state.total_pickups == 244
+    assert state.topology.positions[state.pacman] == (13, 23)
+    assert state.ghost_modes[0] == MovementTypes.CHASE.value
+    assert state.ghost_modes[1] == MovementTypes.HOMEBOUND.value
+
+
+def test_clone_is_independent(state: SimulationState):
+    """Test that changing a copy does not change the original."""
+    original = fields(state)
+    copy = state.clone()
+    copy.apply(copy.pacman_moves()[0])
+    assert fields(state) == original
+    assert fields(copy) != original
+
+
+def test_apply_consumes_pickup(state: SimulationState):
+    """Test that Pac-Man scores when moving onto a pickup."""
+    move = state.topology.cell((12, 23))
+    state.apply(move)
+    assert state.score == 10
+    assert state.remaining == 243
+    assert state.pickups[move] == 0
+
+
+def test_release_ghost(state: SimulationState):
+    """Test that Pinky leaves the ghost house once a pickup is consumed."""
+    state.apply(state.topology.cell((12, 23)))
+    assert state.ghost_modes[1] == MovementTypes.CHASE.value
+    assert state.ghost_cells[1] == state.ghosts[1].respawn
+    # Pinky is held on the respawn point until another pickup is consumed.
+    state.apply(state.topology.cell((13, 23)))
+    assert state.ghost_cells[1] == state.ghosts[1].respawn
+    assert state.ghost_modes[2] == MovementTypes.HOMEBOUND.value
+
+
+@pytest.mark.parametrize(
+    "agent, seed", [(RandomPacMan, seed) for seed in range(6)] + [(InformedPacMan, 0)]
+)
+def test_matches_game_manager(agent, seed):
+    """Test that replaying a game's moves gives the same game at every tick."""
+    game = GameManager(1, RunConfiguration.ANALYTIC, custom_pacman=agent, seed=seed)
+    game.setup_game()
+    state = SimulationState.from_graph(game.game)
+    topology = state.topology
+    game.running = True
+    while game.running and game.timer < 300:
+        game.tick()
+        positions = [
+            game.game.find_node_by_entity(type(ag))[0].position for ag in game.agents
+        ]
+        state.apply(topology.cell(positions[0]))
+        assert state.score == game.pacman.score()
+        if game.running:
+            cells = [state.pacman] + state.ghost_cells
+            assert [topology.positions[cell] for cell in cells] == positions
+            assert state.remaining == game.game.remaining_pickups()
+    assert state.lost() == game.lost()
+
+
+def test_undo(state: SimulationState):
+    """Test that undoing every applied tick restores the original state."""
+    rng = random.Random(0)
+    original = fields(state)
+    records = []
+    while not state.is_terminal():
+        records.append(state.apply(rng.choice(state.pacman_moves()), rng))
+    while len(records) > 0:
+        state.undo(records.pop())
+    assert fields(state) == original
+
+
+def test_pacman_caught(state: SimulationState):
+    """Test that the game is lost when Pac-Man is caught."""
+    state.ghost_cells[0] = state.pacman_moves()[0]
+    state.apply(state.pacman_moves()[0])
+    assert state.lost() and state.is_terminal()
+
+
+def test_invalid_move(state: SimulationState):
+    """Test that Pac-Man cannot move to a cell which is not adjacent."""
+    with pytest.raises(exceptions.InvalidMoveException):
+        state.apply(0)
+
+
+def test_state_hash_follows_undo(state: SimulationState):
+    """Test that the hash changes with a tick and is restored by undoing it."""
+    original = state.state_hash()
+    record = state.apply(state.topology.cell((12, 23)))
+    assert state.state_hash() != original
+    state.undo(record)
+    assert state.state_hash() == original
+
+
+def test_state_hash_matches_equal_states(state: SimulationState):
+    """Test that equal states share a hash, regardless of score or time."""
+    copy = state.clone()
+    copy.score += 100
+    copy.time += 5
+    assert copy.state_hash() == state.state_hash()
+    copy.energized = True
+    assert copy.state_hash() != state.state_hash()
+
+
+def test_chosen_ghost_moves(state: SimulationState):
+    """Test that ghosts can be moved to chosen cells."""
+    blinky = state.ghost_cells[0]
+    choice = state.ghost_moves(0)[-1]
+    state.apply(state.pacman_moves()[0], ghost_moves=(choice, -1, -1, -1))
+    assert state.ghost_cells[0] == choice != blinky
+    assert state.ghost_moves(1) == (-1,)
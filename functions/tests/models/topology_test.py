@@ -0,0 +1,110 @@
+"""Tests for the `LevelTopology`."""
+
+import numpy as np
+import pytest
+from src.models import topology as topology_module
+from src.models.topology import UNREACHABLE, LevelTopology
+from src.utils import level_utils
+from tests.mocks.mock_graph_test import mock_graph
+
+
+@pytest.fixture(scope="module")
+def graph():
+    """Generate the graph of the first level."""
+    yield mock_graph()
+
+
+@pytest.fixture(scope="module")
+def topology(graph):
+    """Generate the topology of the first level."""
+    yield LevelTopology(graph)
+
+
+def test_cells(topology: LevelTopology):
+    """Test that every walkable space is given a cell in row-major order."""
+    assert len(topology) == 312
+    assert topology.positions[0] == (1, 1)
+    assert topology.cell((1, 1)) == 0
+
+
+def test_gates_not_enterable(topology: LevelTopology):
+    """Test that no cell can be moved onto a gate."""
+    assert len(topology.gates) == 2
+    for neighbours in topology.neighbours:
+        assert not topology.gates.intersection(neighbours)
+
+
+def test_teleporters(topology: LevelTopology):
+    """Test that the teleporters are connected."""
+    first, second = topology.teleporters
+    assert topology.distance[first, second] == 1
+
+
+def test_distance(topology: LevelTopology):
+    """Test that distances match the length of the shortest path."""
+    assert topology.distance[topology.cell((1, 1)), topology.cell((6, 1))] == 5
+    assert topology.distance[topology.cell((1, 1)), topology.cell((13, 12))] == (
+        UNREACHABLE
+    )
+
+
+def test_next_hop_matches_shortest_path(graph, topology: LevelTopology):
+    """Test that the next hop is the first step of `Graph.shortest_path_to`."""
+    for start, goal in [((13, 11), (13, 23)), ((1, 1), (26, 29)), ((6, 14), (21, 5))]:
+        path = graph.shortest_path_to(start, goal)
+        expected = topology.cell(path.route[1].position)
+        assert topology.step_towards(topology.cell(start), topology.cell(goal)) == (
+            expected
+        )
+
+
+def test_route_matches_path_search(graph, topology: LevelTopology):
+    """Test that routes are the first shortest path found by the path search."""
+    for start, goal in [((13, 11), (9, 14)), ((1, 1), (6, 5)), ((26, 29), (21, 26))]:
+        path = min(graph.find_paths_between(start, goal), key=len)
+        route = topology.route(topology.cell(start), topology.cell(goal))
+        assert [topology.positions[cell] for cell in route] == [
+            node.position for node in path.route
+        ]
+    assert topology.route(0, 0) == (0,)
+    assert topology.route(0, topology.cell((13, 12))) == ()
+
+
+def test_tables_built_on_demand(graph):
+    """Test that searching from single cells does not build the all-pairs tables."""
+    topology = LevelTopology(graph)
+    source, target = topology.cell((1, 1)), topology.cell((26, 29))
+    step = topology.step_towards(source, target)
+    distances = topology.distances_from(source)
+    assert topology._distance is None and topology._next_hop is None
+    assert distances == topology.distance[source].tolist()
+    assert (topology.distance_row(source) == topology.distance[source]).all()
+    assert step == topology.next_hop[source, target]
+    assert topology.dtype is np.int16
+
+
+def test_large_level_tables():
+    """Test that levels with more cells than an `int16` holds use wider tables."""
+    width = 33000
+    level = [[99] * width, [88] + [1] * (width - 2) + [88], [99] * width]
+    topology = LevelTopology(level_utils.array_to_graph(level))
+    assert topology.dtype is np.int32
+    assert topology.unreachable > len(topology)
+    assert topology.step_towards(0, len(topology) - 1) == len(topology) - 1
+    assert max(topology.distances_from(0)) == width // 2
+    assert topology.distance_row(0).dtype == np.int32
+    assert topology._distance is None
+    assert "distance" not in topology.to_arrays()
+
+
+def test_compiled_tables_limit(graph, monkeypatch):
+    """Test that the all-pairs tables are only compiled for small levels."""
+    topology = LevelTopology(graph)
+    assert "distance" in topology.to_arrays()
+    monkeypatch.setattr(topology_module, "ALL_PAIRS_LIMIT", len(topology) - 1)
+    arrays = LevelTopology(graph).to_arrays()
+    assert "distance" not in arrays and "next_hop" not in arrays
+    loaded = LevelTopology.from_arrays(arrays)
+    assert loaded._distance is None
+    assert (loaded.distance == topology.distance).all()
+    assert (loaded.next_hop == topology.next_hop).all()
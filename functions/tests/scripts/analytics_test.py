@@ -0,0 +1,33 @@
+"""Tests for the analytics tool."""
+
+from src.models.agents.custom_agents.inactive import InactivePacMan
+from src.scripts.analytics import PacmanAnalytics
+from src.services import game_manager
+from src.services.results_store import ResultsStore
+
+
+def test_sweep_resumes(tmp_path):
+    """Test that a sweep continued from its file only plays the missing runs."""
+    path = str(tmp_path / "results.csv")
+    first = PacmanAnalytics(runs=2, output_file=path)
+    assert ResultsStore(path).count == 2 * len(first.agents)
+    second = PacmanAnalytics(runs=3, output_file=path)
+    rows = list(ResultsStore(path).rows())
+    assert len(rows) == 3 * len(second.agents)
+    assert len({(row["agent"], row["seed"]) for row in rows}) == len(rows)
+    for agent, data in second.results.items():
+        assert data["score"].count == 3
+
+
+def test_capped_runs_recorded(tmp_path, monkeypatch):
+    """Test that games stopped at the tick limit are recorded as capped."""
+    monkeypatch.setitem(game_manager.GHOST_CONFIGURATIONS, "classic", ())
+    path = str(tmp_path / "results.csv")
+    analytics = PacmanAnalytics(
+        runs=1, baseline=InactivePacMan, output_file=path, max_ticks=20
+    )
+    # Without ghosts no game is lost, and none can be won in 20 ticks.
+    for row in ResultsStore(path).rows():
+        assert row["capped"] and not row["won"]
+        assert row["ticks"] == 20
+    assert analytics.results["InactivePacMan"]["capped"].mean == 1.0
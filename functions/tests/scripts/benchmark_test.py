@@ -0,0 +1,49 @@
+"""Tests for the benchmarking and profiling tools."""
+
+from src.models.agents.custom_agents.informed import InformedPacMan
+from src.models.agents.custom_agents.random import RandomPacMan
+from src.scripts.benchmark import play, profile_game, run_benchmark
+
+
+def test_play_times_each_tick():
+    """Test that a latency is recorded for every tick up to the limit."""
+    game, latencies = play(1, RandomPacMan, 0, max_ticks=20)
+    assert 0 < len(latencies) <= 20
+    assert all(latency > 0 for latency in latencies)
+    assert game.timer <= len(latencies)
+
+
+def test_play_repeatable():
+    """Test that the same seed plays the same game."""
+    first, _ = play(1, RandomPacMan, 3, max_ticks=30)
+    second, _ = play(1, RandomPacMan, 3, max_ticks=30)
+    assert first.pacman.score() == second.pacman.score()
+    assert first.timer == second.timer
+
+
+def test_benchmark_percentiles():
+    """Test that the benchmark reports every measurement of each pairing."""
+    results = run_benchmark([RandomPacMan], [1], seeds=2, max_ticks=10)
+    result = results["RandomPacMan level 1"]
+    assert result["games_per_second"] > 0
+    assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+    assert result["peak_rss_mb"] > 0
+
+
+def test_play_rolling_history():
+    """Test that a benchmarked game can record a bounded history."""
+    game, latencies = play(1, RandomPacMan, 0, max_ticks=30, history_window=5)
+    assert len(game.state_store.get()) == 5
+    assert game.state_store.reconstruct(0).time == 0  # type: ignore
+
+
+def test_profile_writes_files(tmp_path):
+    """Test that the report and the folded stacks are written."""
+    report, stacks = profile_game(
+        1, InformedPacMan, 0, str(tmp_path / "profile"), max_ticks=10
+    )
+    with open(report) as file:
+        assert "InformedPacMan on level 1" in file.read()
+    with open(stacks) as file:
+        for line in file:
+            assert int(line.rsplit(" ", 1)[1]) > 0
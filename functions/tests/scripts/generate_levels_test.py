@@ -0,0 +1,45 @@
+"""Tests for the level generator."""
+
+import pytest
+from src.scripts.generate_levels import generate_level, generate_levels
+from src.services import level_handler
+from src.utils import level_utils
+
+
+@pytest.mark.parametrize("width, height", [(28, 31), (56, 62)])
+def test_generated_level_converts(width: int, height: int):
+    """Test that a generated level builds a connected graph of its size."""
+    level = generate_level(width, height, seed=0)
+    graph = level_utils.array_to_graph(level["map"])
+    assert (graph.width, graph.height) == (width, height)
+    assert level_utils.graph_to_array(graph) == level["map"]
+
+
+def test_no_dead_ends():
+    """Test that every space other than a teleporter leads two ways."""
+    graph = level_utils.array_to_graph(generate_level(56, 62, 0, seed=1)["map"])
+    for node in graph.nodes():
+        assert len(graph.get_adjacent(node)) >= 2
+
+
+def test_repeatable():
+    """Test that the same seed generates the same level."""
+    assert generate_level(40, 40, seed=2) == generate_level(40, 40, seed=2)
+    assert generate_level(40, 40, seed=2) != generate_level(40, 40, seed=3)
+
+
+def test_too_small():
+    """Test that levels too small to hold the ghost house are refused."""
+    with pytest.raises(ValueError):
+        generate_level(10, 10)
+
+
+def test_added_levels_routed(level_caches):
+    """Test that the homes and respawn points of an added level are routed."""
+    level_handler.add_levels(generate_levels([(56, 62)], seed=4, first_level=901))
+    routes = level_handler.get_ghost_routes(901)
+    homes = level_handler.get_homes(901)
+    assert len(routes.exits) == 5
+    for home in homes.values():
+        for pos in home:
+            assert pos in routes.topology.index
@@ -0,0 +1,41 @@
+"""Tests for replaying games from their action logs."""
+
+import pytest
+from src.scripts.replay import record_game, replay, verify, verify_file
+from src.services import game_manager
+
+
+@pytest.mark.parametrize("agent", ["InformedPacMan", "RandomPacMan"])
+def test_replay_matches(agent):
+    """Test that a recorded game replays exactly."""
+    log = record_game(1, agent, seed=11)
+    result = verify(log)
+    assert result == {"match": True, "divergence": None, "differences": {}}
+
+
+def test_replay_detects_divergence():
+    """Test that a changed move and a changed end state are reported."""
+    log = record_game(1, "RandomPacMan", seed=4)
+    log.moves[log.agents * 3] = (log.moves[log.agents * 3] + 1) % 4
+    log.end["score"] += 10
+    result = verify(log)
+    assert not result["match"]
+    assert result["divergence"] == 3
+    assert result["differences"]["score"][0] == log.end["score"]
+
+
+def test_replay_rebuilds_history():
+    """Test that the full history of a game is rebuilt from its log."""
+    game = game_manager.GameManager(
+        1, game_manager.RunConfiguration.SERVER, seed=2, record_actions=True
+    )
+    history = game.game_loop()
+    replayed = replay(game.action_log, game_manager.RunConfiguration.SERVER)
+    assert replayed.state_store.to_json() == history
+
+
+def test_verify_file(tmp_path):
+    """Test that a log written to a file is replayed from it."""
+    log_file = str(tmp_path / "log.json")
+    record_game(1, seed=6, output_file=log_file)
+    assert verify_file(log_file)["match"]
@@ -0,0 +1,23 @@
+"""Tests for the tournament scheduler."""
+
+from src.scripts.tournament import Tournament
+
+
+def test_matrix():
+    """Test that every combination of level, agent, ghosts and seed is played."""
+    tournament = Tournament(
+        ["RandomPacMan", "MCTSPacMan"], [1], ["classic", "blinky"], seeds=3
+    )
+    assert len(tournament.matches) == 12
+    assert tournament.cost((1, "MCTSPacMan", "classic", 0)) > tournament.cost(
+        (1, "RandomPacMan", "classic", 0)
+    )
+
+
+def test_leaderboard():
+    """Test that agents are ranked by win rate and then score."""
+    tournament = Tournament(["RandomPacMan", "InactivePacMan"], [1], seeds=2)
+    leaderboard = tournament.run()
+    assert len(tournament.results) == 4
+    assert [row["agent"] for row in leaderboard] == ["RandomPacMan", "InactivePacMan"]
+    assert all(row["games"] == 2 for row in leaderboard)
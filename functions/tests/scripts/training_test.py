@@ -0,0 +1,24 @@
+"""Tests for the training tool."""
+
+import numpy as np
+from src.models.agents.custom_agents.q_learning import DEFAULT_WEIGHTS, FEATURES
+from src.scripts.training import QLearningTrainer
+
+
+def test_play_updates_weights():
+    """Test that playing a game changes the weights."""
+    trainer = QLearningTrainer(seed=0, max_ticks=50)
+    result = trainer.play()
+    assert 0 < result["time"] <= 50
+    assert not np.array_equal(trainer.weights, DEFAULT_WEIGHTS)
+
+
+def test_save(tmp_path):
+    """Test that the weights are saved with the names of the features."""
+    trainer = QLearningTrainer(seed=0, max_ticks=10)
+    trainer.train(1)
+    file = str(tmp_path / "weights.npz")
+    trainer.save(file)
+    with np.load(file) as data:
+        assert list(data["features"]) == list(FEATURES)
+        assert np.array_equal(data["weights"], trainer.weights)
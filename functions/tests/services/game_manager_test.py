@@ -0,0 +1,135 @@
+"""Tests for the `GameManager`."""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.exceptions import InvalidGraphConfigurationException
+from src.models.agents.custom_agents.inactive import InactivePacMan
+from src.models.agents.custom_agents.random import RandomPacMan
+from src.models.agents.ghost_agent import GhostAgent
+from src.models.agents.placeholder_agent import PlaceholderAgent
+from src.models.decision_cache import DecisionCache
+from src.models.environment import Gate
+from src.services.game_manager import GameManager, RunConfiguration
+
+
+def test_analytic_records_no_history():
+    """Test that analytic runs do not take snapshots of the board."""
+    game = GameManager(1, RunConfiguration.ANALYTIC, custom_pacman=InactivePacMan)
+    result = game.game_loop()
+    assert len(game.state_store.get()) == 0
+    assert set(result.keys()) == {"time_game", "score"}
+
+
+def test_rolling_history_matches_full_history():
+    """Test that a game with a rolling history rebuilds every recorded state."""
+    full = GameManager(1, RunConfiguration.SERVER, custom_pacman=InactivePacMan)
+    states = full.game_loop()["states"]
+    rolling = GameManager(
+        1,
+        RunConfiguration.SERVER,
+        custom_pacman=InactivePacMan,
+        history_window=4,
+        keyframe_interval=10,
+    )
+    assert len(rolling.game_loop()["states"]) == 4
+    rebuilt = list(rolling.state_store.history())  # type: ignore
+    assert [state.board_state for state in rebuilt] == [
+        state["state"] for state in states
+    ]
+
+
+def test_series_records_scalars():
+    """Test that series runs record the score and energised state of every tick."""
+    game = GameManager(1, RunConfiguration.SERIES, custom_pacman=InactivePacMan)
+    result = game.game_loop()
+    assert len(game.state_store.get()) == 0
+    assert len(result["scores"]) == len(result["energised"]) == result["time_game"] + 1
+
+
+def test_ghost_configuration():
+    """Test that only the configured ghosts are placed on the board."""
+    game = GameManager(1, RunConfiguration.ANALYTIC, ghosts="blinky")
+    game.setup_game()
+    assert [agent.name() for agent in game.agents[1:]] == ["Blinky"]
+    assert len(game.game.find_node_by_entity(GhostAgent)) == 1
+    with pytest.raises(InvalidGraphConfigurationException):
+        game.game.find_node_by_entity(PlaceholderAgent)
+
+
+def test_max_ticks_stops_endless_game():
+    """Test that a game which can never end is stopped at the tick limit."""
+    game = GameManager(
+        1,
+        RunConfiguration.ANALYTIC,
+        custom_pacman=InactivePacMan,
+        ghosts="none",
+        max_ticks=50,
+    )
+    game.game_loop()
+    assert game.timer == 50
+    assert game.capped
+
+
+def test_max_ticks_not_reached():
+    """Test that a game which ends before the tick limit is not capped."""
+    game = GameManager(1, RunConfiguration.ANALYTIC, seed=0, max_ticks=5000)
+    game.game_loop()
+    assert game.lost() or game.win()
+    assert not game.capped
+
+
+def test_respawn_onto_gate():
+    """Test that a consumed ghost is placed on a respawn point holding the gate."""
+    game = GameManager(1, RunConfiguration.ANALYTIC)
+    game.setup_game()
+    pinky = game.agents[2]
+    assert game.game.find_node_by_pos(game.respawn["pinky"]).contains(Gate)
+    start = game.game.find_node_by_entity(type(pinky))[0].position
+    game.respawn_ghost(pinky, start)
+    node = game.game.find_node_by_entity(type(pinky))[0]
+    assert node.position == game.respawn["pinky"]
+    assert node.contains(Gate)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_decision_cache_plays_same_game(seed):
+    """Test that agents sharing a decision cache make the same moves."""
+    cache = DecisionCache(1000)
+    logs = []
+    for decision_cache in (None, cache, cache):
+        game = GameManager(
+            1,
+            RunConfiguration.ANALYTIC,
+            seed=seed,
+            record_actions=True,
+            decision_cache=decision_cache,
+        )
+        game.game_loop()
+        logs.append(game.action_log.to_json())  # type: ignore
+    assert logs[0] == logs[1] == logs[2]
+    assert cache.hits > cache.misses > 0
+
+
+def _play(seed: int) -> dict:
+    """Plays a seeded game with a random Pac-Man, returning its action log."""
+    game = GameManager(
+        1,
+        RunConfiguration.ANALYTIC,
+        custom_pacman=RandomPacMan,
+        seed=seed,
+        record_actions=True,
+    )
+    game.game_loop()
+    return game.action_log.to_json()  # type: ignore
+
+
+def test_seeded_games_repeat_across_threads():
+    """Test that seeded games running at once play as they do alone."""
+    seeds = [0, 1, 2, 3] * 2
+    sequential = {seed: _play(seed) for seed in seeds[:4]}
+    random.seed(99)
+    with ThreadPoolExecutor(max_workers=len(seeds)) as executor:
+        concurrent = list(executor.map(_play, seeds))
+    assert concurrent == [sequential[seed] for seed in seeds]
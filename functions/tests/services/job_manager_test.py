@@ -0,0 +1,77 @@
+"""Tests for the JobManager."""
+
+import pytest
+from src import exceptions
+from src.services import game_manager
+from src.services.job_manager import JobManager, JobStatus
+
+
+def test_job_completes():
+    """Test that a submitted game runs in the background and returns its result."""
+    jobs = JobManager(max_workers=1)
+    job = jobs.submit(1, "InactivePacMan", seed=0)
+    job.future.result(timeout=60)
+    polled = jobs.get(job.id)
+    assert polled is job and polled.status == JobStatus.COMPLETE
+    json = polled.to_json()
+    assert json["progress"]["time"] == len(json["result"]["states"]) - 1
+    assert json["progress"]["score"] == json["result"]["states"][-1]["score"]
+
+
+def test_job_fails():
+    """Test that a game which cannot be run is reported as failed."""
+    jobs = JobManager(max_workers=1)
+    job = jobs.submit(123456, "InactivePacMan")
+    job.future.result(timeout=60)
+    assert job.status == JobStatus.FAILED
+    assert "error" in job.to_json()
+
+
+def test_unknown_agent():
+    """Test that an unknown agent is rejected before a job is created."""
+    jobs = JobManager(max_workers=1)
+    with pytest.raises(KeyError):
+        jobs.submit(1, "UnknownPacMan")
+    assert len(jobs.jobs) == 0
+
+
+def test_search_agent_not_served():
+    """Test that agents which are not served through the API are rejected."""
+    jobs = JobManager(max_workers=1)
+    with pytest.raises(KeyError):
+        jobs.submit(1, "MCTSPacMan")
+    assert len(jobs.jobs) == 0
+
+
+def test_endless_game_capped(monkeypatch):
+    """Test that a game which never ends is stopped at the tick limit."""
+    monkeypatch.setattr(game_manager, "API_MAX_TICKS", 20)
+    monkeypatch.setitem(game_manager.GHOST_CONFIGURATIONS, "classic", ())
+    jobs = JobManager(max_workers=1)
+    job = jobs.submit(1, "InactivePacMan", seed=0)
+    job.future.result(timeout=60)
+    json = job.to_json()
+    assert json["status"] == "complete"
+    assert json["capped"] and json["progress"]["time"] == 20
+
+
+def test_finished_jobs_expire():
+    """Test that finished jobs are removed once their time to live has passed."""
+    jobs = JobManager(max_workers=1, ttl=0)
+    job = jobs.submit(1, "InactivePacMan")
+    job.future.result(timeout=60)
+    assert jobs.get(job.id) is None
+
+
+def test_store_is_bounded():
+    """Test that finished jobs make room for new jobs and running jobs do not."""
+    jobs = JobManager(max_workers=1, max_jobs=1)
+    first = jobs.submit(1, "InactivePacMan")
+    first.future.result(timeout=60)
+    second = jobs.submit(1, "InactivePacMan")
+    assert jobs.get(first.id) is None
+    second.future.result(timeout=60)
+
+    jobs.jobs[second.id].status = JobStatus.RUNNING
+    with pytest.raises(exceptions.JobQueueFullException):
+        jobs.submit(1, "InactivePacMan")
@@ -1,8 +1,13 @@
 """Tests for the LevelHandler."""
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
 from src.exceptions import LevelNotFoundException
+from src.models.topology import LevelTopology
 from src.services import level_handler
+from src.utils import level_utils
 
 
 def test_get_level():
@@ -35,3 +40,43 @@ def test_get_overview():
 
 def test_get_ghost_home():
     assert level_handler.get_home(1, "Blinky") == [(1, 1), (1, 6), (5, 5), (5, 1)]
+
+
+def test_compiled_topology(tmp_path, level_caches):
+    """Test that a compiled level loads the same topology as the map builds."""
+    level_handler.compile_level(1, str(tmp_path))
+    level_handler._topologies.clear()
+    compiled = level_handler.get_topology(1, str(tmp_path))
+    built = LevelTopology(level_utils.array_to_graph(level_handler.get_map(1)))
+    assert compiled.positions == built.positions
+    assert compiled.neighbours == built.neighbours
+    assert compiled.gates == built.gates
+    assert compiled.teleporters == built.teleporters
+    assert (compiled.distance == built.distance).all()
+    assert (compiled.next_hop == built.next_hop).all()
+    for (cell, first), corridor in compiled._corridors.items():
+        assert built.corridor(cell, first) == corridor
+    assert level_handler.get_topology(1, str(tmp_path)) is compiled
+
+
+def test_stale_compiled_level(tmp_path, level_caches):
+    """Test that a compiled level is ignored when the level has changed."""
+    path = level_handler.compile_level(1, str(tmp_path))
+    with np.load(path) as compiled:
+        arrays = dict(compiled)
+    arrays["source_hash"] = np.array("stale")
+    arrays["distance"] = np.zeros_like(arrays["distance"])
+    np.savez_compressed(path, **arrays)
+    level_handler._topologies.clear()
+    topology = level_handler.get_topology(1, str(tmp_path))
+    assert topology.distance.max() > 0
+
+
+def test_topology_loaded_once_across_threads(level_caches):
+    """Test that threads loading a level at once share a single topology."""
+    level_handler._topologies.clear()
+    level_handler._ghost_routes.clear()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        routes = list(executor.map(level_handler.get_ghost_routes, [1] * 16))
+    assert all(table is routes[0] for table in routes)
+    assert len(level_handler._topologies) == 1
@@ -0,0 +1,60 @@
+"""Tests for the `ResultsStore`."""
+
+from src.services.results_store import COLUMNS, ResultsStore
+
+RESULT = {
+    "seed": 0,
+    "agent": "InformedPacMan",
+    "level": 1,
+    "score": 550,
+    "ticks": 58,
+    "won": False,
+    "capped": False,
+    "time_setup": 0.01,
+    "time_real": 0.2,
+    "time_teardown": 0.001,
+}
+
+
+def test_write_and_read(tmp_path):
+    """Test that written runs are read back with their types."""
+    path = str(tmp_path / "results.csv")
+    with ResultsStore(path) as store:
+        assert store.write(RESULT) == 0
+        assert store.write({**RESULT, "seed": 1, "won": True}) == 1
+    rows = list(ResultsStore(path).rows())
+    assert rows[0] == {**RESULT, "run_id": 0}
+    assert rows[1]["won"] is True
+    assert ResultsStore(path).completed() == {
+        ("InformedPacMan", 1, 0),
+        ("InformedPacMan", 1, 1),
+    }
+
+
+def test_resume_after_partial_row(tmp_path):
+    """Test that a row cut short by a crash is dropped before appending."""
+    path = str(tmp_path / "results.csv")
+    with ResultsStore(path) as store:
+        store.write(RESULT)
+    with open(path, "a") as file:
+        file.write("1,1,InformedPac")
+    with ResultsStore(path) as store:
+        assert store.count == 1
+        assert store.write({**RESULT, "seed": 1}) == 1
+    assert [row["seed"] for row in ResultsStore(path).rows()] == [0, 1]
+
+
+def test_file_without_capped_column(tmp_path):
+    """Test that files written before runs were marked capped are still read."""
+    path = tmp_path / "results.csv"
+    columns = [column for column in COLUMNS if column != "capped"]
+    row = {**RESULT, "run_id": 0}
+    path.write_text(
+        ",".join(columns) + "\n" + ",".join(str(row[c]) for c in columns) + "\n"
+    )
+    with ResultsStore(str(path)) as store:
+        store.write({**RESULT, "seed": 1, "capped": True})
+    rows = list(ResultsStore(str(path)).rows())
+    assert rows[0] == row
+    assert [row["seed"] for row in rows] == [0, 1]
+    assert not rows[1]["capped"]
@@ -0,0 +1,47 @@
+"""Tests for the serialization service."""
+
+import gzip
+import json
+
+from src.services import serialization, solution_store
+
+
+def test_negotiate():
+    """Test that encodings are chosen from the request headers."""
+    assert serialization.negotiate(None, None) == (serialization.JSON, False)
+    assert serialization.negotiate("*/*", "gzip, deflate") == (
+        serialization.JSON,
+        True,
+    )
+    assert serialization.negotiate("application/msgpack", "identity") == (
+        serialization.MSGPACK,
+        False,
+    )
+    assert serialization.negotiate(
+        "application/json, application/msgpack;q=0.5", "gzip;q=0"
+    ) == (serialization.JSON, False)
+
+
+def test_msgpack_round_trip():
+    """Test that packed histories unpack to the original and are smaller."""
+    data = solution_store.get_solution(1)
+    assert data is not None
+    body = serialization.pack_states(data)
+    assert serialization.unpack_states(body) == data
+    assert len(body) < len(json.dumps(data, separators=(",", ":")))
+
+
+def test_encode_headers():
+    """Test that responses are compressed and timed when asked for."""
+    data = solution_store.get_solution(1)
+    assert data is not None
+    body, headers = serialization.encode(data, "application/json", "gzip")
+    assert headers["Content-Type"] == serialization.JSON
+    assert headers["Content-Encoding"] == "gzip"
+    assert "serialize;dur=" in headers["Server-Timing"]
+    assert "compress;dur=" in headers["Server-Timing"]
+    assert json.loads(gzip.decompress(body)) == data
+
+    body, headers = serialization.encode(data, "application/msgpack", None)
+    assert "Content-Encoding" not in headers
+    assert serialization.unpack_states(body) == data
@@ -0,0 +1,53 @@
+"""Tests for the SolutionStore."""
+
+import json
+
+from src.models.agents.custom_agents.inactive import InactivePacMan
+from src.scripts.solutions import solve_level
+from src.services import solution_store
+
+
+def test_save_and_get(tmp_path, level_caches):
+    """Test that a stored solution is served in the same format as a game."""
+    store, details = solve_level(1, seeds=2, agent=InactivePacMan)
+    assert details["agent"] == "InactivePacMan"
+    # Only winning runs are served, and the inactive agent never wins.
+    details["won"] = True
+    solution_store.save_solution(1, store, details, str(tmp_path))
+    solution = solution_store.get_solution(1, str(tmp_path))
+    assert solution is not None
+    assert solution["states"] == store.to_json()["states"]
+    assert solution["solution"] == details
+
+
+def test_missing_or_stale_solution(tmp_path, level_caches):
+    """Test that solutions are not served for missing or changed levels."""
+    assert solution_store.get_solution(1, str(tmp_path / "missing")) is None
+    store, details = solve_level(1, seeds=1, agent=InactivePacMan)
+    details["won"] = True
+    path = solution_store.save_solution(1, store, details, str(tmp_path))
+    with open(path) as file:
+        stored = json.load(file)
+    stored["level_hash"] = "stale"
+    with open(path, "w") as file:
+        json.dump(stored, file)
+    solution_store._solutions.clear()
+    assert solution_store.get_solution(1, str(tmp_path)) is None
+
+
+def test_losing_run_not_served(tmp_path, level_caches):
+    """Test that a run which did not win is not served as a solution."""
+    store, details = solve_level(1, seeds=1, agent=InactivePacMan)
+    assert not details["won"]
+    solution_store.save_solution(1, store, details, str(tmp_path))
+    assert solution_store.get_solution(1, str(tmp_path)) is None
+
+
+def test_delete_solution(tmp_path, level_caches):
+    """Test that a deleted solution is no longer served."""
+    store, details = solve_level(1, seeds=1, agent=InactivePacMan)
+    details["won"] = True
+    solution_store.save_solution(1, store, details, str(tmp_path))
+    assert solution_store.get_solution(1, str(tmp_path)) is not None
+    solution_store.delete_solution(1, str(tmp_path))
+    assert solution_store.get_solution(1, str(tmp_path)) is None
@@ -0,0 +1,40 @@
+"""Tests for the startup service."""
+
+import time
+
+from src.services import level_handler, startup
+
+
+def test_timed():
+    """Test that the time taken by a step is reported in milliseconds."""
+    with startup.timed("test step"):
+        pass
+    report = startup.report()
+    assert 0 <= report["test step"] <= report["uptime"]
+
+
+def test_prewarm_levels(level_caches):
+    """Test that every level's topology is loaded and reported."""
+    level_handler._topologies.clear()
+    startup.prewarm_levels()
+    for level_num in level_handler.get_level_numbers():
+        assert level_handler.level_hash(level_num) in level_handler._topologies
+        assert f"level {level_num}" in startup.report()
+
+
+def test_prewarm_in_background():
+    """Test that the levels are loaded on a thread which reports when done."""
+    startup.prewarm_in_background().join()
+    assert "prewarmed" in startup.report()
+
+
+def test_process_start(monkeypatch):
+    """Test that times are taken from the start of the process where known."""
+    before = time.perf_counter()
+    assert startup._process_start() <= before
+
+    def unavailable(*args, **kwargs):
+        raise OSError
+
+    monkeypatch.setattr("builtins.open", unavailable)
+    assert startup._process_start() >= before
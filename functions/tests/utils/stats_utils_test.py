@@ -0,0 +1,48 @@
+"""Tests on the statistical functions."""
+
+import numpy as np
+import pytest
+from src.utils.stats_utils import RunningStats, bootstrap_ci, permutation_test
+
+
+def test_running_stats_match_numpy():
+    """Test that the running mean and variance match those of all values."""
+    values = np.random.default_rng(0).normal(100, 15, 5000)
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.count == 5000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert (stats.minimum, stats.maximum) == (values.min(), values.max())
+    assert stats.percentiles([50]) == pytest.approx([np.median(values)])
+
+
+def test_running_stats_bounded():
+    """Test that no more than `capacity` values are kept."""
+    stats = RunningStats(capacity=100, seed=0)
+    for value in range(10000):
+        stats.add(value)
+    assert len(stats.sample) == 100
+    assert stats.mean == pytest.approx(4999.5)
+    assert 2000 < stats.percentiles([50])[0] < 8000
+
+
+def test_bootstrap_ci_covers_mean():
+    """Test that the interval contains the mean and narrows with more data."""
+    rng = np.random.default_rng(1)
+    small = rng.normal(10, 2, 50)
+    large = rng.normal(10, 2, 5000)
+    low, high = bootstrap_ci(small, seed=0)
+    assert low < small.mean() < high
+    large_low, large_high = bootstrap_ci(large, seed=0)
+    assert large_high - large_low < high - low
+
+
+def test_permutation_test():
+    """Test that only a real difference in means is significant."""
+    rng = np.random.default_rng(2)
+    same = permutation_test(rng.normal(0, 1, 200), rng.normal(0, 1, 200), seed=0)
+    different = permutation_test(rng.normal(0, 1, 200), rng.normal(1, 1, 200), seed=0)
+    assert same > 0.05
+    assert different < 0.01